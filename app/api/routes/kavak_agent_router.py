@@ -1,4 +1,8 @@
+import json
+from typing import Any, AsyncIterator, Dict
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.core.config.logging import logger
 from app.core.dependencies import KavakFacadeDep
@@ -8,6 +12,10 @@ from app.models.api.api_schemas import KavakQueryRequest, KavakQueryResponse
 router = APIRouter(prefix="/kavak", tags=["kavak-agent"])
 
 
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post(
     "/chat",
     summary="Process a chat message",
@@ -40,3 +48,34 @@ async def process_kavak_chat(
             status_code=500,
             detail=f"Error processing query: {str(exc)}",
         )
+
+
+@router.post(
+    "/chat/stream",
+    summary="Process a chat message (streaming)",
+    description="Process a chat message using the Kavak commercial sales agent. Streams tool events and answer tokens as Server-Sent Events.",
+)
+async def process_kavak_chat_stream(
+    request: KavakQueryRequest,
+    facade: KavakFacadeDep,
+) -> StreamingResponse:
+    logger.info(f"Processing streaming Kavak chat query for user: {request.user_id}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in facade.process_query_stream(
+                query=request.query,
+                user_id=request.user_id,
+            ):
+                yield _format_sse(event["event"], event["data"])
+        except Exception as exc:
+            logger.error(f"Error streaming Kavak chat query: {exc}", exc_info=True)
+            yield _format_sse(
+                "error", {"detail": f"Error processing query: {str(exc)}"}
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
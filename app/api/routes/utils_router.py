@@ -1,9 +1,33 @@
+from typing import Any, Dict
+
 import fastapi
 from fastapi import status
 
+from app.core.dependencies import KavakLLMDep
+from app.core.services.cag_manager import get_cag_manager
+from app.core.services.redis_pool import get_redis_pool_stats
+from app.domain.agent_kavak.workflows.catalog_cache import get_catalog_search_cache
+from app.domain.agent_kavak.workflows.catalog_engine import get_catalog_engine
+from app.domain.agent_kavak.workflows.preferences_extractor import (
+    get_preferences_extractor,
+)
+
 router = fastapi.APIRouter(prefix="", tags=["utils"])
 
 
 @router.get(path="/health", name="utils:health-check", status_code=status.HTTP_200_OK)
 async def health_check() -> bool:
     return True
+
+
+@router.get(path="/stats", name="utils:stats", status_code=status.HTTP_200_OK)
+async def runtime_stats(llm_manager: KavakLLMDep) -> Dict[str, Any]:
+    return {
+        "embeddings": llm_manager.get_embedding_stats(),
+        "llm_clients": llm_manager.get_client_pool_stats(),
+        "preferences_extraction": get_preferences_extractor().get_stats(),
+        "cag": get_cag_manager().get_stats(),
+        "catalog_search_cache": get_catalog_search_cache().get_stats(),
+        "catalog_engine": get_catalog_engine().get_stats(),
+        "redis_pool": get_redis_pool_stats(),
+    }
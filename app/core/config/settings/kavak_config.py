@@ -8,6 +8,95 @@ class KavakLLMSettings(BaseModel):
 
     OPENAI_API_KEY: str | None = decouple.config("OPENAI_API_KEY", default=None)
 
+    HTTP_MAX_CONNECTIONS: int = decouple.config(
+        "KAVAK_LLM_HTTP_MAX_CONNECTIONS", default=100, cast=int
+    )
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = decouple.config(
+        "KAVAK_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", default=20, cast=int
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = decouple.config(
+        "KAVAK_LLM_HTTP_KEEPALIVE_EXPIRY", default=60.0, cast=float
+    )
+    HTTP_TIMEOUT: float = decouple.config(
+        "KAVAK_LLM_HTTP_TIMEOUT", default=60.0, cast=float
+    )
+    HTTP_CONNECT_TIMEOUT: float = decouple.config(
+        "KAVAK_LLM_HTTP_CONNECT_TIMEOUT", default=5.0, cast=float
+    )
+
+
+class KavakEmbeddingSettings(BaseModel):
+    MODEL: str = decouple.config(
+        "KAVAK_EMBEDDING_MODEL", default="text-embedding-3-small"
+    )
+    # Shortened output size for text-embedding-3 models; None keeps the
+    # model's native size (1536 for text-embedding-3-small).
+    DIMENSIONS: int | None = decouple.config(
+        "KAVAK_EMBEDDING_DIMENSIONS",
+        default=None,
+        cast=lambda value: int(value) if value else None,
+    )
+
+    BATCH_ENABLED: bool = decouple.config(
+        "KAVAK_EMBEDDING_BATCH_ENABLED", default=True, cast=bool
+    )
+    BATCH_MAX_SIZE: int = decouple.config(
+        "KAVAK_EMBEDDING_BATCH_MAX_SIZE", default=64, cast=int
+    )
+    BATCH_MAX_WAIT_MS: float = decouple.config(
+        "KAVAK_EMBEDDING_BATCH_MAX_WAIT_MS", default=5.0, cast=float
+    )
+
+    CACHE_ENABLED: bool = decouple.config(
+        "KAVAK_EMBEDDING_CACHE_ENABLED", default=True, cast=bool
+    )
+    CACHE_LOCAL_MAX_SIZE: int = decouple.config(
+        "KAVAK_EMBEDDING_CACHE_LOCAL_MAX_SIZE", default=2048, cast=int
+    )
+    CACHE_LOCAL_TTL: int = decouple.config(
+        "KAVAK_EMBEDDING_CACHE_LOCAL_TTL", default=3600, cast=int
+    )
+    CACHE_DTYPE: str = decouple.config("KAVAK_EMBEDDING_CACHE_DTYPE", default="float16")
+
+
+class KavakExtractionSettings(BaseModel):
+    RULE_BASED_ENABLED: bool = decouple.config(
+        "KAVAK_EXTRACTION_RULE_BASED_ENABLED", default=True, cast=bool
+    )
+    MIN_CONFIDENCE: float = decouple.config(
+        "KAVAK_EXTRACTION_MIN_CONFIDENCE", default=0.8, cast=float
+    )
+    FUZZY_SCORE_CUTOFF: float = decouple.config(
+        "KAVAK_EXTRACTION_FUZZY_SCORE_CUTOFF", default=85.0, cast=float
+    )
+    VOCABULARY_TTL: int = decouple.config(
+        "KAVAK_EXTRACTION_VOCABULARY_TTL", default=3600, cast=int
+    )
+
+
+class KavakCatalogSettings(BaseModel):
+    ENGINE_ENABLED: bool = decouple.config(
+        "KAVAK_CATALOG_ENGINE_ENABLED", default=True, cast=bool
+    )
+    ENGINE_PRELOAD: bool = decouple.config(
+        "KAVAK_CATALOG_ENGINE_PRELOAD", default=True, cast=bool
+    )
+
+
+class KavakRetrievalSettings(BaseModel):
+    # "dense", "hybrid" (dense + BM25 fused with RRF) or "sparse" (BM25 only,
+    # no embedding call). Hybrid and sparse need collections loaded with the
+    # BM25 vector by scripts/load_kavak_collections.py.
+    CATALOG_MODE: str = decouple.config("KAVAK_RETRIEVAL_CATALOG_MODE", default="dense")
+    VALUE_PROP_MODE: str = decouple.config(
+        "KAVAK_RETRIEVAL_VALUE_PROP_MODE", default="dense"
+    )
+    HYBRID_PREFETCH_MULTIPLIER: int = decouple.config(
+        "KAVAK_RETRIEVAL_HYBRID_PREFETCH_MULTIPLIER", default=4, cast=int
+    )
+    BM25_K1: float = decouple.config("KAVAK_RETRIEVAL_BM25_K1", default=1.2, cast=float)
+    BM25_B: float = decouple.config("KAVAK_RETRIEVAL_BM25_B", default=0.75, cast=float)
+
 
 class KavakQdrantSettings(BaseModel):
     HOST: str = decouple.config("QDRANT_HOST", default="localhost")
@@ -23,6 +112,15 @@ class KavakQdrantSettings(BaseModel):
         "KAVAK_QDRANT_CATALOG_COLLECTION", default="kavak_catalog"
     )
 
+    # "scalar" (int8), "binary" or "none".
+    QUANTIZATION: str = decouple.config("KAVAK_QDRANT_QUANTIZATION", default="scalar")
+    QUANTIZATION_OVERSAMPLING: float = decouple.config(
+        "KAVAK_QDRANT_QUANTIZATION_OVERSAMPLING", default=2.0, cast=float
+    )
+    QUANTIZATION_RESCORE: bool = decouple.config(
+        "KAVAK_QDRANT_QUANTIZATION_RESCORE", default=True, cast=bool
+    )
+
 
 class KavakMem0Settings(BaseModel):
     COLLECTION_NAME: str = decouple.config(
@@ -57,6 +155,10 @@ class ArizeSettings(BaseModel):
 
 class KavakSettings(BaseModel):
     llm: KavakLLMSettings = KavakLLMSettings()
+    embedding: KavakEmbeddingSettings = KavakEmbeddingSettings()
+    extraction: KavakExtractionSettings = KavakExtractionSettings()
+    catalog: KavakCatalogSettings = KavakCatalogSettings()
+    retrieval: KavakRetrievalSettings = KavakRetrievalSettings()
     qdrant: KavakQdrantSettings = KavakQdrantSettings()
     mem0: KavakMem0Settings = KavakMem0Settings()
     twilio: KavakTwilioSettings = KavakTwilioSettings()
@@ -10,8 +10,105 @@ class RedisSettings(BaseModel):
     DECODE_RESPONSES: bool = decouple.config(
         "REDIS_DECODE_RESPONSES", default=True, cast=bool
     )
+    POOL_MAX_CONNECTIONS: int = decouple.config(
+        "REDIS_POOL_MAX_CONNECTIONS", default=50, cast=int
+    )
+    POOL_TIMEOUT: float = decouple.config("REDIS_POOL_TIMEOUT", default=2.0, cast=float)
+    SOCKET_TIMEOUT: float = decouple.config(
+        "REDIS_SOCKET_TIMEOUT", default=2.0, cast=float
+    )
+    SOCKET_CONNECT_TIMEOUT: float = decouple.config(
+        "REDIS_SOCKET_CONNECT_TIMEOUT", default=1.0, cast=float
+    )
+    HEALTH_CHECK_INTERVAL: int = decouple.config(
+        "REDIS_HEALTH_CHECK_INTERVAL", default=30, cast=int
+    )
 
     CAG_TTL: int = decouple.config("REDIS_CAG_TTL", default=86400, cast=int)
+    CAG_STALE_TTL: int = decouple.config("REDIS_CAG_STALE_TTL", default=3600, cast=int)
     CAG_KEY_PREFIX: str = decouple.config(
         "REDIS_CAG_KEY_PREFIX", default="cag:value_prop"
     )
+    CAG_GENERATION_CACHE_TTL: float = decouple.config(
+        "REDIS_CAG_GENERATION_CACHE_TTL", default=5.0, cast=float
+    )
+    CAG_COMPRESSION_MIN_BYTES: int = decouple.config(
+        "REDIS_CAG_COMPRESSION_MIN_BYTES", default=1024, cast=int
+    )
+    CAG_COMPRESSION_LEVEL: int = decouple.config(
+        "REDIS_CAG_COMPRESSION_LEVEL", default=6, cast=int
+    )
+    CAG_LOCAL_MAX_SIZE: int = decouple.config(
+        "REDIS_CAG_LOCAL_MAX_SIZE", default=512, cast=int
+    )
+    CAG_LOCAL_TTL: int = decouple.config("REDIS_CAG_LOCAL_TTL", default=300, cast=int)
+    CAG_INVALIDATION_CHANNEL: str = decouple.config(
+        "REDIS_CAG_INVALIDATION_CHANNEL", default="cag:invalidate"
+    )
+    CAG_INVALIDATION_POLL_TIMEOUT: float = decouple.config(
+        "REDIS_CAG_INVALIDATION_POLL_TIMEOUT", default=1.0, cast=float
+    )
+    CAG_SINGLE_FLIGHT_ENABLED: bool = decouple.config(
+        "REDIS_CAG_SINGLE_FLIGHT_ENABLED", default=True, cast=bool
+    )
+    CAG_LOCK_TTL: float = decouple.config(
+        "REDIS_CAG_LOCK_TTL", default=30.0, cast=float
+    )
+    CAG_LOCK_WAIT_TIMEOUT: float = decouple.config(
+        "REDIS_CAG_LOCK_WAIT_TIMEOUT", default=15.0, cast=float
+    )
+    CAG_LOCK_POLL_INTERVAL_MS: int = decouple.config(
+        "REDIS_CAG_LOCK_POLL_INTERVAL_MS", default=100, cast=int
+    )
+    CAG_WARMUP_ON_STARTUP: bool = decouple.config(
+        "REDIS_CAG_WARMUP_ON_STARTUP", default=False, cast=bool
+    )
+    CAG_WARMUP_TOP_N: int = decouple.config(
+        "REDIS_CAG_WARMUP_TOP_N", default=100, cast=int
+    )
+    CAG_WARMUP_CONCURRENCY: int = decouple.config(
+        "REDIS_CAG_WARMUP_CONCURRENCY", default=4, cast=int
+    )
+    CAG_WARMUP_LOOKBACK_DAYS: int = decouple.config(
+        "REDIS_CAG_WARMUP_LOOKBACK_DAYS", default=30, cast=int
+    )
+    # Off by default: near-duplicate embeddings can differ in city, budget or
+    # year ("SUV en Monterrey" vs "SUV en Guadalajara") and would share answers.
+    CAG_SEMANTIC_ENABLED: bool = decouple.config(
+        "REDIS_CAG_SEMANTIC_ENABLED", default=False, cast=bool
+    )
+    CAG_SEMANTIC_THRESHOLD: float = decouple.config(
+        "REDIS_CAG_SEMANTIC_THRESHOLD", default=0.92, cast=float
+    )
+
+    CATALOG_VERSION_KEY: str = decouple.config(
+        "REDIS_CATALOG_VERSION_KEY", default="catalog:version"
+    )
+    CATALOG_VERSION_CACHE_TTL: float = decouple.config(
+        "REDIS_CATALOG_VERSION_CACHE_TTL", default=5.0, cast=float
+    )
+    CATALOG_SEARCH_CACHE_ENABLED: bool = decouple.config(
+        "REDIS_CATALOG_SEARCH_CACHE_ENABLED", default=True, cast=bool
+    )
+    CATALOG_SEARCH_CACHE_TTL: int = decouple.config(
+        "REDIS_CATALOG_SEARCH_CACHE_TTL", default=3600, cast=int
+    )
+    CATALOG_SEARCH_KEY_PREFIX: str = decouple.config(
+        "REDIS_CATALOG_SEARCH_KEY_PREFIX", default="catalog:search"
+    )
+    CATALOG_PAYLOAD_CACHE_MAX_SIZE: int = decouple.config(
+        "REDIS_CATALOG_PAYLOAD_CACHE_MAX_SIZE", default=5000, cast=int
+    )
+    CATALOG_CURSOR_TTL: int = decouple.config(
+        "REDIS_CATALOG_CURSOR_TTL", default=1800, cast=int
+    )
+    CATALOG_CURSOR_KEY_PREFIX: str = decouple.config(
+        "REDIS_CATALOG_CURSOR_KEY_PREFIX", default="catalog:cursor"
+    )
+
+    EMBEDDING_TTL: int = decouple.config(
+        "REDIS_EMBEDDING_TTL", default=604800, cast=int
+    )
+    EMBEDDING_KEY_PREFIX: str = decouple.config(
+        "REDIS_EMBEDDING_KEY_PREFIX", default="emb"
+    )
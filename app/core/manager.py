@@ -1,3 +1,4 @@
+import asyncio
 from functools import lru_cache
 from contextlib import asynccontextmanager
 import decouple
@@ -39,6 +40,27 @@ def get_settings() -> ApplicationSettings:
     return SettingsFactory(environment=env)()
 
 
+async def _warm_cag() -> None:
+    from app.core.services.kavak_llm_manager import KavakLLMManager
+    from app.domain.agent_kavak.workflows.cag_warmup import warm_value_prop_cache
+    from app.repository.vector import QdrantVectorRepository
+
+    try:
+        await warm_value_prop_cache(
+            vector_repository=QdrantVectorRepository.get_instance(),
+            llm_manager=KavakLLMManager.get_instance(),
+        )
+    except Exception as e:
+        logger.warning(f"CAG warm-up failed (non-fatal): {e}")
+
+
+async def _load_catalog_engine() -> None:
+    from app.domain.agent_kavak.workflows.catalog_engine import get_catalog_engine
+    from app.repository.vector import QdrantVectorRepository
+
+    await get_catalog_engine().ensure_fresh(QdrantVectorRepository.get_instance())
+
+
 @asynccontextmanager
 async def lifespan(app):
     try:
@@ -49,17 +71,47 @@ async def lifespan(app):
     except Exception as e:
         logger.warning(f"Failed to initialize Arize AX tracing: {e}")
 
+    from app.core.services.cag_manager import get_cag_manager
+    from app.core.services.redis_pool import close_redis_pool, init_redis_pool
+
+    await init_redis_pool()
+
+    cag_manager = get_cag_manager()
+    cag_manager.start_invalidation_listener()
+
+    background_tasks = []
+    if get_settings().kavak.catalog.ENGINE_PRELOAD:
+        background_tasks.append(asyncio.create_task(_load_catalog_engine()))
+    if cag_manager.settings.CAG_WARMUP_ON_STARTUP:
+        background_tasks.append(asyncio.create_task(_warm_cag()))
+
     try:
         yield
     finally:
         logger.info("Shutting down application...")
+        for task in background_tasks:
+            if not task.done():
+                task.cancel()
+        await cag_manager.stop_invalidation_listener()
         from app.repository.vector import QdrantVectorRepository
 
+        from app.core.services.kavak_llm_manager import KavakLLMManager
+
         try:
             qdrant_repo = QdrantVectorRepository.get_instance()
             await qdrant_repo.aclose()
         except Exception:
             pass
 
+        try:
+            await KavakLLMManager.get_instance().aclose()
+        except Exception:
+            pass
+
+        try:
+            await close_redis_pool()
+        except Exception:
+            pass
+
 
 settings: ApplicationSettings = get_settings()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict
+
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+
+
+@dataclass
+class CAGCodecStats:
+    encoded: int = 0
+    decoded: int = 0
+    legacy_decoded: int = 0
+    compressed: int = 0
+    bytes_written: int = 0
+    raw_bytes_written: int = 0
+    bytes_read: int = 0
+    encode_ms: float = 0.0
+    decode_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "encoded": self.encoded,
+            "decoded": self.decoded,
+            "legacy_decoded": self.legacy_decoded,
+            "compressed": self.compressed,
+            "avg_bytes_written": round(self.bytes_written / self.encoded, 1)
+            if self.encoded
+            else 0.0,
+            "compression_ratio": round(self.bytes_written / self.raw_bytes_written, 3)
+            if self.raw_bytes_written
+            else 1.0,
+            "avg_bytes_read": round(self.bytes_read / self.decoded, 1)
+            if self.decoded
+            else 0.0,
+            "avg_encode_ms": round(self.encode_ms / self.encoded, 4)
+            if self.encoded
+            else 0.0,
+            "avg_decode_ms": round(self.decode_ms / self.decoded, 4)
+            if self.decoded
+            else 0.0,
+        }
+
+
+class CAGValueCodec:
+    """Versioned binary encoding for CAG entries.
+
+    Layout: one version byte, one flags byte, then compact UTF-8 JSON that is
+    zlib-compressed when it exceeds ``compression_min_bytes``. Values written
+    before the header existed are plain JSON text and still decode.
+    """
+
+    def __init__(self, compression_min_bytes: int = 1024, compression_level: int = 6):
+        self.compression_min_bytes = compression_min_bytes
+        self.compression_level = compression_level
+        self.stats = CAGCodecStats()
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        started_at = time.perf_counter()
+
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        raw_size = len(body)
+        flags = 0
+        if self.compression_min_bytes and raw_size >= self.compression_min_bytes:
+            compressed = zlib.compress(body, self.compression_level)
+            if len(compressed) < raw_size:
+                body = compressed
+                flags |= FLAG_ZLIB
+                self.stats.compressed += 1
+
+        value = bytes((FORMAT_VERSION, flags)) + body
+
+        self.stats.encoded += 1
+        self.stats.raw_bytes_written += raw_size + 2
+        self.stats.bytes_written += len(value)
+        self.stats.encode_ms += (time.perf_counter() - started_at) * 1000.0
+        return value
+
+    def decode(self, value: bytes | str) -> Dict[str, Any]:
+        started_at = time.perf_counter()
+
+        if isinstance(value, str):
+            value = value.encode()
+
+        if value[:1] == b"{":
+            data = json.loads(value)
+            self.stats.legacy_decoded += 1
+        else:
+            version, flags = value[0], value[1]
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported CAG value format version: {version}")
+
+            body = value[2:]
+            if flags & FLAG_ZLIB:
+                body = zlib.decompress(body)
+            data = json.loads(body)
+
+        self.stats.decoded += 1
+        self.stats.bytes_read += len(value)
+        self.stats.decode_ms += (time.perf_counter() - started_at) * 1000.0
+        return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        stats["format_version"] = FORMAT_VERSION
+        stats["compression_min_bytes"] = self.compression_min_bytes
+        return stats
@@ -1,17 +1,80 @@
 from __future__ import annotations
-from typing import Optional
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import fnmatch
 import json
 import hashlib
+import time
+import uuid
 import redis.asyncio as aioredis
+from qdrant_client.models import PayloadSchemaType, PointStruct
 from app.core.config.logging import logger
 from app.core.config.settings.redis_config import RedisSettings
+from app.core.services.cag_codec import CAGValueCodec
+from app.core.services.local_cache import LocalTTLCache
+from app.core.services.redis_pool import get_redis_client
 from app.models.agent.schemas import RAGAnswer
 
+if TYPE_CHECKING:
+    from app.repository.vector import QdrantVectorRepository
+
+SEMANTIC_PAYLOAD_INDEXES = {
+    "cache_type": PayloadSchemaType.KEYWORD,
+    "expires_at": PayloadSchemaType.FLOAT,
+}
+
+
+@dataclass
+class CAGStats:
+    local_hits: int = 0
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    semantic_misses: int = 0
+    semantic_errors: int = 0
+    computations: int = 0
+    coalesced_local: int = 0
+    coalesced_remote: int = 0
+    lock_wait_timeouts: int = 0
+    stale_hits: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.exact_hits + self.stale_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "exact_hits": self.exact_hits,
+            "stale_hits": self.stale_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "semantic_misses": self.semantic_misses,
+            "semantic_errors": self.semantic_errors,
+            "computations": self.computations,
+            "coalesced_local": self.coalesced_local,
+            "coalesced_remote": self.coalesced_remote,
+            "lock_wait_timeouts": self.lock_wait_timeouts,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "hit_rate": round(
+                (
+                    self.local_hits
+                    + self.exact_hits
+                    + self.stale_hits
+                    + self.semantic_hits
+                )
+                / lookups,
+                4,
+            )
+            if lookups
+            else 0.0,
+        }
+
 
 class CAGManager:
     _instance: Optional[CAGManager] = None
     _initialized: bool = False
-    _redis_client: Optional[aioredis.Redis] = None
 
     def __new__(cls) -> CAGManager:
         if cls._instance is None:
@@ -23,54 +86,95 @@ class CAGManager:
             return
 
         self.settings = RedisSettings()
+        self._semantic_collection_ready = False
+        self._local: LocalTTLCache[RAGAnswer] = LocalTTLCache(
+            max_size=self.settings.CAG_LOCAL_MAX_SIZE,
+            ttl=self.settings.CAG_LOCAL_TTL,
+        )
+        self._worker_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        self._generations: LocalTTLCache[str] = LocalTTLCache(
+            max_size=64, ttl=self.settings.CAG_GENERATION_CACHE_TTL
+        )
+        self._codec = CAGValueCodec(
+            compression_min_bytes=self.settings.CAG_COMPRESSION_MIN_BYTES,
+            compression_level=self.settings.CAG_COMPRESSION_LEVEL,
+        )
+        self.stats = CAGStats()
         self._initialized = True
 
     async def _get_redis_client(self) -> aioredis.Redis:
-        if self._redis_client is None:
-            connection_kwargs = {
-                "host": self.settings.HOST,
-                "port": self.settings.PORT,
-                "decode_responses": self.settings.DECODE_RESPONSES,
-            }
-
-            if self.settings.USERNAME:
-                connection_kwargs["username"] = self.settings.USERNAME
-            if self.settings.PASSWORD:
-                connection_kwargs["password"] = self.settings.PASSWORD
-
-            try:
-                self._redis_client = aioredis.Redis(**connection_kwargs)
-                await self._redis_client.ping()
-                logger.info(
-                    f"Connected to Redis at {self.settings.HOST}:{self.settings.PORT}"
-                )
-            except Exception as exc:
-                logger.warning(f"Failed to connect to Redis: {exc}")
-                raise
-
-        return self._redis_client
+        return get_redis_client()
 
     def _query_to_hash(self, query: str) -> str:
         query_normalized = query.lower().strip()
         return hashlib.md5(query_normalized.encode()).hexdigest()
 
-    def _build_cache_key(self, cache_type: str, query: str) -> str:
+    def _generation_key(self, cache_type: Optional[str] = None) -> str:
+        if cache_type:
+            return f"{self.settings.CAG_KEY_PREFIX}:gen:{cache_type}"
+        return f"{self.settings.CAG_KEY_PREFIX}:gen"
+
+    def _dependency_key(self, chunk_id: Any) -> str:
+        return f"{self.settings.CAG_KEY_PREFIX}:dep:{chunk_id}"
+
+    async def _get_generation(self, cache_type: str) -> str:
+        """Current ``<global>.<cache_type>`` generation, cached briefly per worker.
+
+        Bumping either counter moves every key of the namespace at once, so a
+        flush never has to find and delete the old keys; they expire by TTL.
+        """
+        generation = self._generations.get(cache_type)
+        if generation is not None:
+            return generation
+
+        redis_client = await self._get_redis_client()
+        global_gen, type_gen = await redis_client.mget(
+            self._generation_key(), self._generation_key(cache_type)
+        )
+        generation = f"{int(global_gen or 0)}.{int(type_gen or 0)}"
+        self._generations.set(cache_type, generation)
+        return generation
+
+    async def _build_cache_key(self, cache_type: str, query: str) -> str:
         query_hash = self._query_to_hash(query)
-        return f"{self.settings.CAG_KEY_PREFIX}:{cache_type}:{query_hash}"
+        generation = await self._get_generation(cache_type)
+        return f"{self.settings.CAG_KEY_PREFIX}:{cache_type}:g{generation}:{query_hash}"
 
     async def get_cached_response(
-        self, cache_type: str, query: str
+        self,
+        cache_type: str,
+        query: str,
+        refresh: Optional[Callable[[], Awaitable[Any]]] = None,
     ) -> Optional[RAGAnswer]:
+        """Return the cached answer for ``query``, serving stale entries while revalidating.
+
+        Entries past their soft expiry are still returned until Redis drops them
+        at the hard expiry; when ``refresh`` is given it is scheduled in the
+        background (once per key) to recompute and re-cache the answer.
+        """
         try:
-            redis_client = await self._get_redis_client()
-            cache_key = self._build_cache_key(cache_type, query)
+            cache_key = await self._build_cache_key(cache_type, query)
+
+            local_response = self._local.get(cache_key)
+            if local_response is not None:
+                self.stats.local_hits += 1
+                return local_response
 
-            cached_data = await redis_client.get(cache_key)
+            response, stale = await self._read_redis(cache_key)
 
-            if cached_data:
-                data = json.loads(cached_data)
-                return RAGAnswer(**data)
+            if response is not None:
+                if stale:
+                    self.stats.stale_hits += 1
+                    if refresh is not None:
+                        self._schedule_refresh(cache_key, refresh)
+                else:
+                    self.stats.exact_hits += 1
+                return response
 
+            self.stats.misses += 1
             return None
 
         except Exception as exc:
@@ -80,6 +184,178 @@ class CAGManager:
             )
             return None
 
+    async def _read_redis(self, cache_key: str) -> Tuple[Optional[RAGAnswer], bool]:
+        """Read an entry from Redis, returning ``(response, is_stale)``."""
+        redis_client = await self._get_redis_client()
+        cached_data = await redis_client.get(cache_key)
+        if not cached_data:
+            return None, False
+
+        data = self._codec.decode(cached_data)
+        response = RAGAnswer(
+            answer=data["answer"],
+            sources=data.get("sources", []),
+            chunk_ids=data.get("chunk_ids", []),
+        )
+
+        # Entries written before soft expiry existed have no marker and count as fresh.
+        soft_expires_at = data.get("soft_expires_at")
+        fresh_for = (
+            soft_expires_at - time.time()
+            if soft_expires_at is not None
+            else self.settings.CAG_LOCAL_TTL
+        )
+        if fresh_for <= 0:
+            return response, True
+
+        self._local.set(
+            cache_key, response, ttl=min(fresh_for, self.settings.CAG_LOCAL_TTL)
+        )
+        return response, False
+
+    def _schedule_refresh(
+        self, cache_key: str, refresh: Callable[[], Awaitable[Any]]
+    ) -> None:
+        task = self._refresh_tasks.get(cache_key)
+        if task is not None and not task.done():
+            return
+
+        self._refresh_tasks[cache_key] = asyncio.create_task(
+            self._run_refresh(cache_key, refresh)
+        )
+
+    async def _run_refresh(
+        self, cache_key: str, refresh: Callable[[], Awaitable[Any]]
+    ) -> None:
+        try:
+            self.stats.refreshes += 1
+            await refresh()
+            logger.info(f"Refreshed stale CAG entry: {cache_key}")
+        except Exception as exc:
+            self.stats.refresh_errors += 1
+            logger.warning(f"Error refreshing stale CAG entry (non-fatal): {exc}")
+        finally:
+            self._refresh_tasks.pop(cache_key, None)
+
+    async def get_or_compute(
+        self,
+        cache_type: str,
+        query: str,
+        compute: Callable[[], Awaitable[RAGAnswer]],
+    ) -> RAGAnswer:
+        """Run ``compute`` for a cache miss at most once per key across all workers.
+
+        Concurrent callers in this worker await the leader's future. Callers in
+        other workers find the Redis lock taken and poll the cache until the
+        leader has written it, the lock is released, or the wait times out; in
+        the last two cases they compute the answer themselves.
+        If the leader fails, in-worker waiters fall back to their own call.
+        ``compute`` is expected to populate the cache on success.
+        """
+        if not self.settings.CAG_SINGLE_FLIGHT_ENABLED:
+            return await compute()
+
+        try:
+            cache_key = await self._build_cache_key(cache_type, query)
+        except Exception as exc:
+            logger.debug(f"CAG unavailable, computing without single-flight: {exc}")
+            return await compute()
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            self.stats.coalesced_local += 1
+            try:
+                response = await asyncio.wait_for(
+                    asyncio.shield(inflight), self.settings.CAG_LOCK_WAIT_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                self.stats.lock_wait_timeouts += 1
+                logger.warning(
+                    f"Timed out waiting for in-flight CAG computation: {cache_key}"
+                )
+                response = None
+
+            if response is not None:
+                return response
+            return await compute()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        response: Optional[RAGAnswer] = None
+        try:
+            response = await self._compute_with_lock(cache_key, compute)
+            return response
+        finally:
+            # Waiters receive None when the leader failed and run compute themselves.
+            future.set_result(response)
+            self._inflight.pop(cache_key, None)
+
+    async def _compute_with_lock(
+        self, cache_key: str, compute: Callable[[], Awaitable[RAGAnswer]]
+    ) -> RAGAnswer:
+        lock = None
+        try:
+            redis_client = await self._get_redis_client()
+            lock = redis_client.lock(
+                f"{cache_key}:lock",
+                timeout=self.settings.CAG_LOCK_TTL,
+                blocking=False,
+            )
+            acquired = await lock.acquire()
+        except Exception as exc:
+            logger.debug(f"CAG lock unavailable, computing without it: {exc}")
+            self.stats.computations += 1
+            return await compute()
+
+        if not acquired:
+            response = await self._wait_for_remote(redis_client, cache_key)
+            if response is not None:
+                self.stats.coalesced_remote += 1
+                return response
+            self.stats.computations += 1
+            return await compute()
+
+        try:
+            # A previous leader may have filled the cache between our miss and the lock.
+            response, stale = await self._read_redis(cache_key)
+            if response is not None and not stale:
+                self.stats.coalesced_remote += 1
+                return response
+
+            self.stats.computations += 1
+            return await compute()
+        finally:
+            try:
+                await lock.release()
+            except Exception as exc:
+                logger.debug(f"Error releasing CAG lock (expired?): {exc}")
+
+    async def _wait_for_remote(
+        self, redis_client: aioredis.Redis, cache_key: str
+    ) -> Optional[RAGAnswer]:
+        lock_key = f"{cache_key}:lock"
+        poll_interval = self.settings.CAG_LOCK_POLL_INTERVAL_MS / 1000.0
+        deadline = time.monotonic() + self.settings.CAG_LOCK_WAIT_TIMEOUT
+
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(poll_interval)
+
+                response, stale = await self._read_redis(cache_key)
+                if response is not None and not stale:
+                    return response
+
+                if not await redis_client.exists(lock_key):
+                    # The leader finished without caching (or died); try ourselves.
+                    return None
+        except Exception as exc:
+            logger.debug(f"Error waiting for remote CAG computation: {exc}")
+            return None
+
+        self.stats.lock_wait_timeouts += 1
+        logger.warning(f"Timed out waiting for remote CAG computation: {cache_key}")
+        return None
+
     async def cache_response(
         self,
         cache_type: str,
@@ -89,16 +365,32 @@ class CAGManager:
     ) -> bool:
         try:
             redis_client = await self._get_redis_client()
-            cache_key = self._build_cache_key(cache_type, query)
+            cache_key = await self._build_cache_key(cache_type, query)
 
             ttl = ttl or self.settings.CAG_TTL
+            hard_ttl = ttl + self.settings.CAG_STALE_TTL
 
             data = {
                 "answer": response.answer,
                 "sources": response.sources,
+                "chunk_ids": response.chunk_ids,
+                "soft_expires_at": time.time() + ttl,
             }
 
-            await redis_client.setex(cache_key, ttl, json.dumps(data))
+            # The key outlives its soft expiry by the stale window so it can be
+            # served while a refresh runs. Each source chunk keeps a set of the
+            # keys built from it for invalidate_chunks.
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.setex(cache_key, hard_ttl, self._codec.encode(data))
+            for chunk_id in response.chunk_ids:
+                dependency_key = self._dependency_key(chunk_id)
+                pipe.sadd(dependency_key, cache_key)
+                pipe.expire(dependency_key, hard_ttl)
+            await pipe.execute()
+            self._local.set(
+                cache_key, response, ttl=min(ttl, self.settings.CAG_LOCAL_TTL)
+            )
+            await self._publish_invalidation(redis_client, keys=[cache_key])
 
             return True
 
@@ -106,30 +398,331 @@ class CAGManager:
             logger.warning(f"Error caching response (non-fatal): {exc}", exc_info=False)
             return False
 
+    async def _publish_invalidation(
+        self,
+        redis_client: aioredis.Redis,
+        keys: Optional[List[str]] = None,
+        pattern: Optional[str] = None,
+        flush_generations: bool = False,
+    ) -> None:
+        message = json.dumps(
+            {
+                "origin": self._worker_id,
+                "keys": keys or [],
+                "pattern": pattern,
+                "flush_generations": flush_generations,
+            }
+        )
+        try:
+            await redis_client.publish(self.settings.CAG_INVALIDATION_CHANNEL, message)
+        except Exception as exc:
+            logger.debug(f"Error publishing CAG invalidation (non-fatal): {exc}")
+
+    def _apply_invalidation(self, raw_message: Any) -> None:
+        try:
+            message = json.loads(raw_message)
+        except (TypeError, ValueError):
+            return
+
+        if message.get("origin") == self._worker_id:
+            return
+
+        if message.get("flush_generations"):
+            self._generations.clear()
+
+        for key in message.get("keys") or []:
+            self._local.delete(key)
+
+        pattern = message.get("pattern")
+        if pattern:
+            self._local.delete_where(lambda key: fnmatch.fnmatchcase(key, pattern))
+
+    async def _listen_for_invalidations(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = None
+            try:
+                redis_client = await self._get_redis_client()
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.settings.CAG_INVALIDATION_CHANNEL)
+                # Entries cached while we were disconnected may have missed
+                # invalidations, so start from an empty L1.
+                self._local.clear()
+                self._generations.clear()
+                backoff = 1.0
+                logger.info(
+                    f"Subscribed to CAG invalidation channel: {self.settings.CAG_INVALIDATION_CHANNEL}"
+                )
+
+                # listen() blocks on the pool's socket_timeout and raises when
+                # the channel is idle; an empty poll is not a disconnect.
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=self.settings.CAG_INVALIDATION_POLL_TIMEOUT,
+                    )
+                    if message and message.get("type") == "message":
+                        self._apply_invalidation(message.get("data"))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.debug(f"CAG invalidation listener error, retrying: {exc}")
+                self._local.clear()
+                self._generations.clear()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def start_invalidation_listener(self) -> None:
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener_task is None:
+            return
+
+        self._listener_task.cancel()
+        try:
+            await self._listener_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._listener_task = None
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.settings.CAG_SEMANTIC_ENABLED
+
+    def _semantic_point_id(self, cache_type: str, query: str) -> str:
+        return str(
+            uuid.uuid5(uuid.NAMESPACE_URL, f"{cache_type}:{self._query_to_hash(query)}")
+        )
+
+    async def _ensure_semantic_collection(
+        self, vector_repository: QdrantVectorRepository
+    ) -> None:
+        if self._semantic_collection_ready:
+            return
+
+        from app.repository.vector import CollectionType
+
+        await vector_repository.ensure_collection(
+            CollectionType.KAVAK_CAG_SEMANTIC,
+            payload_indexes=SEMANTIC_PAYLOAD_INDEXES,
+        )
+        self._semantic_collection_ready = True
+
+    async def get_semantic_response(
+        self,
+        cache_type: str,
+        embedding: List[float],
+        vector_repository: QdrantVectorRepository,
+    ) -> Optional[RAGAnswer]:
+        """Return a cached answer whose question embedding is close enough to ``embedding``."""
+        from app.repository.vector import CollectionType
+
+        try:
+            await self._ensure_semantic_collection(vector_repository)
+            results = await vector_repository.search(
+                vector=embedding,
+                top_k=1,
+                filter_by={
+                    "cache_type": cache_type,
+                    "expires_at": {"gte": time.time()},
+                },
+                collection=CollectionType.KAVAK_CAG_SEMANTIC,
+                score_threshold=self.settings.CAG_SEMANTIC_THRESHOLD,
+                with_payload=["query", "answer", "sources", "chunk_ids"],
+            )
+
+            if results:
+                payload = results[0].payload or {}
+                self.stats.semantic_hits += 1
+                logger.info(
+                    f"Semantic CAG hit (score={results[0].score:.3f}) for cached question: {payload.get('query')}"
+                )
+                return RAGAnswer(
+                    answer=payload.get("answer", ""),
+                    sources=payload.get("sources", []),
+                    chunk_ids=payload.get("chunk_ids", []),
+                )
+
+            self.stats.semantic_misses += 1
+            return None
+
+        except Exception as exc:
+            self.stats.semantic_errors += 1
+            logger.debug(
+                f"Error getting semantic cached response (falling back to RAG): {exc}",
+                exc_info=False,
+            )
+            return None
+
+    async def cache_semantic_response(
+        self,
+        cache_type: str,
+        query: str,
+        embedding: List[float],
+        response: RAGAnswer,
+        vector_repository: QdrantVectorRepository,
+        ttl: Optional[int] = None,
+    ) -> bool:
+        from app.repository.vector import CollectionType
+
+        try:
+            await self._ensure_semantic_collection(vector_repository)
+            ttl = ttl or self.settings.CAG_TTL
+            now = time.time()
+
+            await vector_repository.upsert_vectors(
+                points=[
+                    PointStruct(
+                        id=self._semantic_point_id(cache_type, query),
+                        vector=embedding,
+                        payload={
+                            "cache_type": cache_type,
+                            "query": query,
+                            "answer": response.answer,
+                            "sources": response.sources,
+                            "chunk_ids": response.chunk_ids,
+                            "created_at": now,
+                            "expires_at": now + ttl,
+                        },
+                    )
+                ],
+                collection=CollectionType.KAVAK_CAG_SEMANTIC,
+            )
+            return True
+
+        except Exception as exc:
+            self.stats.semantic_errors += 1
+            logger.warning(
+                f"Error caching semantic response (non-fatal): {exc}", exc_info=False
+            )
+            return False
+
+    async def _invalidate_semantic_cache(
+        self, filter_by: Optional[Dict[str, Any]] = None
+    ) -> None:
+        from app.repository.vector import CollectionType, QdrantVectorRepository
+
+        try:
+            vector_repository = QdrantVectorRepository.get_instance()
+            await vector_repository.delete_by_filter(
+                filter_by=filter_by,
+                collection=CollectionType.KAVAK_CAG_SEMANTIC,
+            )
+        except Exception as exc:
+            logger.warning(f"Error invalidating semantic cache (non-fatal): {exc}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        stats["local_size"] = len(self._local)
+        stats["inflight"] = len(self._inflight)
+        stats["refreshing"] = len(self._refresh_tasks)
+        stats["serialization"] = self._codec.get_stats()
+        stats["invalidation_listener"] = bool(
+            self._listener_task and not self._listener_task.done()
+        )
+        stats["semantic_enabled"] = self.semantic_enabled
+        stats["semantic_threshold"] = self.settings.CAG_SEMANTIC_THRESHOLD
+        return stats
+
+    async def invalidate_chunks(self, chunk_ids: List[Any]) -> int:
+        """Drop only the cached answers that were built from any of ``chunk_ids``."""
+        if not chunk_ids:
+            return 0
+
+        try:
+            redis_client = await self._get_redis_client()
+            dependency_keys = [self._dependency_key(chunk_id) for chunk_id in chunk_ids]
+
+            members = await redis_client.sunion(dependency_keys)
+            cache_keys = sorted(
+                key.decode() if isinstance(key, bytes) else key for key in members
+            )
+
+            deleted = 0
+            if cache_keys:
+                deleted = await redis_client.delete(*cache_keys)
+                for key in cache_keys:
+                    self._local.delete(key)
+                await self._publish_invalidation(redis_client, keys=cache_keys)
+            await redis_client.delete(*dependency_keys)
+
+            if self.semantic_enabled:
+                await self._invalidate_semantic_cache(
+                    {"chunk_ids": [str(chunk_id) for chunk_id in chunk_ids]}
+                )
+
+            logger.info(
+                f"Invalidated {deleted} cache entries depending on {len(chunk_ids)} chunks"
+            )
+            return deleted
+
+        except Exception as exc:
+            logger.error(f"Error invalidating cache by chunk: {exc}", exc_info=True)
+            return 0
+
     async def invalidate_cache(
         self, cache_type: Optional[str] = None, pattern: Optional[str] = None
     ) -> int:
+        """Flush cached answers for ``cache_type`` (or all of them).
+
+        Without ``pattern`` this bumps a generation counter, which is O(1):
+        old keys become unreachable and expire on their own, and 0 is
+        returned. With ``pattern`` matching keys are scanned and deleted, and
+        the number deleted is returned.
+        """
         try:
             redis_client = await self._get_redis_client()
 
             if pattern:
-                search_pattern = pattern
-            elif cache_type:
-                search_pattern = f"{self.settings.CAG_KEY_PREFIX}:{cache_type}:*"
-            else:
-                search_pattern = f"{self.settings.CAG_KEY_PREFIX}:*"
-
-            keys = []
-            async for key in redis_client.scan_iter(match=search_pattern):
-                keys.append(key)
-
-            if keys:
-                deleted = await redis_client.delete(*keys)
-                logger.info(
-                    f"Invalidated {deleted} cache entries matching: {search_pattern}"
+                self._local.delete_where(lambda key: fnmatch.fnmatchcase(key, pattern))
+                await self._publish_invalidation(redis_client, pattern=pattern)
+
+                keys = []
+                async for key in redis_client.scan_iter(match=pattern):
+                    keys.append(key)
+
+                if keys:
+                    deleted = await redis_client.delete(*keys)
+                    logger.info(
+                        f"Invalidated {deleted} cache entries matching: {pattern}"
+                    )
+                    return deleted
+
+                return 0
+
+            generation_key = self._generation_key(cache_type)
+            generation = await redis_client.incr(generation_key)
+            self._generations.clear()
+
+            local_pattern = (
+                f"{self.settings.CAG_KEY_PREFIX}:{cache_type}:*"
+                if cache_type
+                else f"{self.settings.CAG_KEY_PREFIX}:*"
+            )
+            self._local.delete_where(
+                lambda key: fnmatch.fnmatchcase(key, local_pattern)
+            )
+            await self._publish_invalidation(
+                redis_client, pattern=local_pattern, flush_generations=True
+            )
+
+            if self.semantic_enabled:
+                await self._invalidate_semantic_cache(
+                    {"cache_type": cache_type} if cache_type else None
                 )
-                return deleted
 
+            logger.info(
+                f"Flushed CAG namespace {generation_key} -> generation {generation}"
+            )
             return 0
 
         except Exception as exc:
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from app.core.config.logging import logger
+from app.core.config.settings.redis_config import RedisSettings
+from app.core.services.local_cache import LocalTTLCache
+from app.core.services.redis_pool import get_redis_client
+
+
+class CatalogVersion:
+    """Monotonic catalog version kept in Redis and bumped by the catalog loader.
+
+    Workers cache the value for ``CATALOG_VERSION_CACHE_TTL`` seconds, so
+    anything keyed by it picks up a reload within that window.
+    """
+
+    def __init__(self, settings: Optional[RedisSettings] = None):
+        self.settings = settings or RedisSettings()
+        self._cached: LocalTTLCache[int] = LocalTTLCache(
+            max_size=1, ttl=self.settings.CATALOG_VERSION_CACHE_TTL
+        )
+
+    async def current(self) -> int:
+        version = self._cached.get(self.settings.CATALOG_VERSION_KEY)
+        if version is not None:
+            return version
+
+        raw = await get_redis_client().get(self.settings.CATALOG_VERSION_KEY)
+        version = int(raw or 0)
+        self._cached.set(self.settings.CATALOG_VERSION_KEY, version)
+        return version
+
+    async def bump(self) -> int:
+        version = await get_redis_client().incr(self.settings.CATALOG_VERSION_KEY)
+        self._cached.clear()
+        logger.info(f"Catalog version bumped to {version}")
+        return version
+
+
+_catalog_version_instance: Optional[CatalogVersion] = None
+
+
+def get_catalog_version() -> CatalogVersion:
+    global _catalog_version_instance
+    if _catalog_version_instance is None:
+        _catalog_version_instance = CatalogVersion()
+    return _catalog_version_instance
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.config.logging import logger
+
+EmbedBatchFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+@dataclass
+class _PendingEmbedding:
+    text: str
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class EmbeddingBatchStats:
+    batches: int = 0
+    requests: int = 0
+    unique_texts: int = 0
+    errors: int = 0
+    max_batch_size: int = 0
+    total_queue_wait_ms: float = 0.0
+    max_queue_wait_ms: float = 0.0
+    total_request_ms: float = 0.0
+    batch_size_histogram: Dict[int, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "unique_texts": self.unique_texts,
+            "errors": self.errors,
+            "avg_batch_size": round(self.requests / self.batches, 2)
+            if self.batches
+            else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "avg_queue_wait_ms": round(self.total_queue_wait_ms / self.requests, 3)
+            if self.requests
+            else 0.0,
+            "max_queue_wait_ms": round(self.max_queue_wait_ms, 3),
+            "avg_request_ms": round(self.total_request_ms / self.batches, 3)
+            if self.batches
+            else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+        }
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding calls into batched provider requests.
+
+    Callers are parked on a future; the pending queue is flushed when it
+    reaches ``max_batch_size`` or when ``max_wait_ms`` has elapsed since the
+    first queued text, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        embed_batch_fn: EmbedBatchFn,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self._embed_batch_fn = embed_batch_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait_s = max(max_wait_ms, 0.0) / 1000.0
+        self._pending: List[_PendingEmbedding] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self.stats = EmbeddingBatchStats()
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(
+            _PendingEmbedding(text=text, future=future, enqueued_at=time.perf_counter())
+        )
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_wait_s, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            batch = self._pending[: self._max_batch_size]
+            self._pending = self._pending[self._max_batch_size :]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: List[_PendingEmbedding]) -> None:
+        batch = [item for item in batch if not item.future.done()]
+        if not batch:
+            return
+
+        dispatched_at = time.perf_counter()
+        unique_texts = list(dict.fromkeys(item.text for item in batch))
+
+        try:
+            vectors = await self._embed_batch_fn(unique_texts)
+            if len(vectors) != len(unique_texts):
+                raise RuntimeError(
+                    f"Embedding batch returned {len(vectors)} vectors for {len(unique_texts)} texts"
+                )
+        except Exception as exc:
+            self.stats.errors += 1
+            logger.error(f"Error generating embedding batch: {exc}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+        finally:
+            self._record_batch(batch, len(unique_texts), dispatched_at)
+
+        vectors_by_text = dict(zip(unique_texts, vectors))
+        for item in batch:
+            if not item.future.done():
+                item.future.set_result(vectors_by_text[item.text])
+
+    def _record_batch(
+        self, batch: List[_PendingEmbedding], unique_count: int, dispatched_at: float
+    ) -> None:
+        now = time.perf_counter()
+        size = len(batch)
+
+        self.stats.batches += 1
+        self.stats.requests += size
+        self.stats.unique_texts += unique_count
+        self.stats.max_batch_size = max(self.stats.max_batch_size, size)
+        self.stats.total_request_ms += (now - dispatched_at) * 1000.0
+        self.stats.batch_size_histogram[size] = (
+            self.stats.batch_size_histogram.get(size, 0) + 1
+        )
+
+        for item in batch:
+            wait_ms = (dispatched_at - item.enqueued_at) * 1000.0
+            self.stats.total_queue_wait_ms += wait_ms
+            self.stats.max_queue_wait_ms = max(self.stats.max_queue_wait_ms, wait_ms)
+
+        logger.debug(
+            f"Embedding batch dispatched: size={size}, unique={unique_count}, "
+            f"request_ms={(now - dispatched_at) * 1000.0:.1f}"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        stats["max_batch_size_limit"] = self._max_batch_size
+        stats["max_wait_ms"] = self._max_wait_s * 1000.0
+        stats["pending"] = len(self._pending)
+        stats["inflight_batches"] = len(self._inflight)
+        return stats
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import redis.asyncio as aioredis
+
+from app.core.config.logging import logger
+from app.core.config.settings.redis_config import RedisSettings
+from app.core.services.local_cache import LocalTTLCache
+from app.core.services.redis_pool import get_redis_client
+
+SUPPORTED_DTYPES = {"float16": "<f2", "float32": "<f4"}
+
+
+@dataclass
+class EmbeddingCacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    redis_errors: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "redis_errors": self.redis_errors,
+            "hit_rate": round((self.local_hits + self.redis_hits) / lookups, 4)
+            if lookups
+            else 0.0,
+        }
+
+
+class EmbeddingCache:
+    """Two-level cache for query embeddings: in-process LRU backed by Redis.
+
+    Vectors are stored in Redis as raw little-endian float16/float32 bytes
+    rather than JSON, which keeps a 1536-dim entry at 3-6 KB.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        local_max_size: int = 2048,
+        local_ttl: float = 3600.0,
+        dtype: str = "float16",
+        settings: Optional[RedisSettings] = None,
+    ):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Unsupported embedding cache dtype '{dtype}', expected one of {list(SUPPORTED_DTYPES)}"
+            )
+
+        self.settings = settings or RedisSettings()
+        self.model = model
+        self._dtype_name = dtype
+        self._dtype = np.dtype(SUPPORTED_DTYPES[dtype])
+        self._local: LocalTTLCache[List[float]] = LocalTTLCache(
+            max_size=local_max_size, ttl=local_ttl
+        )
+        self.stats = EmbeddingCacheStats()
+
+    async def _get_redis_client(self) -> aioredis.Redis:
+        return get_redis_client()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def _build_cache_key(self, text: str) -> str:
+        text_hash = hashlib.sha1(self.normalize_text(text).encode()).hexdigest()
+        return f"{self.settings.EMBEDDING_KEY_PREFIX}:{self.model}:{self._dtype_name}:{text_hash}"
+
+    def _encode(self, vector: List[float]) -> bytes:
+        return np.asarray(vector, dtype=self._dtype).tobytes()
+
+    def _decode(self, raw: bytes) -> List[float]:
+        return np.frombuffer(raw, dtype=self._dtype).astype(np.float32).tolist()
+
+    async def get(self, text: str) -> Optional[List[float]]:
+        cache_key = self._build_cache_key(text)
+
+        vector = self._local.get(cache_key)
+        if vector is not None:
+            self.stats.local_hits += 1
+            return vector
+
+        try:
+            redis_client = await self._get_redis_client()
+            raw = await redis_client.get(cache_key)
+        except Exception as exc:
+            self.stats.redis_errors += 1
+            logger.debug(f"Error reading embedding cache (falling back): {exc}")
+            raw = None
+
+        if raw:
+            vector = self._decode(raw)
+            self._local.set(cache_key, vector)
+            self.stats.redis_hits += 1
+            return vector
+
+        self.stats.misses += 1
+        return None
+
+    async def set(self, text: str, vector: List[float]) -> None:
+        cache_key = self._build_cache_key(text)
+        self._local.set(cache_key, vector)
+        self.stats.writes += 1
+
+        try:
+            redis_client = await self._get_redis_client()
+            await redis_client.setex(
+                cache_key, self.settings.EMBEDDING_TTL, self._encode(vector)
+            )
+        except Exception as exc:
+            self.stats.redis_errors += 1
+            logger.debug(f"Error writing embedding cache (non-fatal): {exc}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        stats["local_size"] = len(self._local)
+        stats["dtype"] = self._dtype_name
+        return stats
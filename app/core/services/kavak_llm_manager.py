@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from app.core.config.logging import logger
 from app.core.config.settings.kavak_config import KavakSettings
-from llama_index.llms.openai import OpenAI
+from app.core.services.embedding_batcher import EmbeddingBatcher
+from app.core.services.embedding_cache import EmbeddingCache
+from app.core.services.llm_client_pool import LLMClientPool
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.core.llms import ChatMessage, LLM
 
@@ -22,8 +24,12 @@ class KavakLLMManager:
             return
 
         self.settings = KavakSettings()
-        self._llm: Optional[LLM] = None
-        self._embedding_model: Optional[OpenAIEmbedding] = None
+        self._client_pool = LLMClientPool(
+            llm_settings=self.settings.llm,
+            embedding_settings=self.settings.embedding,
+        )
+        self._embedding_batcher: Optional[EmbeddingBatcher] = None
+        self._embedding_cache: Optional[EmbeddingCache] = None
         self._initialized = True
 
         logger.info(
@@ -35,13 +41,9 @@ class KavakLLMManager:
         return self._create_llm(temperature=temperature, max_tokens=max_tokens)
 
     def _create_llm(self, temperature: float = 0.3, max_tokens: int = 2000) -> LLM:
-        model = self.settings.llm.MODEL
-
-        return OpenAI(
-            model=model,
+        return self._client_pool.get_llm(
             temperature=temperature,
             max_tokens=max_tokens,
-            api_key=self.settings.llm.OPENAI_API_KEY,
         )
 
     async def complete_text(
@@ -56,6 +58,20 @@ class KavakLLMManager:
             logger.error(f"Error completing text: {exc}")
             raise
 
+    async def complete_text_stream(
+        self, prompt: str, temperature: float = 0.7, max_tokens: int = 2000
+    ) -> AsyncIterator[str]:
+        try:
+            llm = self.get_llm(temperature=temperature, max_tokens=max_tokens)
+            message = ChatMessage.from_str(prompt, role="user")
+            stream = await llm.astream_chat([message])
+            async for chunk in stream:
+                if chunk.delta:
+                    yield chunk.delta
+        except Exception as exc:
+            logger.error(f"Error streaming text completion: {exc}")
+            raise
+
     async def complete_structured_text(
         self,
         prompt: str,
@@ -64,9 +80,11 @@ class KavakLLMManager:
         max_tokens: int = 2000,
     ) -> Any:
         try:
-            llm = self.get_llm(temperature=temperature, max_tokens=max_tokens)
-
-            structured_llm = llm.as_structured_llm(output_cls=response_schema)
+            structured_llm = self._client_pool.get_structured_llm(
+                response_schema=response_schema,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
 
             message = ChatMessage.from_str(prompt, role="user")
             response = await structured_llm.achat([message])
@@ -92,22 +110,85 @@ class KavakLLMManager:
             raise
 
     def _get_embedding_model(self) -> OpenAIEmbedding:
-        if self._embedding_model is None:
-            self._embedding_model = OpenAIEmbedding(
-                model="text-embedding-3-small",
-                api_key=self.settings.llm.OPENAI_API_KEY,
+        return self._client_pool.get_embedding_model()
+
+    def _get_embedding_batcher(self) -> EmbeddingBatcher:
+        if self._embedding_batcher is None:
+            self._embedding_batcher = EmbeddingBatcher(
+                embed_batch_fn=self._embed_batch,
+                max_batch_size=self.settings.embedding.BATCH_MAX_SIZE,
+                max_wait_ms=self.settings.embedding.BATCH_MAX_WAIT_MS,
+            )
+        return self._embedding_batcher
+
+    def _embedding_model_id(self) -> str:
+        # Shortened embeddings are different vectors; keep their cache entries apart.
+        dimensions = self.settings.embedding.DIMENSIONS
+        model = self.settings.embedding.MODEL
+        return f"{model}@{dimensions}" if dimensions else model
+
+    def _get_embedding_cache(self) -> EmbeddingCache:
+        if self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache(
+                model=self._embedding_model_id(),
+                local_max_size=self.settings.embedding.CACHE_LOCAL_MAX_SIZE,
+                local_ttl=self.settings.embedding.CACHE_LOCAL_TTL,
+                dtype=self.settings.embedding.CACHE_DTYPE,
             )
-        return self._embedding_model
+        return self._embedding_cache
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        embedding_model = self._get_embedding_model()
+        if len(texts) == 1:
+            return [await embedding_model.aget_text_embedding(texts[0])]
+        return await embedding_model.aget_text_embedding_batch(texts)
 
     async def embed_text(self, text: str) -> list[float]:
         try:
-            embedding_model = self._get_embedding_model()
-            embedding = await embedding_model.aget_text_embedding(text)
+            cache = (
+                self._get_embedding_cache()
+                if self.settings.embedding.CACHE_ENABLED
+                else None
+            )
+            if cache:
+                cached_embedding = await cache.get(text)
+                if cached_embedding is not None:
+                    return cached_embedding
+
+            if self.settings.embedding.BATCH_ENABLED:
+                embedding = await self._get_embedding_batcher().embed(text)
+            else:
+                embedding_model = self._get_embedding_model()
+                embedding = await embedding_model.aget_text_embedding(text)
+
+            if cache:
+                await cache.set(text, embedding)
+
             return embedding
         except Exception as exc:
             logger.error(f"Error generating embedding: {exc}")
             raise
 
+    def get_embedding_stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.settings.embedding.MODEL,
+            "dimensions": self.settings.embedding.DIMENSIONS,
+            "batching_enabled": self.settings.embedding.BATCH_ENABLED,
+            "batcher": self._embedding_batcher.get_stats()
+            if self._embedding_batcher
+            else None,
+            "cache_enabled": self.settings.embedding.CACHE_ENABLED,
+            "cache": self._embedding_cache.get_stats()
+            if self._embedding_cache
+            else None,
+        }
+
+    def get_client_pool_stats(self) -> Dict[str, Any]:
+        return self._client_pool.get_stats()
+
+    async def aclose(self) -> None:
+        await self._client_pool.aclose()
+
     def get_llama_index_llm(
         self, temperature: float = 0.7, max_tokens: int = 2000
     ) -> LLM:
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from llama_index.core.llms import LLM
+from llama_index.embeddings.openai import OpenAIEmbedding
+from llama_index.llms.openai import OpenAI
+
+from app.core.config.logging import logger
+from app.core.config.settings.kavak_config import (
+    KavakEmbeddingSettings,
+    KavakLLMSettings,
+)
+
+LLMKey = Tuple[str, float, int]
+
+
+@dataclass
+class LLMClientPoolStats:
+    llm_created: int = 0
+    llm_reused: int = 0
+    structured_created: int = 0
+    structured_reused: int = 0
+    http_clients_created: int = 0
+
+
+class LLMClientPool:
+    """Registry of long-lived OpenAI clients sharing one keep-alive HTTP pool.
+
+    LLM instances are keyed by (model, temperature, max_tokens); the chat LLM,
+    structured extractors and the embedding model all send their requests
+    through the same ``httpx.AsyncClient``.
+    """
+
+    def __init__(
+        self,
+        llm_settings: KavakLLMSettings,
+        embedding_settings: KavakEmbeddingSettings,
+    ):
+        self.llm_settings = llm_settings
+        self.embedding_settings = embedding_settings
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._llms: Dict[LLMKey, LLM] = {}
+        self._structured_llms: Dict[Tuple[LLMKey, type], Any] = {}
+        self._embedding_model: Optional[OpenAIEmbedding] = None
+        self.stats = LLMClientPoolStats()
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.llm_settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=self.llm_settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=self.llm_settings.HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(
+                    self.llm_settings.HTTP_TIMEOUT,
+                    connect=self.llm_settings.HTTP_CONNECT_TIMEOUT,
+                ),
+            )
+            self.stats.http_clients_created += 1
+            logger.info(
+                f"Created shared OpenAI HTTP pool: max_connections={self.llm_settings.HTTP_MAX_CONNECTIONS}, "
+                f"keepalive={self.llm_settings.HTTP_MAX_KEEPALIVE_CONNECTIONS}"
+            )
+        return self._http_client
+
+    def get_llm(
+        self,
+        temperature: float,
+        max_tokens: int,
+        model: Optional[str] = None,
+    ) -> LLM:
+        key: LLMKey = (model or self.llm_settings.MODEL, float(temperature), max_tokens)
+
+        llm = self._llms.get(key)
+        if llm is not None:
+            self.stats.llm_reused += 1
+            return llm
+
+        llm = OpenAI(
+            model=key[0],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            api_key=self.llm_settings.OPENAI_API_KEY,
+            async_http_client=self.get_http_client(),
+        )
+        self._llms[key] = llm
+        self.stats.llm_created += 1
+        return llm
+
+    def get_structured_llm(
+        self,
+        response_schema: type,
+        temperature: float,
+        max_tokens: int,
+        model: Optional[str] = None,
+    ) -> Any:
+        key: LLMKey = (model or self.llm_settings.MODEL, float(temperature), max_tokens)
+
+        structured_llm = self._structured_llms.get((key, response_schema))
+        if structured_llm is not None:
+            self.stats.structured_reused += 1
+            return structured_llm
+
+        llm = self.get_llm(temperature=temperature, max_tokens=max_tokens, model=model)
+        structured_llm = llm.as_structured_llm(output_cls=response_schema)
+        self._structured_llms[(key, response_schema)] = structured_llm
+        self.stats.structured_created += 1
+        return structured_llm
+
+    def get_embedding_model(self) -> OpenAIEmbedding:
+        if self._embedding_model is None:
+            self._embedding_model = OpenAIEmbedding(
+                model=self.embedding_settings.MODEL,
+                api_key=self.llm_settings.OPENAI_API_KEY,
+                embed_batch_size=self.embedding_settings.BATCH_MAX_SIZE,
+                dimensions=self.embedding_settings.DIMENSIONS,
+                async_http_client=self.get_http_client(),
+            )
+        return self._embedding_model
+
+    def _get_connection_stats(self) -> Dict[str, Any]:
+        if self._http_client is None or self._http_client.is_closed:
+            return {"open": False}
+
+        try:
+            pool = self._http_client._transport._pool
+            connections = list(pool.connections)
+            idle = sum(1 for conn in connections if conn.is_idle())
+            return {
+                "open": True,
+                "connections": len(connections),
+                "idle": idle,
+                "active": len(connections) - idle,
+            }
+        except AttributeError:
+            return {"open": True}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "llm_instances": len(self._llms),
+            "llm_created": self.stats.llm_created,
+            "llm_reused": self.stats.llm_reused,
+            "structured_instances": len(self._structured_llms),
+            "structured_created": self.stats.structured_created,
+            "structured_reused": self.stats.structured_reused,
+            "http_clients_created": self.stats.http_clients_created,
+            "max_connections": self.llm_settings.HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": self.llm_settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "http_pool": self._get_connection_stats(),
+        }
+
+    async def aclose(self) -> None:
+        self._llms.clear()
+        self._structured_llms.clear()
+        self._embedding_model = None
+
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config.logging import logger
+from app.core.config.settings.redis_config import RedisSettings
+
+_shared_pool: Optional[aioredis.BlockingConnectionPool] = None
+
+
+def get_redis_pool(
+    settings: Optional[RedisSettings] = None,
+) -> aioredis.BlockingConnectionPool:
+    """Return the process-wide Redis connection pool, creating it on first use.
+
+    Connections are binary (``decode_responses=False``); callers encode and
+    decode their own values.
+    """
+    global _shared_pool
+
+    if _shared_pool is None:
+        settings = settings or RedisSettings()
+        connection_kwargs: Dict[str, Any] = {
+            "host": settings.HOST,
+            "port": settings.PORT,
+            "decode_responses": False,
+            "socket_timeout": settings.SOCKET_TIMEOUT,
+            "socket_connect_timeout": settings.SOCKET_CONNECT_TIMEOUT,
+            "health_check_interval": settings.HEALTH_CHECK_INTERVAL,
+            "socket_keepalive": True,
+        }
+
+        if settings.USERNAME:
+            connection_kwargs["username"] = settings.USERNAME
+        if settings.PASSWORD:
+            connection_kwargs["password"] = settings.PASSWORD
+
+        _shared_pool = aioredis.BlockingConnectionPool(
+            max_connections=settings.POOL_MAX_CONNECTIONS,
+            timeout=settings.POOL_TIMEOUT,
+            **connection_kwargs,
+        )
+
+    return _shared_pool
+
+
+def get_redis_client() -> aioredis.Redis:
+    return aioredis.Redis(connection_pool=get_redis_pool())
+
+
+async def init_redis_pool(settings: Optional[RedisSettings] = None) -> None:
+    settings = settings or RedisSettings()
+    get_redis_pool(settings)
+
+    try:
+        await get_redis_client().ping()
+        logger.info(
+            f"Connected to Redis at {settings.HOST}:{settings.PORT} "
+            f"(pool max_connections={settings.POOL_MAX_CONNECTIONS})"
+        )
+    except Exception as exc:
+        logger.warning(f"Failed to connect to Redis: {exc}")
+
+
+async def close_redis_pool() -> None:
+    global _shared_pool
+
+    if _shared_pool is not None:
+        await _shared_pool.aclose()
+        _shared_pool = None
+
+
+def get_redis_pool_stats() -> Dict[str, Any]:
+    if _shared_pool is None:
+        return {"open": False}
+
+    stats: Dict[str, Any] = {
+        "open": True,
+        "max_connections": _shared_pool.max_connections,
+    }
+    try:
+        stats["in_use"] = len(_shared_pool._in_use_connections)
+        stats["idle"] = len(_shared_pool._available_connections)
+    except AttributeError:
+        pass
+    return stats
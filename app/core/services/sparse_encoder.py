@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from qdrant_client.models import SparseVector
+
+from app.core.config.settings.kavak_config import KavakRetrievalSettings
+
+STOPWORDS = frozenset(
+    "a al con de del el en es la las lo los para por que se su un una y".split()
+)
+
+
+class BM25SparseEncoder:
+    """Local BM25 encoder producing Qdrant sparse vectors.
+
+    Tokens are hashed into the sparse index space, so no vocabulary has to be
+    stored. Documents carry the BM25 term-frequency component; IDF is applied
+    by Qdrant (``Modifier.IDF`` on the sparse vector) and stays correct as the
+    collection changes. Queries are binary term vectors.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        avg_doc_length: Optional[float] = None,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = avg_doc_length
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        text = unicodedata.normalize("NFKD", (text or "").lower())
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+        return [
+            token for token in re.findall(r"[a-z0-9]+", text) if token not in STOPWORDS
+        ]
+
+    @staticmethod
+    def token_index(token: str) -> int:
+        return zlib.crc32(token.encode()) & 0x7FFFFFFF
+
+    def fit(self, texts: Iterable[str]) -> "BM25SparseEncoder":
+        lengths = [len(self.tokenize(text)) for text in texts]
+        self.avg_doc_length = sum(lengths) / len(lengths) if lengths else None
+        return self
+
+    def encode_document(self, text: str) -> SparseVector:
+        tokens = self.tokenize(text)
+        avg_doc_length = self.avg_doc_length or len(tokens) or 1
+        norm = self.k1 * (1 - self.b + self.b * len(tokens) / avg_doc_length)
+
+        weights = {
+            token: tf * (self.k1 + 1) / (tf + norm)
+            for token, tf in Counter(tokens).items()
+        }
+        return self._to_sparse_vector(weights)
+
+    def encode_query(self, text: str) -> SparseVector:
+        return self._to_sparse_vector(dict.fromkeys(self.tokenize(text), 1.0))
+
+    def _to_sparse_vector(self, weights: Dict[str, float]) -> SparseVector:
+        # Hash collisions are merged; Qdrant requires unique indices.
+        merged: Dict[int, float] = {}
+        for token, weight in weights.items():
+            index = self.token_index(token)
+            merged[index] = merged.get(index, 0.0) + weight
+        return SparseVector(indices=list(merged), values=list(merged.values()))
+
+
+def build_sparse_encoder(
+    settings: Optional[KavakRetrievalSettings] = None,
+) -> BM25SparseEncoder:
+    """New encoder using the configured BM25 ``k1`` and ``b``."""
+    settings = settings or KavakRetrievalSettings()
+    return BM25SparseEncoder(k1=settings.BM25_K1, b=settings.BM25_B)
+
+
+_sparse_encoder_instance: Optional[BM25SparseEncoder] = None
+
+
+def get_sparse_encoder() -> BM25SparseEncoder:
+    global _sparse_encoder_instance
+    if _sparse_encoder_instance is None:
+        _sparse_encoder_instance = build_sparse_encoder()
+    return _sparse_encoder_instance
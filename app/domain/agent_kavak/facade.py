@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 from app.core.config.logging import logger
 from app.core.services.kavak_llm_manager import KavakLLMManager
 from app.core.services.memory_manager import MemoryManager
@@ -44,3 +44,27 @@ class KavakAgentFacade:
         except Exception as exc:
             logger.error(f"Error processing query with Kavak agent: {exc}")
             raise
+
+    async def process_query_stream(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            logger.info(
+                f"Processing streaming query with Kavak agent for user: {user_id}"
+            )
+
+            workflow = await self.workflow_factory.get_workflow()
+
+            async for event in workflow.process_query_stream(
+                query=query,
+                user_id=user_id,
+                **kwargs,
+            ):
+                yield event
+
+        except Exception as exc:
+            logger.error(f"Error streaming query with Kavak agent: {exc}")
+            raise
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from app.core.config.logging import logger
+from app.core.config.settings.redis_config import RedisSettings
+from app.core.services.kavak_llm_manager import KavakLLMManager
+from app.repository.postgres.chat_context_repository import ChatContextRepository
+from app.repository.vector import QdrantVectorRepository
+from .tools import rag_value_prop_tool
+
+
+@dataclass
+class CAGWarmupReport:
+    candidates: int = 0
+    warmed: int = 0
+    failed: int = 0
+    history_queries: int = 0
+    covered_queries: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def projected_hit_rate(self) -> float:
+        """Share of historical value-prop lookups answered by the warmed entries."""
+        if not self.history_queries:
+            return 0.0
+        return self.covered_queries / self.history_queries
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "candidates": self.candidates,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "history_queries": self.history_queries,
+            "covered_queries": self.covered_queries,
+            "projected_hit_rate": round(self.projected_hit_rate, 4),
+            "elapsed_s": round(self.elapsed_s, 2),
+        }
+
+
+async def warm_value_prop_cache(
+    vector_repository: QdrantVectorRepository,
+    llm_manager: KavakLLMManager,
+    chat_context_repository: Optional[ChatContextRepository] = None,
+    top_n: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    lookback_days: Optional[int] = None,
+) -> CAGWarmupReport:
+    """Pre-populate the CAG with answers to the most frequent value-prop questions.
+
+    Questions are mined from ``chat_context`` and answered through
+    ``rag_value_prop_tool`` with at most ``concurrency`` in flight; questions
+    that are already cached cost a single Redis read.
+    """
+    settings = RedisSettings()
+    top_n = top_n or settings.CAG_WARMUP_TOP_N
+    concurrency = concurrency or settings.CAG_WARMUP_CONCURRENCY
+    lookback_days = lookback_days or settings.CAG_WARMUP_LOOKBACK_DAYS
+    chat_context_repository = chat_context_repository or ChatContextRepository()
+
+    started_at = time.perf_counter()
+    since = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+
+    top_queries = await chat_context_repository.get_top_value_prop_queries(
+        limit=top_n, since=since
+    )
+    report = CAGWarmupReport(
+        candidates=len(top_queries),
+        history_queries=await chat_context_repository.count_value_prop_queries(
+            since=since
+        ),
+        covered_queries=sum(hits for _, hits in top_queries),
+    )
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def warm(query: str) -> None:
+        async with semaphore:
+            try:
+                await rag_value_prop_tool(
+                    query=query,
+                    vector_repository=vector_repository,
+                    llm_manager=llm_manager,
+                )
+                report.warmed += 1
+            except Exception as exc:
+                report.failed += 1
+                logger.warning(f"Error warming CAG entry '{query}': {exc}")
+
+    await asyncio.gather(*(warm(query) for query, _ in top_queries))
+
+    report.elapsed_s = time.perf_counter() - started_at
+    logger.info(f"CAG warm-up finished: {report.as_dict()}")
+    return report
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.core.config.logging import logger
+from app.core.config.settings.redis_config import RedisSettings
+from app.core.services.catalog_version import CatalogVersion, get_catalog_version
+from app.core.services.local_cache import LocalTTLCache
+from app.core.services.redis_pool import get_redis_client
+from app.models.agent.schemas import Car, CarPreferences
+from app.repository.vector import CollectionType, QdrantVectorRepository
+from .catalog_keywords import normalize_make, normalize_model
+
+
+# Structured fields read by ``car_from_payload`` and the rankers; the
+# embedded ``text`` is never needed once a point has been retrieved.
+CATALOG_PAYLOAD_FIELDS = [
+    "stock_id",
+    "make",
+    "model",
+    "make_norm",
+    "model_norm",
+    "year",
+    "version",
+    "price",
+    "km",
+    "bluetooth",
+    "car_play",
+    "largo",
+    "ancho",
+    "altura",
+    "transmission",
+    "fuel",
+    "city",
+    "city_norm",
+]
+
+
+def catalog_point_id(stock_id: str) -> int | str:
+    """Qdrant point id of a catalog car: numeric stock_ids are used as-is."""
+    if stock_id.isdigit():
+        return int(stock_id)
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"kavak_catalog:{stock_id}"))
+
+
+def car_from_payload(payload: Dict[str, Any]) -> Optional[Car]:
+    """Build a ``Car`` from a catalog point payload, or None if required fields are missing."""
+    stock_id = str(payload.get("stock_id") or "")
+    make = (payload.get("make") or "").strip()
+    model = (payload.get("model") or "").strip()
+    year = int(payload.get("year", 0)) if payload.get("year") else None
+    price = float(payload.get("price", 0)) if payload.get("price") else None
+    km = int(payload.get("km", 0)) if payload.get("km") else None
+
+    if not stock_id or not make or not model or not year or not price:
+        return None
+
+    version = payload.get("version", "")
+    largo = float(payload.get("largo", 0)) if payload.get("largo") else None
+    ancho = float(payload.get("ancho", 0)) if payload.get("ancho") else None
+    altura = float(payload.get("altura", 0)) if payload.get("altura") else None
+
+    return Car(
+        id=stock_id,
+        brand=make,
+        model=model,
+        year=year,
+        price=price,
+        mileage=km or 0,
+        version=version if version else None,
+        bluetooth=True if payload.get("bluetooth") else None,
+        car_play=True if payload.get("car_play") else None,
+        length=largo if largo else None,
+        width=ancho if ancho else None,
+        height=altura if altura else None,
+        transmission=payload.get("transmission"),
+        fuel=payload.get("fuel"),
+        city=payload.get("city"),
+        url=f"https://kavak.com/mx/auto/{stock_id}",
+    )
+
+
+@dataclass
+class CatalogSearchCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    payload_fetches: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "payload_fetches": self.payload_fetches,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CatalogSearchCache:
+    """Caches ranked catalog search results per canonical ``CarPreferences``.
+
+    Redis holds only the ordered stock_id list under a key that includes the
+    catalog version, so a catalog reload makes every entry unreachable. Cars
+    are rebuilt from a per-worker cache of ``Car`` objects, falling back to a
+    Qdrant payload fetch for the ids this worker has not seen yet.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[RedisSettings] = None,
+        catalog_version: Optional[CatalogVersion] = None,
+    ):
+        self.settings = settings or RedisSettings()
+        self.catalog_version = catalog_version or get_catalog_version()
+        self._cars: LocalTTLCache[Car] = LocalTTLCache(
+            max_size=self.settings.CATALOG_PAYLOAD_CACHE_MAX_SIZE,
+            ttl=self.settings.CATALOG_SEARCH_CACHE_TTL,
+        )
+        self._cars_version: Optional[int] = None
+        self.stats = CatalogSearchCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.CATALOG_SEARCH_CACHE_ENABLED
+
+    @staticmethod
+    def canonical_preferences(preferences: CarPreferences) -> str:
+        canonical = {
+            key: value.strip().casefold() if isinstance(value, str) else value
+            for key, value in preferences.model_dump(exclude_none=True).items()
+        }
+        # "VW" and "Volkswagen" are the same search, so they share an entry.
+        if preferences.brand:
+            canonical["brand"] = normalize_make(preferences.brand)
+        if preferences.model:
+            canonical["model"] = normalize_model(preferences.model)
+        return json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+
+    def _build_cache_key(
+        self,
+        version: int,
+        preferences: CarPreferences,
+        top_k: int,
+        free_text: Optional[str] = None,
+    ) -> str:
+        normalized_text = " ".join((free_text or "").casefold().split())
+        digest = hashlib.sha1(
+            f"{self.canonical_preferences(preferences)}|{top_k}|{normalized_text}".encode()
+        ).hexdigest()
+        return f"{self.settings.CATALOG_SEARCH_KEY_PREFIX}:v{version}:{digest}"
+
+    async def _current_version(self) -> int:
+        version = await self.catalog_version.current()
+        if version != self._cars_version:
+            self._cars.clear()
+            self._cars_version = version
+        return version
+
+    async def get(
+        self,
+        preferences: CarPreferences,
+        top_k: int,
+        vector_repository: QdrantVectorRepository,
+        free_text: Optional[str] = None,
+    ) -> Optional[List[Car]]:
+        if not self.enabled:
+            return None
+
+        try:
+            version = await self._current_version()
+            raw = await get_redis_client().get(
+                self._build_cache_key(version, preferences, top_k, free_text)
+            )
+            if raw is None:
+                self.stats.misses += 1
+                return None
+
+            stock_ids: List[str] = json.loads(raw)
+            cars = await self._load_cars(stock_ids, vector_repository)
+            if cars is None:
+                self.stats.misses += 1
+                return None
+
+            self.stats.hits += 1
+            return cars
+
+        except Exception as exc:
+            self.stats.errors += 1
+            logger.debug(f"Error reading catalog search cache (falling back): {exc}")
+            return None
+
+    async def load_cars(
+        self, stock_ids: List[str], vector_repository: QdrantVectorRepository
+    ) -> Dict[str, Car]:
+        """Cars by stock_id, fetching payloads only for ids this worker has not seen.
+
+        Ids no longer in the catalog are absent from the result.
+        """
+        missing = [
+            stock_id for stock_id in stock_ids if self._cars.get(stock_id) is None
+        ]
+        if missing:
+            self.stats.payload_fetches += 1
+            payloads = await vector_repository.scroll_payloads(
+                fields=CATALOG_PAYLOAD_FIELDS,
+                filter_by={"stock_id": missing},
+                collection=CollectionType.KAVAK_CATALOG,
+            )
+            for payload in payloads:
+                car = car_from_payload(payload)
+                if car is not None:
+                    self._cars.set(car.id, car)
+
+        cars = {}
+        for stock_id in stock_ids:
+            car = self._cars.get(stock_id)
+            if car is not None:
+                cars[stock_id] = car
+        return cars
+
+    async def _load_cars(
+        self, stock_ids: List[str], vector_repository: QdrantVectorRepository
+    ) -> Optional[List[Car]]:
+        cars = await self.load_cars(stock_ids, vector_repository)
+        if any(stock_id not in cars for stock_id in stock_ids):
+            # The car left the catalog; recompute instead of returning a gap.
+            return None
+        return [cars[stock_id] for stock_id in stock_ids]
+
+    async def set(
+        self,
+        preferences: CarPreferences,
+        top_k: int,
+        cars: List[Car],
+        free_text: Optional[str] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            version = await self._current_version()
+            for car in cars:
+                self._cars.set(car.id, car)
+
+            await get_redis_client().setex(
+                self._build_cache_key(version, preferences, top_k, free_text),
+                self.settings.CATALOG_SEARCH_CACHE_TTL,
+                json.dumps([car.id for car in cars]),
+            )
+            self.stats.writes += 1
+
+        except Exception as exc:
+            self.stats.errors += 1
+            logger.debug(f"Error writing catalog search cache (non-fatal): {exc}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        stats["enabled"] = self.enabled
+        stats["catalog_version"] = self._cars_version
+        stats["cars_cached"] = len(self._cars)
+        return stats
+
+
+_catalog_search_cache_instance: Optional[CatalogSearchCache] = None
+
+
+def get_catalog_search_cache() -> CatalogSearchCache:
+    global _catalog_search_cache_instance
+    if _catalog_search_cache_instance is None:
+        _catalog_search_cache_instance = CatalogSearchCache()
+    return _catalog_search_cache_instance
@@ -0,0 +1,69 @@
+import json
+import uuid
+from typing import List, Optional, Tuple
+
+from app.core.config.logging import logger
+from app.core.config.settings.redis_config import RedisSettings
+from app.core.services.redis_pool import get_redis_client
+
+
+class CatalogCursorStore:
+    """Keeps the ranked stock_ids of a user's catalog searches for paging.
+
+    Each search is stored under ``{prefix}:{user_id}:{token}`` and the user's
+    latest token under ``{prefix}:{user_id}:latest``, so "muéstrame más"
+    reads the next page from Redis instead of embedding and querying again.
+    """
+
+    def __init__(self, settings: Optional[RedisSettings] = None):
+        self.settings = settings or RedisSettings()
+
+    def _build_key(self, user_id: str, token: str) -> str:
+        return f"{self.settings.CATALOG_CURSOR_KEY_PREFIX}:{user_id}:{token}"
+
+    async def save(self, user_id: str, stock_ids: List[str]) -> Optional[str]:
+        """Store a ranking and return its search token, or None if Redis failed."""
+        token = uuid.uuid4().hex[:8]
+        ttl = self.settings.CATALOG_CURSOR_TTL
+
+        try:
+            async with get_redis_client().pipeline(transaction=False) as pipe:
+                pipe.setex(self._build_key(user_id, token), ttl, json.dumps(stock_ids))
+                pipe.setex(self._build_key(user_id, "latest"), ttl, token)
+                await pipe.execute()
+            return token
+
+        except Exception as exc:
+            logger.debug(f"Error saving catalog cursor (non-fatal): {exc}")
+            return None
+
+    async def load(
+        self, user_id: str, token: Optional[str] = None
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Return ``(token, stock_ids)`` for ``token`` or the user's latest search."""
+        try:
+            client = get_redis_client()
+            if not token:
+                latest = await client.get(self._build_key(user_id, "latest"))
+                if latest is None:
+                    return None
+                token = latest.decode()
+
+            raw = await client.get(self._build_key(user_id, token))
+            if raw is None:
+                return None
+            return token, json.loads(raw)
+
+        except Exception as exc:
+            logger.debug(f"Error reading catalog cursor (falling back): {exc}")
+            return None
+
+
+_catalog_cursor_store_instance: Optional[CatalogCursorStore] = None
+
+
+def get_catalog_cursor_store() -> CatalogCursorStore:
+    global _catalog_cursor_store_instance
+    if _catalog_cursor_store_instance is None:
+        _catalog_cursor_store_instance = CatalogCursorStore()
+    return _catalog_cursor_store_instance
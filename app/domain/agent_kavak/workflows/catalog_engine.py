@@ -0,0 +1,355 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config.logging import logger
+from app.core.config.settings.kavak_config import KavakCatalogSettings
+from app.core.services.catalog_version import CatalogVersion, get_catalog_version
+from app.models.agent.schemas import Car, CarPreferences
+from app.repository.vector import CollectionType, QdrantVectorRepository
+from .catalog_cache import CATALOG_PAYLOAD_FIELDS, car_from_payload
+from .catalog_keywords import normalize_keyword, normalize_make, normalize_model
+
+ORDER_COLUMNS = {
+    "price_asc": ("price", False),
+    "price_desc": ("price", True),
+    "year_asc": ("year", False),
+    "year_desc": ("year", True),
+    "mileage_asc": ("km", False),
+    "mileage_desc": ("km", True),
+}
+
+# Numeric columns summarized by ``CatalogEngine.aggregate``.
+AGGREGATE_COLUMNS = ("price", "year", "km")
+GROUP_COLUMNS = ("make", "model")
+
+# CarPreferences dimension prefix -> payload column (mm).
+DIMENSION_FIELDS = {"length": "largo", "width": "ancho", "height": "altura"}
+
+
+def float_column(payloads: List[Dict[str, Any]], field: str) -> np.ndarray:
+    return np.array(
+        [float(p[field]) if p.get(field) else np.nan for p in payloads],
+        dtype=np.float64,
+    )
+
+
+def keyword_column(
+    payloads: List[Dict[str, Any]], field: str, normalize: Callable[[str], str]
+) -> np.ndarray:
+    return np.array(
+        [p.get(f"{field}_norm") or normalize(p.get(field)) for p in payloads],
+        dtype=object,
+    )
+
+
+def relevance_bonus(
+    price: np.ndarray,
+    year: np.ndarray,
+    km: np.ndarray,
+    budget_max: Optional[float] = None,
+) -> np.ndarray:
+    """Budget fit, recency and low-mileage bonuses added on top of similarity."""
+    score = np.zeros(len(price), dtype=np.float64)
+
+    if budget_max:
+        ratio = price / float(budget_max)
+        score += np.select(
+            [ratio < 0.7, ratio <= 0.95, ratio <= 1.0], [0.05, 0.15, 0.1], 0.0
+        )
+
+    score += np.nan_to_num((year - 2000) / 24.0) * 0.1
+
+    km = np.nan_to_num(km)
+    score += np.where(km > 0, 1.0 - np.minimum(km / 200000.0, 1.0), 0.0) * 0.1
+
+    return score
+
+
+def top_indices(key: np.ndarray, top_k: int) -> np.ndarray:
+    """Positions of the ``top_k`` smallest keys in order; NaN keys sort last.
+
+    Ties keep their original order, as a stable sort would.
+    """
+    key = np.where(np.isnan(key), np.inf, key)
+    if len(key) > top_k:
+        top = np.argpartition(key, top_k - 1)[:top_k]
+    else:
+        top = np.arange(len(key))
+    return top[np.lexsort((top, key[top]))]
+
+
+@dataclass
+class CatalogEngineStats:
+    loads: int = 0
+    queries: int = 0
+    last_load_ms: float = 0.0
+    total_query_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "queries": self.queries,
+            "last_load_ms": round(self.last_load_ms, 2),
+            "avg_query_ms": round(self.total_query_ms / self.queries, 4)
+            if self.queries
+            else 0.0,
+        }
+
+
+class CatalogEngine:
+    """Per-worker columnar copy of the catalog for structured filter+sort queries.
+
+    Payloads are scrolled from Qdrant once and kept as NumPy columns; a query
+    is a vectorized mask plus an ``argpartition`` over the ranking key, so
+    "the cheapest Toyota" is exact over the whole catalog instead of over the
+    nearest vectors. ``Car`` objects are only built for the rows returned.
+    The columns reload when the catalog version changes.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[KavakCatalogSettings] = None,
+        catalog_version: Optional[CatalogVersion] = None,
+    ):
+        self.settings = settings or KavakCatalogSettings()
+        self.catalog_version = catalog_version or get_catalog_version()
+        self._payloads: List[Dict[str, Any]] = []
+        self._columns: Dict[str, np.ndarray] = {}
+        self._rows_by_stock_id: Dict[str, int] = {}
+        self._version: Optional[int] = None
+        self._load_lock = asyncio.Lock()
+        self.stats = CatalogEngineStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.ENGINE_ENABLED
+
+    @property
+    def loaded(self) -> bool:
+        return self._version is not None
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    @staticmethod
+    def _build_index(
+        payloads: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, np.ndarray], Dict[str, int]]:
+        payloads = [p for p in payloads if car_from_payload(p) is not None]
+        columns = {
+            "price": float_column(payloads, "price"),
+            "year": float_column(payloads, "year"),
+            "km": float_column(payloads, "km"),
+            "largo": float_column(payloads, "largo"),
+            "ancho": float_column(payloads, "ancho"),
+            "altura": float_column(payloads, "altura"),
+            "make": keyword_column(payloads, "make", normalize_make),
+            "model": keyword_column(payloads, "model", normalize_model),
+            "transmission": keyword_column(payloads, "transmission", normalize_keyword),
+            "fuel": keyword_column(payloads, "fuel", normalize_keyword),
+            "city": keyword_column(payloads, "city", normalize_keyword),
+            "bluetooth": np.array([bool(p.get("bluetooth")) for p in payloads]),
+            "car_play": np.array([bool(p.get("car_play")) for p in payloads]),
+        }
+        rows_by_stock_id = {
+            str(payload["stock_id"]): row for row, payload in enumerate(payloads)
+        }
+        return payloads, columns, rows_by_stock_id
+
+    def _install(
+        self,
+        index: Tuple[List[Dict[str, Any]], Dict[str, np.ndarray], Dict[str, int]],
+        version: int,
+        started_at: float,
+    ) -> None:
+        # Swapped in together on the event loop so readers never see a mix
+        # of old and new columns.
+        self._payloads, self._columns, self._rows_by_stock_id = index
+        self._version = version
+        self.stats.loads += 1
+        self.stats.last_load_ms = (time.perf_counter() - started_at) * 1000.0
+        logger.info(
+            f"Loaded catalog engine: {len(self._payloads)} cars, version={version}, "
+            f"{self.stats.last_load_ms:.1f} ms"
+        )
+
+    def load(self, payloads: List[Dict[str, Any]], version: int) -> None:
+        started_at = time.perf_counter()
+        self._install(self._build_index(payloads), version, started_at)
+
+    async def refresh(self, vector_repository: QdrantVectorRepository) -> None:
+        version = await self.catalog_version.current()
+        payloads = await vector_repository.scroll_payloads(
+            fields=CATALOG_PAYLOAD_FIELDS, collection=CollectionType.KAVAK_CATALOG
+        )
+        # Building a Car and the NumPy columns for every payload is CPU-bound;
+        # keep it off the event loop.
+        started_at = time.perf_counter()
+        index = await asyncio.to_thread(self._build_index, payloads)
+        self._install(index, version, started_at)
+
+    async def ensure_fresh(self, vector_repository: QdrantVectorRepository) -> bool:
+        """Reload the columns if the catalog version moved; returns whether the engine is usable."""
+        if not self.enabled:
+            return False
+
+        try:
+            version = await self.catalog_version.current()
+            if version == self._version:
+                return True
+
+            async with self._load_lock:
+                if version != self._version:
+                    await self.refresh(vector_repository)
+            return True
+
+        except Exception as exc:
+            logger.warning(f"Catalog engine unavailable, using vector search: {exc}")
+            return self.loaded
+
+    def _mask(self, preferences: CarPreferences) -> np.ndarray:
+        columns = self._columns
+        mask = np.ones(len(self._payloads), dtype=bool)
+
+        if preferences.budget_max:
+            mask &= columns["price"] <= float(preferences.budget_max)
+        if preferences.year_min:
+            mask &= columns["year"] >= preferences.year_min
+        if preferences.year_max:
+            mask &= columns["year"] <= preferences.year_max
+        if preferences.mileage_max:
+            mask &= columns["km"] <= preferences.mileage_max
+        if preferences.brand:
+            mask &= columns["make"] == normalize_make(preferences.brand)
+        if preferences.model:
+            mask &= columns["model"] == normalize_model(preferences.model)
+        if preferences.transmission:
+            mask &= columns["transmission"] == preferences.transmission
+        if preferences.fuel:
+            mask &= columns["fuel"] == preferences.fuel
+        if preferences.city:
+            mask &= columns["city"] == normalize_keyword(preferences.city)
+
+        for field, column in DIMENSION_FIELDS.items():
+            if getattr(preferences, f"{field}_min"):
+                mask &= columns[column] >= getattr(preferences, f"{field}_min")
+            if getattr(preferences, f"{field}_max"):
+                mask &= columns[column] <= getattr(preferences, f"{field}_max")
+
+        if preferences.bluetooth is not None:
+            mask &= columns["bluetooth"] == preferences.bluetooth
+        if preferences.car_play is not None:
+            mask &= columns["car_play"] == preferences.car_play
+
+        return mask
+
+    def _relevance(self, preferences: CarPreferences, rows: np.ndarray) -> np.ndarray:
+        columns = self._columns
+        return relevance_bonus(
+            columns["price"][rows],
+            columns["year"][rows],
+            columns["km"][rows],
+            preferences.budget_max,
+        )
+
+    def search(self, preferences: CarPreferences, top_k: int) -> List[Car]:
+        started_at = time.perf_counter()
+
+        rows = np.flatnonzero(self._mask(preferences))
+        if len(rows) == 0 or top_k <= 0:
+            self._record_query(started_at)
+            return []
+
+        if preferences.order_by in ORDER_COLUMNS:
+            column, descending = ORDER_COLUMNS[preferences.order_by]
+            key = self._columns[column][rows]
+            key = -key if descending else key
+        else:
+            key = -self._relevance(preferences, rows)
+
+        top = top_indices(key, top_k)
+        cars = [car_from_payload(self._payloads[i]) for i in rows[top]]
+        self._record_query(started_at)
+        return cars
+
+    def aggregate(
+        self, preferences: CarPreferences, group_by: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Exact count and min/max/avg of price, year and km over the filtered catalog.
+
+        With ``group_by`` ("make" or "model") there is one summary per group,
+        largest first; otherwise a single summary labelled "total".
+        """
+        if group_by is not None and group_by not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group catalog stats by '{group_by}'")
+
+        started_at = time.perf_counter()
+        rows = np.flatnonzero(self._mask(preferences))
+
+        if group_by is None:
+            groups = [("total", rows)] if len(rows) else []
+        else:
+            keys, first, inverse = np.unique(
+                self._columns[group_by][rows].astype(str),
+                return_index=True,
+                return_inverse=True,
+            )
+            groups = [
+                (self._payloads[rows[first[i]]][group_by], rows[inverse == i])
+                for i in range(len(keys))
+            ]
+
+        summaries = []
+        for label, group_rows in groups:
+            summary: Dict[str, Any] = {"group": label, "count": int(len(group_rows))}
+            for column in AGGREGATE_COLUMNS:
+                values = self._columns[column][group_rows]
+                values = values[~np.isnan(values)]
+                summary[column] = (
+                    {
+                        "min": float(values.min()),
+                        "max": float(values.max()),
+                        "avg": float(values.mean()),
+                    }
+                    if len(values)
+                    else None
+                )
+            summaries.append(summary)
+
+        summaries.sort(key=lambda summary: summary["count"], reverse=True)
+        self._record_query(started_at)
+        return summaries
+
+    def get_cars(self, stock_ids: List[str]) -> Dict[str, Car]:
+        """Cars by stock_id from the loaded columns; unknown ids are skipped."""
+        cars = {}
+        for stock_id in stock_ids:
+            row = self._rows_by_stock_id.get(stock_id)
+            if row is not None:
+                cars[stock_id] = car_from_payload(self._payloads[row])
+        return cars
+
+    def _record_query(self, started_at: float) -> None:
+        self.stats.queries += 1
+        self.stats.total_query_ms += (time.perf_counter() - started_at) * 1000.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        stats["enabled"] = self.enabled
+        stats["rows"] = len(self._payloads)
+        stats["catalog_version"] = self._version
+        return stats
+
+
+_catalog_engine_instance: Optional[CatalogEngine] = None
+
+
+def get_catalog_engine() -> CatalogEngine:
+    global _catalog_engine_instance
+    if _catalog_engine_instance is None:
+        _catalog_engine_instance = CatalogEngine()
+    return _catalog_engine_instance
@@ -0,0 +1,77 @@
+import re
+import unicodedata
+from typing import Optional
+
+BRAND_ALIASES = {
+    "vw": "volkswagen",
+    "volks": "volkswagen",
+    "volkswagon": "volkswagen",
+    "chevy": "chevrolet",
+    "chevrolet gm": "chevrolet",
+    "mercedes": "mercedes benz",
+    "benz": "mercedes benz",
+    "mb": "mercedes benz",
+    "landrover": "land rover",
+    "mini cooper": "mini",
+    "kia motors": "kia",
+    "alfa": "alfa romeo",
+}
+
+AUTOMATIC_TRANSMISSION_TOKENS = frozenset(
+    "auto at ta aut automatico automatica cvt ivt dct dsg asg xtronic "
+    "tiptronic steptronic tronic".split()
+)
+MANUAL_TRANSMISSION_TOKENS = frozenset("mt tm std estandar manual".split())
+DIESEL_TOKENS = frozenset("tdi diesel crdi hdi dci".split())
+HYBRID_TOKENS = frozenset("hybrid hibrido hev phev".split())
+ELECTRIC_TOKENS = frozenset("ev electric electrico".split())
+
+MODEL_ALIASES = {
+    "vocho": "beetle",
+}
+
+
+def normalize_keyword(value: Optional[str]) -> str:
+    """Lower-case, strip accents, treat ``-``/``_`` as spaces and split letter/digit runs.
+
+    "CX-9", "cx9" and "Cx 9" all become "cx 9"; "Mazda3" becomes "mazda 3".
+    """
+    text = unicodedata.normalize("NFKD", (value or "").lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[-_/.]+", " ", text)
+    text = re.sub(r"(?<=[a-z])(?=\d)|(?<=\d)(?=[a-z])", " ", text)
+    return " ".join(text.split())
+
+
+def normalize_make(value: Optional[str]) -> str:
+    normalized = normalize_keyword(value)
+    return BRAND_ALIASES.get(normalized, normalized)
+
+
+def normalize_model(value: Optional[str]) -> str:
+    normalized = normalize_keyword(value)
+    return MODEL_ALIASES.get(normalized, normalized)
+
+
+def infer_transmission(version: Optional[str]) -> Optional[str]:
+    """ "automatic"/"manual" from trim tokens such as "AUTO", "CVT" or "MT"."""
+    tokens = set(normalize_keyword(version).split())
+    if tokens & AUTOMATIC_TRANSMISSION_TOKENS:
+        return "automatic"
+    if tokens & MANUAL_TRANSMISSION_TOKENS:
+        return "manual"
+    return None
+
+
+def infer_fuel(version: Optional[str]) -> Optional[str]:
+    """Fuel type from trim tokens; versions without a marker are gasoline."""
+    tokens = set(normalize_keyword(version).split())
+    if not tokens:
+        return None
+    if tokens & DIESEL_TOKENS:
+        return "diesel"
+    if tokens & HYBRID_TOKENS:
+        return "hybrid"
+    if tokens & ELECTRIC_TOKENS:
+        return "electric"
+    return "gasoline"
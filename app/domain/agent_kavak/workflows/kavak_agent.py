@@ -1,8 +1,14 @@
 import asyncio
 import json
-from typing import Dict, Any, Optional, List, Tuple
-
-from llama_index.core.agent.workflow import ReActAgent
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
+
+from llama_index.core.agent.workflow import (
+    AgentStream,
+    ReActAgent,
+    ToolCall,
+    ToolCallResult,
+)
 from llama_index.core.workflow import Context
 from llama_index.core.tools import FunctionTool
 from llama_index.core import PromptTemplate
@@ -13,20 +19,40 @@ from app.core.services.memory_manager import MemoryManager
 from app.repository.vector import QdrantVectorRepository
 from app.repository.postgres.chat_context_repository import ChatContextRepository
 from app.models.agent.chat_interaction import ChatInteractionCreate
-from app.models.agent.schemas import CarPreferences
+from app.models.agent.schemas import Car, CarPreferences
 from app.domain.prompts import (
     AGENT_SYSTEM_PROMPT,
     build_car_preferences_extraction_prompt,
+    build_stream_fallback_prompt,
 )
+from .catalog_cursor import get_catalog_cursor_store
+from .preferences_extractor import get_preferences_extractor
 from .tools import (
     rag_value_prop_tool,
     search_catalog_tool,
     compute_financing_tool,
+    load_catalog_cars,
+    catalog_stats_tool,
+    similar_cars_tool,
 )
 
 DEFAULT_LLM_TEMPERATURE = 0.3
 DEFAULT_MAX_TOKENS = 1000
 MAX_AGENT_ITERATIONS = 5
+REACT_ANSWER_MARKER = "Answer:"
+VALUE_PROP_TOOL_NAME = "rag_value_prop"
+VALUE_PROP_INTENT = "valueprop"
+CATALOG_PAGE_SIZE = 5
+CATALOG_EXHAUSTED_MESSAGE = (
+    "Ya te mostré todas las opciones de esta búsqueda. "
+    "¿Te gustaría ajustar algún criterio?"
+)
+
+# The agent and its tools are shared across users; the user of the request
+# being processed is carried in a context variable for per-user tool state.
+_current_user_id: ContextVar[Optional[str]] = ContextVar(
+    "kavak_current_user_id", default=None
+)
 
 
 class KavakAgentWorkflow:
@@ -83,31 +109,28 @@ class KavakAgentWorkflow:
             return result.answer if hasattr(result, "answer") else str(result)
 
         # Search catalog tool
-        async def search_catalog_bound(preferences: str) -> str:
-            try:
-                prefs_dict = json.loads(preferences)
-                prefs = CarPreferences(**prefs_dict)
-            except (json.JSONDecodeError, ValueError):
-                try:
-                    extraction_prompt = build_car_preferences_extraction_prompt(
-                        preferences
-                    )
-
-                    prefs = await self.llm_manager.complete_structured_text(
-                        prompt=extraction_prompt,
-                        response_schema=CarPreferences,
-                        temperature=0.1,
-                        max_tokens=200,
-                    )
-
+        async def search_catalog_bound(
+            preferences: str, page: int = 1, search_token: Optional[str] = None
+        ) -> str:
+            page = max(page, 1)
+            user_id = _current_user_id.get()
+            cursor_store = get_catalog_cursor_store()
+
+            if page > 1 and user_id:
+                cursor = await cursor_store.load(user_id, search_token)
+                if cursor is not None:
+                    token, stock_ids = cursor
                     logger.info(
-                        f"Extracted preferences from natural language: {prefs.model_dump(exclude_none=True)}"
-                    )
-                except Exception as exc:
-                    logger.warning(
-                        f"Error parsing preferences: {exc}, using empty preferences"
+                        f"Serving catalog page {page} from cursor {token} ({len(stock_ids)} results)"
                     )
-                    prefs = CarPreferences()
+                    start = (page - 1) * CATALOG_PAGE_SIZE
+                    page_ids = stock_ids[start : start + CATALOG_PAGE_SIZE]
+                    if not page_ids:
+                        return CATALOG_EXHAUSTED_MESSAGE
+                    cars = await load_catalog_cars(page_ids, self.vector_repository)
+                    return self._format_catalog_page(cars, page, len(stock_ids), token)
+
+            prefs, free_text = await self._parse_preferences(preferences)
 
             logger.info(
                 f"Searching catalog with preferences: {prefs.model_dump(exclude_none=True)}"
@@ -116,6 +139,7 @@ class KavakAgentWorkflow:
                 preferences=prefs,
                 vector_repository=self.vector_repository,
                 llm_manager=self.llm_manager,
+                free_text=free_text,
             )
 
             logger.info(f"Found {len(result)} cars in catalog search")
@@ -126,54 +150,71 @@ class KavakAgentWorkflow:
                 )
                 return "No encontré autos que coincidan con tus preferencias. ¿Te gustaría ajustar algún criterio?"
 
-            car_descriptions = []
-            for i, car in enumerate(result[:5], 1):
-                desc = f"{i}. {car.brand} {car.model} {car.year}"
-                if car.version:
-                    desc += f" - Versión: {car.version}"
-                desc += f" - Precio: ${car.price:,.0f} MXN"
-                if car.mileage:
-                    desc += f" - Kilometraje: {car.mileage:,} km"
-
-                features_list = []
-                if car.bluetooth is not None:
-                    if car.bluetooth:
-                        features_list.append("SÍ tiene Bluetooth")
-                    else:
-                        features_list.append("NO tiene Bluetooth")
-                if car.car_play is not None:
-                    if car.car_play:
-                        features_list.append("SÍ tiene Apple CarPlay")
-                    else:
-                        features_list.append("NO tiene Apple CarPlay")
-
-                if features_list:
-                    desc += f" - Características: {', '.join(features_list)}"
-
-                dims = []
-                if car.length:
-                    dims.append(f"Largo: {car.length:.0f} mm")
-                if car.width:
-                    dims.append(f"Ancho: {car.width:.0f} mm")
-                if car.height:
-                    dims.append(f"Altura: {car.height:.0f} mm")
-                if dims:
-                    desc += f" - Dimensiones: {', '.join(dims)}"
-
-                car_descriptions.append(desc)
-
-            return "\n".join(car_descriptions)
+            token = (
+                await cursor_store.save(user_id, [car.id for car in result])
+                if user_id
+                else None
+            )
+            start = (page - 1) * CATALOG_PAGE_SIZE
+            cars = result[start : start + CATALOG_PAGE_SIZE]
+            if not cars:
+                return CATALOG_EXHAUSTED_MESSAGE
+            return self._format_catalog_page(cars, page, len(result), token)
+
+        # Catalog stats tool
+        async def catalog_stats_bound(
+            preferences: str = "", group_by: Optional[str] = None
+        ) -> str:
+            prefs, _ = await self._parse_preferences(preferences)
+            if group_by not in (None, "make", "model"):
+                group_by = None
+
+            summaries = await catalog_stats_tool(
+                preferences=prefs,
+                vector_repository=self.vector_repository,
+                group_by=group_by,
+            )
+            if not summaries:
+                return "No hay autos en el catálogo que coincidan con esos criterios."
+            return self._format_catalog_stats(summaries)
+
+        # Similar cars tool
+        async def similar_cars_bound(car: str, preferences: str = "") -> str:
+            stock_id = await self._resolve_stock_id(car)
+            if stock_id is None:
+                return "No identifiqué el auto de referencia. Búscalo primero con search_catalog y usa su ID."
+
+            prefs, _ = await self._parse_preferences(preferences)
+            cars = await similar_cars_tool(
+                stock_id=stock_id,
+                vector_repository=self.vector_repository,
+                preferences=prefs,
+                top_k=CATALOG_PAGE_SIZE,
+            )
+            if not cars:
+                return "No encontré autos parecidos con esos criterios. ¿Te gustaría ajustar alguno?"
+            return self._format_catalog_page(cars, 1, len(cars), None)
 
         tools = [
             FunctionTool.from_defaults(
                 fn=rag_value_prop_bound,
-                name="rag_value_prop",
+                name=VALUE_PROP_TOOL_NAME,
                 description="Responde preguntas sobre la propuesta de valor de Kavak usando RAG. Úsala para preguntas sobre Kavak, servicios, ubicaciones, sedes, garantías, financiamiento, proceso de compra, etc. Retorna respuesta con citas de fuentes.",
             ),
             FunctionTool.from_defaults(
                 fn=search_catalog_bound,
                 name="search_catalog",
-                description="Busca en el catálogo de autos usando búsqueda semántica. Úsala SIEMPRE cuando el usuario pregunte sobre un auto específico (marca, modelo) o sus características (Bluetooth, CarPlay, dimensiones, etc.). Toma preferencias del usuario (marca, modelo, presupuesto, año, transmisión, etc.) en formato JSON o texto natural. Retorna lista de autos con TODA su información: marca, modelo, año, precio, kilometraje, versión, características (Bluetooth, CarPlay) y dimensiones. SOLO recomienda autos devueltos por esta herramienta.",
+                description="Busca en el catálogo de autos usando búsqueda semántica. Úsala SIEMPRE cuando el usuario pregunte sobre un auto específico (marca, modelo) o sus características (Bluetooth, CarPlay, dimensiones, etc.). Toma preferencias del usuario (marca, modelo, presupuesto, año, transmisión, etc.) en formato JSON o texto natural. Retorna lista de autos con TODA su información: marca, modelo, año, precio, kilometraje, versión, características (Bluetooth, CarPlay) y dimensiones. Los resultados vienen en páginas de 5: cuando el usuario pida más opciones de la misma búsqueda, llama de nuevo con page=2, 3, ... y el search_token indicado en la respuesta anterior. SOLO recomienda autos devueltos por esta herramienta.",
+            ),
+            FunctionTool.from_defaults(
+                fn=catalog_stats_bound,
+                name="catalog_stats",
+                description='Responde preguntas de inventario con cifras exactas: cuántos autos hay, rango y promedio de precio, año y kilometraje. Toma preferencias (marca, modelo, presupuesto, año, etc.) en JSON o texto natural, y opcionalmente group_by ("make" o "model") para desglosar por marca o modelo. Úsala para "¿cuántos Toyota tienen?" o "¿qué rango de precios tienen los Mazda?" en lugar de search_catalog.',
+            ),
+            FunctionTool.from_defaults(
+                fn=similar_cars_bound,
+                name="similar_cars",
+                description='Encuentra autos parecidos a uno del catálogo ("algo como este", "otro parecido al Touareg"). Parámetros: car (el ID del auto devuelto por search_catalog, o su marca y modelo) y opcionalmente preferences (JSON o texto natural) para acotar, p. ej. presupuesto o año. Retorna hasta 5 autos similares con la misma información que search_catalog.',
             ),
             FunctionTool.from_defaults(
                 fn=compute_financing_tool,
@@ -183,9 +224,205 @@ class KavakAgentWorkflow:
         ]
         return tools
 
+    @staticmethod
+    def _format_catalog_page(
+        cars: List[Car], page: int, total: int, search_token: Optional[str]
+    ) -> str:
+        start = (page - 1) * CATALOG_PAGE_SIZE
+        car_descriptions = []
+        for i, car in enumerate(cars, start + 1):
+            desc = f"{i}. {car.brand} {car.model} {car.year} (ID: {car.id})"
+            if car.version:
+                desc += f" - Versión: {car.version}"
+            desc += f" - Precio: ${car.price:,.0f} MXN"
+            if car.mileage:
+                desc += f" - Kilometraje: {car.mileage:,} km"
+
+            features_list = []
+            if car.bluetooth is not None:
+                if car.bluetooth:
+                    features_list.append("SÍ tiene Bluetooth")
+                else:
+                    features_list.append("NO tiene Bluetooth")
+            if car.car_play is not None:
+                if car.car_play:
+                    features_list.append("SÍ tiene Apple CarPlay")
+                else:
+                    features_list.append("NO tiene Apple CarPlay")
+
+            if features_list:
+                desc += f" - Características: {', '.join(features_list)}"
+
+            dims = []
+            if car.length:
+                dims.append(f"Largo: {car.length:.0f} mm")
+            if car.width:
+                dims.append(f"Ancho: {car.width:.0f} mm")
+            if car.height:
+                dims.append(f"Altura: {car.height:.0f} mm")
+            if dims:
+                desc += f" - Dimensiones: {', '.join(dims)}"
+
+            car_descriptions.append(desc)
+
+        pages = -(-total // CATALOG_PAGE_SIZE)
+        if pages > 1:
+            footer = f"(Página {page} de {pages}, {total} resultados"
+            if search_token:
+                footer += f", search_token: {search_token}"
+            car_descriptions.append(footer + ")")
+
+        return "\n".join(car_descriptions)
+
+    @staticmethod
+    def _format_catalog_stats(summaries: List[Dict[str, Any]]) -> str:
+        lines = []
+        for summary in summaries:
+            label = "Total" if summary["group"] == "total" else str(summary["group"])
+            line = f"{label}: {summary['count']} autos"
+
+            price = summary.get("price")
+            if price:
+                line += f" - Precio: ${price['min']:,.0f} a ${price['max']:,.0f} MXN"
+                if price.get("avg") is not None:
+                    line += f" (promedio ${price['avg']:,.0f})"
+            year = summary.get("year")
+            if year:
+                line += f" - Años: {year['min']:.0f} a {year['max']:.0f}"
+            km = summary.get("km")
+            if km:
+                line += f" - Kilometraje: {km['min']:,.0f} a {km['max']:,.0f} km"
+                if km.get("avg") is not None:
+                    line += f" (promedio {km['avg']:,.0f} km)"
+
+            lines.append(line)
+        return "\n".join(lines)
+
+    async def _resolve_stock_id(self, car: str) -> Optional[str]:
+        """Stock_id of the reference car: used as-is if numeric, else the top catalog match."""
+        car = car.strip()
+        if car.isdigit():
+            return car
+
+        prefs, _ = await self._parse_preferences(car)
+        if not prefs.brand and not prefs.model:
+            return None
+        matches = await search_catalog_tool(
+            preferences=prefs,
+            vector_repository=self.vector_repository,
+            llm_manager=self.llm_manager,
+            top_k=1,
+        )
+        return matches[0].id if matches else None
+
+    async def _parse_preferences(
+        self, preferences: str
+    ) -> Tuple[CarPreferences, Optional[str]]:
+        """Preferences from the tool argument: JSON if possible, else natural language."""
+        if not preferences.strip():
+            return CarPreferences(), None
+        try:
+            return CarPreferences(**json.loads(preferences)), None
+        except (json.JSONDecodeError, TypeError, ValueError):
+            return await self._extract_preferences(preferences)
+
+    async def _extract_preferences(
+        self, preferences: str
+    ) -> Tuple[CarPreferences, Optional[str]]:
+        """Parse natural-language preferences.
+
+        Returns the preferences plus the original text when the rules could
+        not explain all of it; that residual free text is what vector search
+        is used for.
+        """
+        prefs = await get_preferences_extractor().extract_confident(
+            preferences, self.vector_repository
+        )
+        if prefs is not None:
+            return prefs, None
+
+        try:
+            extraction_prompt = build_car_preferences_extraction_prompt(preferences)
+
+            prefs = await self.llm_manager.complete_structured_text(
+                prompt=extraction_prompt,
+                response_schema=CarPreferences,
+                temperature=0.1,
+                max_tokens=200,
+            )
+
+            logger.info(
+                f"Extracted preferences from natural language: {prefs.model_dump(exclude_none=True)}"
+            )
+            return prefs, preferences
+        except Exception as exc:
+            logger.warning(f"Error parsing preferences: {exc}, using empty preferences")
+            return CarPreferences(), preferences
+
     def _get_system_prompt(self) -> PromptTemplate:
         return PromptTemplate(AGENT_SYSTEM_PROMPT)
 
+    async def _build_agent_input(self, query: str, user_id: Optional[str]) -> str:
+        chat_context = None
+        if user_id:
+            await self.chat_context_repository.initialize()
+            chat_context = await self.chat_context_repository.get_chat_context(
+                str(user_id)
+            )
+
+        if chat_context and chat_context.interactions:
+            context_string = chat_context.to_context_string()
+            if context_string:
+                logger.info(
+                    f"Retrieved {len(chat_context.interactions)} previous interactions from chat context"
+                )
+                return f"{context_string}\n\n## Consulta Actual\n{query}"
+
+        return query
+
+    def _store_interaction(
+        self,
+        query: str,
+        response_text: str,
+        user_id: Optional[str],
+        tool_calls: Optional[List[ToolCallResult]] = None,
+    ) -> None:
+        if not user_id:
+            return
+
+        # Keep the exact questions sent to the value-prop tool; they are the
+        # CAG keys that the warm-up job mines from history.
+        value_prop_queries = [
+            call.tool_kwargs["query"]
+            for call in tool_calls or []
+            if call.tool_name == VALUE_PROP_TOOL_NAME and call.tool_kwargs.get("query")
+        ]
+
+        asyncio.create_task(
+            self.chat_context_repository.add_interaction(
+                ChatInteractionCreate(
+                    user_id=str(user_id),
+                    query=query,
+                    response=response_text,
+                    intent=VALUE_PROP_INTENT if value_prop_queries else None,
+                    metadata={"value_prop_queries": value_prop_queries}
+                    if value_prop_queries
+                    else None,
+                )
+            )
+        )
+
+    def _build_result(
+        self, response_text: str, user_id: Optional[str]
+    ) -> Dict[str, Any]:
+        return {
+            "response": response_text,
+            "user_id": user_id,
+            "agent": self.name,
+            "provider": self.llm_manager.settings.llm.PROVIDER,
+            "model": self.llm_manager.settings.llm.MODEL,
+        }
+
     async def process_query(
         self,
         query: str,
@@ -197,23 +434,9 @@ class KavakAgentWorkflow:
             logger.info(f"User ID: {user_id}")
             logger.info("Architecture: Agent-based (automatic tool selection)")
 
+            _current_user_id.set(str(user_id) if user_id else None)
             agent, ctx = self._get_agent_and_context()
-
-            chat_context = None
-            if user_id:
-                await self.chat_context_repository.initialize()
-                chat_context = await self.chat_context_repository.get_chat_context(
-                    str(user_id)
-                )
-
-            query_to_use = query
-            if chat_context and chat_context.interactions:
-                context_string = chat_context.to_context_string()
-                if context_string:
-                    logger.info(
-                        f"Retrieved {len(chat_context.interactions)} previous interactions from chat context"
-                    )
-                    query_to_use = f"{context_string}\n\n## Consulta Actual\n{query}"
+            query_to_use = await self._build_agent_input(query, user_id)
 
             handler = agent.run(query_to_use, ctx=ctx)
             response = await handler
@@ -221,29 +444,117 @@ class KavakAgentWorkflow:
             response_text = str(response)
             response_text = response_text.strip()
 
-            if user_id:
-                asyncio.create_task(
-                    self.chat_context_repository.add_interaction(
-                        ChatInteractionCreate(
-                            user_id=str(user_id),
-                            query=query,
-                            response=response_text,
-                        )
-                    )
-                )
+            self._store_interaction(
+                query, response_text, user_id, getattr(response, "tool_calls", None)
+            )
 
             logger.info("[AGENT] ReActAgent completed successfully")
 
-            return {
-                "response": response_text,
-                "user_id": user_id,
-                "agent": self.name,
-                "provider": self.llm_manager.settings.llm.PROVIDER,
-                "model": self.llm_manager.settings.llm.MODEL,
-            }
+            return self._build_result(response_text, user_id)
 
         except Exception as exc:
             logger.error(
                 f"[AGENT] Error processing query with ReActAgent: {exc}", exc_info=True
             )
             raise
+
+    async def process_query_stream(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run the agent and yield tool events and final-answer tokens as they arrive.
+
+        Yields dicts with an ``event`` name (``tool_start``, ``tool_end``,
+        ``token`` or ``final``) and a JSON-serializable ``data`` payload.
+        """
+        try:
+            logger.info("[AGENT] Processing streaming query with ReActAgent")
+            logger.info(f"User ID: {user_id}")
+
+            _current_user_id.set(str(user_id) if user_id else None)
+            agent, ctx = self._get_agent_and_context()
+            query_to_use = await self._build_agent_input(query, user_id)
+
+            handler = agent.run(query_to_use, ctx=ctx)
+
+            step_text = ""
+            answer_emitted = 0
+            answer_started = False
+            tool_outputs: List[str] = []
+            tool_calls: Optional[List[ToolCallResult]] = None
+            try:
+                async for event in handler.stream_events():
+                    if isinstance(event, ToolCallResult):
+                        tool_outputs.append(f"{event.tool_name}: {event.tool_output}")
+                        yield {
+                            "event": "tool_end",
+                            "data": {
+                                "tool": event.tool_name,
+                                "is_error": bool(
+                                    getattr(event.tool_output, "is_error", False)
+                                ),
+                            },
+                        }
+                    elif isinstance(event, ToolCall):
+                        yield {
+                            "event": "tool_start",
+                            "data": {
+                                "tool": event.tool_name,
+                                "input": event.tool_kwargs,
+                            },
+                        }
+                    elif isinstance(event, AgentStream):
+                        text = event.response or ""
+                        if not text.startswith(step_text):
+                            answer_emitted = 0
+                        step_text = text
+
+                        marker_index = text.find(REACT_ANSWER_MARKER)
+                        if marker_index == -1:
+                            continue
+
+                        answer_so_far = text[
+                            marker_index + len(REACT_ANSWER_MARKER) :
+                        ].lstrip()
+                        delta = answer_so_far[answer_emitted:]
+                        if delta:
+                            answer_emitted = len(answer_so_far)
+                            answer_started = True
+                            yield {"event": "token", "data": {"delta": delta}}
+
+                response = await handler
+                response_text = str(response).strip()
+                tool_calls = getattr(response, "tool_calls", None)
+
+            except Exception as exc:
+                if answer_started:
+                    raise
+                # The ReAct loop failed (e.g. max iterations) before answering;
+                # stream a direct answer from what the tools returned so far.
+                logger.warning(
+                    f"[AGENT] ReActAgent stream failed before answering ({exc}), "
+                    "streaming a direct completion"
+                )
+                chunks: List[str] = []
+                async for delta in self.llm_manager.complete_text_stream(
+                    build_stream_fallback_prompt(query_to_use, tool_outputs),
+                    temperature=DEFAULT_LLM_TEMPERATURE,
+                    max_tokens=DEFAULT_MAX_TOKENS,
+                ):
+                    chunks.append(delta)
+                    yield {"event": "token", "data": {"delta": delta}}
+                response_text = "".join(chunks).strip()
+
+            self._store_interaction(query, response_text, user_id, tool_calls)
+
+            logger.info("[AGENT] ReActAgent streaming completed successfully")
+
+            yield {"event": "final", "data": self._build_result(response_text, user_id)}
+
+        except Exception as exc:
+            logger.error(
+                f"[AGENT] Error streaming query with ReActAgent: {exc}", exc_info=True
+            )
+            raise
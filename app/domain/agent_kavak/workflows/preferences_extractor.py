@@ -0,0 +1,544 @@
+from __future__ import annotations
+
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from rapidfuzz import fuzz, process
+
+from app.core.config.logging import logger
+from app.core.config.settings.kavak_config import KavakExtractionSettings
+from app.models.agent.schemas import CarPreferences
+from app.repository.vector import CollectionType, QdrantVectorRepository
+
+YEAR = r"(19[5-9]\d|20[0-3]\d)"
+AMOUNT = r"(\d+(?:\.\d+)?)\s*(mil|k|millones|millon|mdp)?"
+
+ORDER_BY_PATTERNS: List[Tuple[str, str]] = [
+    (
+        r"\b(?:menor|menos|bajo|poco|minimo)\s+(?:kilometraje|km|kms|kilometros)\b"
+        r"|\b(?:kilometraje|km|kms|kilometros)\s+(?:mas\s+bajo|menor|minimo)\b",
+        "mileage_asc",
+    ),
+    (
+        r"\b(?:mayor|mas|alto|maximo)\s+(?:kilometraje|km|kms|kilometros)\b"
+        r"|\b(?:kilometraje|km|kms|kilometros)\s+(?:mas\s+alto|mayor|maximo)\b",
+        "mileage_desc",
+    ),
+    (
+        r"\bmas\s+(?:barato|barata|baratos|baratas|economico|economica|accesible)\b"
+        r"|\b(?:menor|minimo)\s+precio\b|\bprecio\s+(?:mas\s+bajo|menor|minimo)\b"
+        r"|\b(?:barato|barata|baratos|baratas|economico|economica|economicos)\b",
+        "price_asc",
+    ),
+    (
+        r"\bmas\s+(?:caro|cara|caros|caras|costoso|costosa|lujoso|lujosa)\b"
+        r"|\b(?:mayor|maximo)\s+precio\b|\bprecio\s+(?:mas\s+alto|mayor|maximo)\b",
+        "price_desc",
+    ),
+    (
+        r"\bmas\s+(?:nuevo|nueva|nuevos|nuevas|reciente|recientes|moderno|moderna)\b"
+        r"|\bano\s+mas\s+reciente\b",
+        "year_desc",
+    ),
+    (
+        r"\bmas\s+(?:viejo|vieja|viejos|viejas|antiguo|antigua|antiguos|antiguas)\b"
+        r"|\bano\s+mas\s+antiguo\b",
+        "year_asc",
+    ),
+]
+
+TRANSMISSION_PATTERNS: List[Tuple[str, str]] = [
+    (r"\b(?:transmision\s+)?automatic[oa]s?\b", "automatic"),
+    (r"\b(?:transmision\s+)?(?:manual|manuales|estandar)\b", "manual"),
+]
+
+FUEL_PATTERNS: List[Tuple[str, str]] = [
+    (r"\b(?:a\s+)?gasolina\b", "gasoline"),
+    (r"\b(?:a\s+)?diesel\b", "diesel"),
+    (r"\bhibrid[oa]s?\b", "hybrid"),
+    (r"\belectric[oa]s?\b", "electric"),
+]
+
+FEATURE_PATTERNS: List[Tuple[str, str]] = [
+    (r"\bbluetooth\b", "bluetooth"),
+    (r"\b(?:apple\s+)?car\s*play\b", "car_play"),
+]
+
+DIMENSION_WORDS: Dict[str, str] = {
+    "largo": "length",
+    "ancho": "width",
+    "alto": "height",
+    "altura": "height",
+}
+DIMENSION = r"(largo|ancho|alto|altura)"
+DIMENSION_AMOUNT = r"(\d+(?:\.\d+)?)\s*(mm|milimetros|cm|centimetros|m|metros?)?"
+DIMENSION_BOUNDS = (
+    r"(no\s+mas\s+de|menos\s+de|menor\s+(?:a|que)|maximo|hasta|debajo\s+de"
+    r"|mas\s+de|mayor\s+(?:a|que)|minimo|al\s+menos|arriba\s+de|desde)"
+)
+DIMENSION_PATTERNS: List[str] = [
+    rf"\b{DIMENSION}\s+(?:de\s+)?{DIMENSION_BOUNDS}\s+{DIMENSION_AMOUNT}\b",
+    rf"\b{DIMENSION_BOUNDS}\s+{DIMENSION_AMOUNT}\s+de\s+{DIMENSION}\b",
+]
+MIN_DIMENSION_BOUNDS = ("mas", "mayor", "minimo", "al", "arriba", "desde")
+
+DIMENSION_UNITS: Dict[str, int] = {
+    "mm": 1,
+    "milimetros": 1,
+    "cm": 10,
+    "centimetros": 10,
+    "m": 1_000,
+    "metro": 1_000,
+    "metros": 1_000,
+}
+
+YEAR_RANGE_PATTERNS: List[str] = [
+    rf"\b(?:(?:entre|de|del|desde)\s+(?:el\s+)?)?{YEAR}\s+(?:a|al|y|hasta)\s+(?:el\s+)?{YEAR}\b",
+    rf"\b{YEAR}\s*-\s*{YEAR}\b",
+]
+
+YEAR_MIN_PATTERNS: List[Tuple[str, int]] = [
+    (rf"\b(?:desde|a\s+partir\s+(?:de|del))\s+(?:el\s+)?{YEAR}\b", 0),
+    (rf"\b{YEAR}\s+(?:en\s+adelante|o\s+mas\s+(?:nuevo|reciente)|para\s+arriba)\b", 0),
+    (
+        rf"\b(?:despues\s+(?:de|del)|posterior(?:es)?\s+al?|mayor(?:es)?\s+al?)\s+(?:el\s+)?{YEAR}\b",
+        1,
+    ),
+]
+
+YEAR_MAX_PATTERNS: List[Tuple[str, int]] = [
+    (rf"\b(?:hasta|maximo)\s+(?:el\s+)?{YEAR}\b", 0),
+    (rf"\b{YEAR}\s+(?:o\s+(?:mas\s+viejo|anterior|antes)|para\s+abajo)\b", 0),
+    (
+        rf"\b(?:antes\s+(?:de|del)|anterior(?:es)?\s+al?|menor(?:es)?\s+al?)\s+(?:el\s+)?{YEAR}\b",
+        -1,
+    ),
+]
+
+MILEAGE_PATTERN = (
+    rf"\b(?:(?:menos\s+de|hasta|maximo|no\s+mas\s+de|menor\s+a|debajo\s+de)\s+)?"
+    rf"{AMOUNT}\s*(?:km|kms|kilometros)\b"
+)
+
+BUDGET_PATTERNS: List[str] = [
+    rf"\b(?:menos\s+de|hasta|maximo|no\s+mas\s+de|menor\s+a|por\s+debajo\s+de|debajo\s+de"
+    rf"|presupuesto\s+(?:de\s+)?|tengo|cuesten?\s+(?:menos\s+de\s+)?)\s*\$?\s*{AMOUNT}"
+    rf"(?:\s*(?:pesos|mxn))?",
+    rf"\$\s*{AMOUNT}(?:\s*(?:pesos|mxn))?",
+    r"\b(\d+(?:\.\d+)?)\s*(mil|k|millones|millon|mdp)(?:\s*(?:pesos|mxn))?\b",
+    r"\b(\d{5,})(?:\s*(?:pesos|mxn))?\b",
+]
+
+AMOUNT_MULTIPLIERS: Dict[str, int] = {
+    "mil": 1_000,
+    "k": 1_000,
+    "millon": 1_000_000,
+    "millones": 1_000_000,
+    "mdp": 1_000_000,
+}
+
+MIN_BUDGET = 10_000
+
+RULE_FIELDS = (
+    "order_by",
+    "budget_max",
+    "mileage_max",
+    "transmission",
+    "fuel",
+    "bluetooth",
+    "car_play",
+)
+
+FILLER_WORDS: Set[str] = set(
+    # articles, prepositions and connectors
+    "el la los las un una unos unas lo de del a al en y o e con sin por para que se "
+    "su sus mi mis me tu tus te le les es son esta este estos estas ese esa algo "
+    "algun alguno alguna algunos algunas muy mas menos tambien si no ya pero como "
+    # question and request words
+    "cual cuales cuanto cuanta cuantos cuantas cuesta cuestan tienes tienen tiene "
+    "tengan hay quiero quisiera busco buscando buscar necesito muestrame muestra "
+    "ensename dame ver opciones opcion disponible disponibles favor porfa hola "
+    "gracias interesa puedes podrias recomienda recomiendas recomiendame "
+    # generic vehicle words
+    "auto autos carro carros coche coches vehiculo vehiculos seminuevo seminuevos "
+    "usado usados modelo modelos marca marcas version ano anos precio precios "
+    "kavak catalogo "
+    # feature and dimension questions; the actual filters are parsed above
+    "dimensiones mide miden medidas caracteristicas equipamiento".split()
+)
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"(?<=\d)[,.](?=\d{3}\b)", "", text)
+    text = re.sub(r"[^\w$.\- ]+", " ", text)
+    text = re.sub(r"(?<!\d)\.|\.(?!\d)", " ", text)
+    return " ".join(text.split())
+
+
+def _parse_amount(number: str, multiplier: Optional[str]) -> int:
+    value = float(number)
+    if multiplier:
+        value *= AMOUNT_MULTIPLIERS.get(multiplier, 1)
+    return int(value)
+
+
+@dataclass
+class CatalogVocabulary:
+    makes: Dict[str, str] = field(default_factory=dict)
+    models: Dict[str, str] = field(default_factory=dict)
+    model_makes: Dict[str, Set[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_payloads(cls, payloads: Iterable[Dict[str, Any]]) -> CatalogVocabulary:
+        vocabulary = cls()
+        for payload in payloads:
+            make = str(payload.get("make") or "").strip()
+            model = str(payload.get("model") or "").strip()
+            if not make:
+                continue
+
+            vocabulary.makes.setdefault(normalize_text(make), make)
+            if model:
+                model_key = normalize_text(model)
+                vocabulary.models.setdefault(model_key, model)
+                vocabulary.model_makes.setdefault(model_key, set()).add(make)
+        return vocabulary
+
+    def __bool__(self) -> bool:
+        return bool(self.makes)
+
+
+@dataclass
+class ExtractionResult:
+    preferences: CarPreferences
+    confidence: float
+    unknown_tokens: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ExtractionStats:
+    attempts: int = 0
+    fast_path_hits: int = 0
+    llm_fallbacks: int = 0
+    vocabulary_loads: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "fast_path_hits": self.fast_path_hits,
+            "llm_fallbacks": self.llm_fallbacks,
+            "fast_path_hit_rate": round(self.fast_path_hits / self.attempts, 4)
+            if self.attempts
+            else 0.0,
+            "vocabulary_loads": self.vocabulary_loads,
+        }
+
+
+class RuleBasedPreferencesExtractor:
+    """Deterministic CarPreferences extractor for short catalog queries.
+
+    Make/model come from fuzzy matching against the catalog vocabulary,
+    while order_by, years, budget, mileage, transmission, fuel, features
+    and dimension limits use Spanish keyword maps. Every token the rules cannot explain lowers the
+    confidence so that anything unusual still goes to the LLM extractor.
+    """
+
+    def __init__(self, settings: Optional[KavakExtractionSettings] = None):
+        self.settings = settings or KavakExtractionSettings()
+        self._vocabulary: Optional[CatalogVocabulary] = None
+        self._vocabulary_loaded_at: float = 0.0
+        self.stats = ExtractionStats()
+
+    async def get_vocabulary(
+        self, vector_repository: QdrantVectorRepository
+    ) -> CatalogVocabulary:
+        expired = (
+            time.monotonic() - self._vocabulary_loaded_at > self.settings.VOCABULARY_TTL
+        )
+        if self._vocabulary is None or expired:
+            payloads = await vector_repository.scroll_payloads(
+                fields=["make", "model"],
+                collection=CollectionType.KAVAK_CATALOG,
+            )
+            self.set_vocabulary(CatalogVocabulary.from_payloads(payloads))
+        return self._vocabulary
+
+    def set_vocabulary(self, vocabulary: CatalogVocabulary) -> None:
+        self._vocabulary = vocabulary
+        self._vocabulary_loaded_at = time.monotonic()
+        self.stats.vocabulary_loads += 1
+        logger.info(
+            f"Loaded catalog vocabulary: {len(vocabulary.makes)} makes, {len(vocabulary.models)} models"
+        )
+
+    def invalidate_vocabulary(self) -> None:
+        self._vocabulary = None
+
+    async def extract_confident(
+        self, text: str, vector_repository: QdrantVectorRepository
+    ) -> Optional[CarPreferences]:
+        """Return preferences when the rules are confident, otherwise ``None``."""
+        if not self.settings.RULE_BASED_ENABLED:
+            return None
+
+        self.stats.attempts += 1
+        try:
+            vocabulary = await self.get_vocabulary(vector_repository)
+            result = self.extract(text, vocabulary)
+        except Exception as exc:
+            logger.warning(f"Rule-based preference extraction failed: {exc}")
+            result = None
+
+        if result and result.confidence >= self.settings.MIN_CONFIDENCE:
+            self.stats.fast_path_hits += 1
+            logger.info(
+                f"Rule-based extraction hit (confidence={result.confidence:.2f}): "
+                f"{result.preferences.model_dump(exclude_none=True)}"
+            )
+            return result.preferences
+
+        self.stats.llm_fallbacks += 1
+        if result:
+            logger.info(
+                f"Rule-based extraction below threshold (confidence={result.confidence:.2f}, "
+                f"unknown={result.unknown_tokens}), falling back to LLM"
+            )
+        return None
+
+    def extract(
+        self, text: str, vocabulary: CatalogVocabulary
+    ) -> Optional[ExtractionResult]:
+        normalized = normalize_text(text)
+        values: Dict[str, Any] = {}
+
+        normalized = self._extract_order_by(normalized, values)
+        normalized = self._extract_dimensions(normalized, values)
+        normalized = self._extract_years(normalized, values)
+        normalized = self._extract_mileage(normalized, values)
+        normalized = self._extract_budget(normalized, values)
+        normalized = self._extract_keyword(
+            normalized, values, "transmission", TRANSMISSION_PATTERNS
+        )
+        normalized = self._extract_keyword(normalized, values, "fuel", FUEL_PATTERNS)
+        normalized = self._extract_features(normalized, values)
+
+        tokens = [t for t in normalized.split() if t not in FILLER_WORDS]
+        tokens, match_scores = self._extract_make_model(tokens, vocabulary, values)
+
+        unknown = list(tokens)
+        explained = len(match_scores) + sum(1 for key in RULE_FIELDS if key in values)
+        if "year_min" in values or "year_max" in values:
+            explained += 1
+        explained += sum(
+            1
+            for dimension in DIMENSION_WORDS.values()
+            if f"{dimension}_min" in values or f"{dimension}_max" in values
+        )
+
+        confidence = 1.0
+        if unknown:
+            confidence = explained / (explained + len(unknown))
+        if match_scores:
+            confidence *= min(match_scores) / 100.0
+
+        try:
+            preferences = CarPreferences(**values)
+        except ValidationError:
+            return None
+
+        return ExtractionResult(
+            preferences=preferences,
+            confidence=round(confidence, 4),
+            unknown_tokens=unknown,
+        )
+
+    @staticmethod
+    def _consume(text: str, match: re.Match) -> str:
+        return f"{text[: match.start()]} {text[match.end() :]}"
+
+    def _extract_order_by(self, text: str, values: Dict[str, Any]) -> str:
+        for pattern, order_by in ORDER_BY_PATTERNS:
+            match = re.search(pattern, text)
+            if match:
+                values.setdefault("order_by", order_by)
+                text = self._consume(text, match)
+        return text
+
+    def _extract_dimensions(self, text: str, values: Dict[str, Any]) -> str:
+        for pattern in DIMENSION_PATTERNS:
+            while match := re.search(pattern, text):
+                groups = match.groups()
+                if groups[0] in DIMENSION_WORDS:
+                    word, bound, amount, unit = groups
+                else:
+                    bound, amount, unit, word = groups
+
+                value = float(amount)
+                if unit:
+                    value *= DIMENSION_UNITS[unit]
+                elif value < 10:
+                    # "menos de 4.5 de largo" is meters; bare large numbers are mm.
+                    value *= 1_000
+
+                side = "min" if bound.split()[0] in MIN_DIMENSION_BOUNDS else "max"
+                values[f"{DIMENSION_WORDS[word]}_{side}"] = value
+                text = self._consume(text, match)
+        return text
+
+    def _extract_features(self, text: str, values: Dict[str, Any]) -> str:
+        for pattern, field_name in FEATURE_PATTERNS:
+            match = re.search(pattern, text)
+            if match:
+                values[field_name] = True
+                text = self._consume(text, match)
+        return text
+
+    def _extract_years(self, text: str, values: Dict[str, Any]) -> str:
+        for pattern in YEAR_RANGE_PATTERNS:
+            match = re.search(pattern, text)
+            if match:
+                low, high = sorted((int(match.group(1)), int(match.group(2))))
+                values["year_min"], values["year_max"] = low, high
+                return self._consume(text, match)
+
+        for pattern, offset in YEAR_MIN_PATTERNS:
+            match = re.search(pattern, text)
+            if match:
+                values["year_min"] = int(match.group(1)) + offset
+                text = self._consume(text, match)
+                break
+
+        for pattern, offset in YEAR_MAX_PATTERNS:
+            match = re.search(pattern, text)
+            if match:
+                values["year_max"] = int(match.group(1)) + offset
+                text = self._consume(text, match)
+                break
+
+        if "year_min" not in values and "year_max" not in values:
+            match = re.search(rf"\b{YEAR}\b", text)
+            if match:
+                values["year_min"] = values["year_max"] = int(match.group(1))
+                text = self._consume(text, match)
+        return text
+
+    def _extract_mileage(self, text: str, values: Dict[str, Any]) -> str:
+        match = re.search(MILEAGE_PATTERN, text)
+        if match:
+            values["mileage_max"] = _parse_amount(match.group(1), match.group(2))
+            text = self._consume(text, match)
+        return text
+
+    def _extract_budget(self, text: str, values: Dict[str, Any]) -> str:
+        for pattern in BUDGET_PATTERNS:
+            for match in re.finditer(pattern, text):
+                multiplier = match.group(2) if len(match.groups()) >= 2 else None
+                amount = _parse_amount(match.group(1), multiplier)
+                if amount >= MIN_BUDGET:
+                    values["budget_max"] = amount
+                    return self._consume(text, match)
+        return text
+
+    def _extract_keyword(
+        self,
+        text: str,
+        values: Dict[str, Any],
+        field_name: str,
+        patterns: List[Tuple[str, str]],
+    ) -> str:
+        for pattern, value in patterns:
+            match = re.search(pattern, text)
+            if match:
+                values.setdefault(field_name, value)
+                text = self._consume(text, match)
+        return text
+
+    def _extract_make_model(
+        self,
+        tokens: List[str],
+        vocabulary: CatalogVocabulary,
+        values: Dict[str, Any],
+    ) -> Tuple[List[str], List[float]]:
+        scores: List[float] = []
+        matched: Set[int] = set()
+
+        make_match = self._best_match(tokens, vocabulary.makes)
+        if make_match:
+            make_key, score, start, end = make_match
+            values["brand"] = vocabulary.makes[make_key]
+            scores.append(score)
+            matched.update(range(start, end))
+
+        model_choices = vocabulary.models
+        if "brand" in values:
+            model_choices = {
+                key: name
+                for key, name in vocabulary.models.items()
+                if values["brand"] in vocabulary.model_makes.get(key, ())
+            }
+
+        # Models are matched against the full token list because some catalog
+        # models repeat the make ("Mazda 3").
+        model_match = self._best_match(tokens, model_choices)
+        if model_match:
+            model_key, score, start, end = model_match
+            values["model"] = vocabulary.models[model_key]
+            scores.append(score)
+            matched.update(range(start, end))
+
+            makes = vocabulary.model_makes.get(model_key, set())
+            if "brand" not in values and len(makes) == 1:
+                values["brand"] = next(iter(makes))
+
+        remaining = [token for i, token in enumerate(tokens) if i not in matched]
+        return remaining, scores
+
+    def _best_match(
+        self, tokens: List[str], choices: Dict[str, str]
+    ) -> Optional[Tuple[str, float, int, int]]:
+        if not tokens or not choices:
+            return None
+
+        best: Optional[Tuple[str, float, int, int]] = None
+        choice_keys = list(choices.keys())
+        for size in (3, 2, 1):
+            for start in range(0, len(tokens) - size + 1):
+                ngram = " ".join(tokens[start : start + size])
+                if len(ngram) < 3 or ngram.isdigit():
+                    if ngram in choices:
+                        candidate = (ngram, 100.0, start, start + size)
+                        if best is None or candidate[1] > best[1]:
+                            best = candidate
+                    continue
+
+                match = process.extractOne(
+                    ngram,
+                    choice_keys,
+                    scorer=fuzz.ratio,
+                    score_cutoff=self.settings.FUZZY_SCORE_CUTOFF,
+                )
+                if match and (best is None or match[1] > best[1]):
+                    best = (match[0], float(match[1]), start, start + size)
+        return best
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        stats["enabled"] = self.settings.RULE_BASED_ENABLED
+        stats["min_confidence"] = self.settings.MIN_CONFIDENCE
+        return stats
+
+
+_preferences_extractor_instance: Optional[RuleBasedPreferencesExtractor] = None
+
+
+def get_preferences_extractor() -> RuleBasedPreferencesExtractor:
+    global _preferences_extractor_instance
+    if _preferences_extractor_instance is None:
+        _preferences_extractor_instance = RuleBasedPreferencesExtractor()
+    return _preferences_extractor_instance
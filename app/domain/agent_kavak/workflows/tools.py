@@ -1,15 +1,43 @@
-from typing import Dict, Any, List
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from qdrant_client.models import SparseVector
 
 from app.core.config.logging import logger
+from app.core.config.settings.kavak_config import KavakRetrievalSettings
 from app.repository.vector import QdrantVectorRepository, CollectionType
 from app.core.services.kavak_llm_manager import KavakLLMManager
 from app.core.services.cag_manager import get_cag_manager
+from app.core.services.sparse_encoder import get_sparse_encoder
 from app.models.agent.schemas import CarPreferences, FinancingPlan, Car, RAGAnswer
 from app.domain.prompts import build_rag_value_prop_prompt
+from .catalog_cache import (
+    CATALOG_PAYLOAD_FIELDS,
+    car_from_payload,
+    catalog_point_id,
+    get_catalog_search_cache,
+)
+from .catalog_engine import (
+    AGGREGATE_COLUMNS,
+    DIMENSION_FIELDS,
+    ORDER_COLUMNS,
+    float_column,
+    get_catalog_engine,
+    keyword_column,
+    relevance_bonus,
+    top_indices,
+)
+from .catalog_keywords import normalize_keyword, normalize_make, normalize_model
 
 DEFAULT_TOP_K = 20
 DEFAULT_RAG_TOP_K = 5
+DEFAULT_SIMILAR_TOP_K = 5
 MAX_CATALOG_RESULTS_MULTIPLIER = 2
+VALUE_PROP_PAYLOAD_FIELDS = ["text", "category", "topic", "location_name"]
+
+RETRIEVAL_SETTINGS = KavakRetrievalSettings()
 
 
 async def rag_value_prop_tool(
@@ -18,87 +46,165 @@ async def rag_value_prop_tool(
     llm_manager: KavakLLMManager,
     top_k: int = DEFAULT_RAG_TOP_K,
     use_cag: bool = True,
+    refresh: bool = False,
 ) -> RAGAnswer:
+    """Answer a value-prop question from the knowledge base.
+
+    With ``refresh=True`` the cached answer is bypassed and recomputed; this is
+    how stale CAG entries are revalidated in the background.
+    """
     logger.info("Generating RAG answer")
 
+    cag_manager = get_cag_manager()
+
     try:
         if use_cag:
-            cag_manager = get_cag_manager()
-            cached_response = await cag_manager.get_cached_response(
-                cache_type="value_prop", query=query
+            if not refresh:
+                cached_response = await cag_manager.get_cached_response(
+                    cache_type="value_prop",
+                    query=query,
+                    refresh=lambda: rag_value_prop_tool(
+                        query,
+                        vector_repository,
+                        llm_manager,
+                        top_k=top_k,
+                        refresh=True,
+                    ),
+                )
+                if cached_response:
+                    return cached_response
+
+            return await cag_manager.get_or_compute(
+                cache_type="value_prop",
+                query=query,
+                compute=lambda: _generate_value_prop_answer(
+                    query,
+                    vector_repository,
+                    llm_manager,
+                    top_k,
+                    use_cag=True,
+                    use_semantic=not refresh,
+                ),
             )
-            if cached_response:
-                return cached_response
-
-        embedding = await llm_manager.embed_text(query)
-        results = await vector_repository.search(
-            vector=embedding,
-            top_k=top_k,
-            collection=CollectionType.KAVAK_VALUE_PROP,
+
+        return await _generate_value_prop_answer(
+            query, vector_repository, llm_manager, top_k, use_cag=False
         )
 
-        if not results or len(results) == 0:
-            return RAGAnswer(
-                answer="Lo siento, no encontré información relevante sobre ese tema. ¿Podrías reformular tu pregunta?",
-                sources=[],
-            )
+    except Exception as exc:
+        logger.error(f"Error in rag_value_prop_tool: {exc}", exc_info=True)
+        return RAGAnswer(
+            answer="Lo siento, no pude encontrar información sobre eso. ¿Puedes reformular tu pregunta?",
+            sources=[],
+        )
 
-        context_parts = []
-        sources = []
 
-        for result in results:
-            payload = result.payload if hasattr(result, "payload") else {}
-            text = payload.get("text", "")
-            category = payload.get("category", "general")
-            topic = payload.get("topic", "")
-            location = payload.get("location_name", "")
-
-            if text:
-                context_parts.append(text)
-                source_parts = []
-                if location:
-                    source_parts.append(location)
-                if category:
-                    source_parts.append(category)
-                if topic:
-                    source_parts.append(topic)
-                sources.append(" | ".join(source_parts) if source_parts else "Kavak")
-
-        context = "\n\n".join(context_parts)
-
-        prompt = build_rag_value_prop_prompt(query=query, context=context)
-
-        answer = await llm_manager.complete_text(
-            prompt=prompt,
-            temperature=0.3,
-            max_tokens=500,
+async def _generate_value_prop_answer(
+    query: str,
+    vector_repository: QdrantVectorRepository,
+    llm_manager: KavakLLMManager,
+    top_k: int,
+    use_cag: bool,
+    use_semantic: bool = True,
+) -> RAGAnswer:
+    cag_manager = get_cag_manager()
+    mode = RETRIEVAL_SETTINGS.VALUE_PROP_MODE
+    semantic_enabled = use_cag and cag_manager.semantic_enabled
+
+    # Sparse-only retrieval needs no embedding unless the semantic cache does.
+    embedding = (
+        await llm_manager.embed_text(query)
+        if mode != "sparse" or semantic_enabled
+        else None
+    )
+
+    if use_semantic and semantic_enabled:
+        semantic_response = await cag_manager.get_semantic_response(
+            cache_type="value_prop",
+            embedding=embedding,
+            vector_repository=vector_repository,
         )
+        if semantic_response:
+            await cag_manager.cache_response(
+                cache_type="value_prop",
+                query=query,
+                response=semantic_response,
+            )
+            return semantic_response
+
+    results = await vector_repository.search(
+        vector=embedding if mode != "sparse" else None,
+        sparse_vector=_sparse_query(query, mode),
+        top_k=top_k,
+        collection=CollectionType.KAVAK_VALUE_PROP,
+        prefetch_limit=top_k * RETRIEVAL_SETTINGS.HYBRID_PREFETCH_MULTIPLIER,
+        with_payload=VALUE_PROP_PAYLOAD_FIELDS,
+    )
 
-        answer = answer.strip()
-        if answer.startswith("Respuesta:"):
-            answer = answer.replace("Respuesta:", "").strip()
+    if not results or len(results) == 0:
+        return RAGAnswer(
+            answer="Lo siento, no encontré información relevante sobre ese tema. ¿Podrías reformular tu pregunta?",
+            sources=[],
+        )
 
-        response = RAGAnswer(answer=answer, sources=sources)
+    context_parts = []
+    sources = []
+    chunk_ids = []
 
-        if use_cag:
-            try:
-                cag_manager = get_cag_manager()
-                await cag_manager.cache_response(
+    for result in results:
+        payload = result.payload if hasattr(result, "payload") else {}
+        text = payload.get("text", "")
+        category = payload.get("category", "general")
+        topic = payload.get("topic", "")
+        location = payload.get("location_name", "")
+
+        if text:
+            context_parts.append(text)
+            chunk_ids.append(str(result.id))
+            source_parts = []
+            if location:
+                source_parts.append(location)
+            if category:
+                source_parts.append(category)
+            if topic:
+                source_parts.append(topic)
+            sources.append(" | ".join(source_parts) if source_parts else "Kavak")
+
+    context = "\n\n".join(context_parts)
+
+    prompt = build_rag_value_prop_prompt(query=query, context=context)
+
+    answer = await llm_manager.complete_text(
+        prompt=prompt,
+        temperature=0.3,
+        max_tokens=500,
+    )
+
+    answer = answer.strip()
+    if answer.startswith("Respuesta:"):
+        answer = answer.replace("Respuesta:", "").strip()
+
+    response = RAGAnswer(answer=answer, sources=sources, chunk_ids=chunk_ids)
+
+    if use_cag:
+        try:
+            await cag_manager.cache_response(
+                cache_type="value_prop",
+                query=query,
+                response=response,
+            )
+            if cag_manager.semantic_enabled:
+                await cag_manager.cache_semantic_response(
                     cache_type="value_prop",
                     query=query,
+                    embedding=embedding,
                     response=response,
+                    vector_repository=vector_repository,
                 )
-            except Exception as cache_exc:
-                logger.warning(f"Failed to cache response (non-fatal): {cache_exc}")
+        except Exception as cache_exc:
+            logger.warning(f"Failed to cache response (non-fatal): {cache_exc}")
 
-        return response
-
-    except Exception as exc:
-        logger.error(f"Error in rag_value_prop_tool: {exc}", exc_info=True)
-        return RAGAnswer(
-            answer="Lo siento, no pude encontrar información sobre eso. ¿Puedes reformular tu pregunta?",
-            sources=[],
-        )
+    return response
 
 
 async def search_catalog_tool(
@@ -106,95 +212,223 @@ async def search_catalog_tool(
     vector_repository: QdrantVectorRepository,
     llm_manager: KavakLLMManager,
     top_k: int = DEFAULT_TOP_K,
+    free_text: Optional[str] = None,
 ) -> List[Car]:
+    """Search the catalog for cars matching ``preferences``.
+
+    Purely structured requests are answered exactly by the in-memory catalog
+    engine. Vector search only runs when ``free_text`` carries intent the
+    structured preferences could not capture, or when the engine is
+    unavailable.
+    """
     logger.info(f"Searching catalog with preferences: {preferences}")
 
+    search_cache = get_catalog_search_cache()
+    catalog_engine = get_catalog_engine()
+
     try:
-        query_text = _build_catalog_query(preferences)
-        embedding = await llm_manager.embed_text(query_text)
+        if not free_text and await catalog_engine.ensure_fresh(vector_repository):
+            cars = catalog_engine.search(preferences, top_k)
+            logger.info(f"Catalog engine returned {len(cars)} cars")
+            return cars
+
+        cached_cars = await search_cache.get(
+            preferences, top_k, vector_repository, free_text
+        )
+        if cached_cars is not None:
+            logger.info(f"Catalog search cache hit ({len(cached_cars)} cars)")
+            return cached_cars
+
         filters = _build_qdrant_filters(preferences)
+        results = []
 
-        search_top_k = top_k * MAX_CATALOG_RESULTS_MULTIPLIER
-        if preferences.order_by:
-            search_top_k = max(search_top_k * 3, 100)
+        # With free text the ordered scroll would ignore its intent, so rank
+        # by similarity first and let the reranker sort the candidates.
+        if not free_text and preferences.order_by in ORDER_COLUMNS:
+            order_field, descending = ORDER_COLUMNS[preferences.order_by]
             logger.info(
-                f"Comparative query detected (order_by={preferences.order_by}), increasing search top_k to {search_top_k}"
+                f"Comparative query detected (order_by={preferences.order_by}), ordering by '{order_field}' in Qdrant"
+            )
+            results = await vector_repository.scroll_ordered(
+                order_by=order_field,
+                descending=descending,
+                limit=top_k,
+                filter_by=filters if filters else None,
+                collection=CollectionType.KAVAK_CATALOG,
+                with_payload=CATALOG_PAYLOAD_FIELDS,
             )
 
-        results = await vector_repository.search(
-            vector=embedding,
-            top_k=search_top_k,
+        if not results:
+            query_text = free_text or _build_catalog_query(preferences)
+            mode = RETRIEVAL_SETTINGS.CATALOG_MODE
+            candidates = top_k * MAX_CATALOG_RESULTS_MULTIPLIER
+
+            results = await vector_repository.search(
+                vector=await llm_manager.embed_text(query_text)
+                if mode != "sparse"
+                else None,
+                sparse_vector=_sparse_query(query_text, mode),
+                top_k=candidates,
+                filter_by=filters if filters else None,
+                collection=CollectionType.KAVAK_CATALOG,
+                prefetch_limit=candidates
+                * RETRIEVAL_SETTINGS.HYBRID_PREFETCH_MULTIPLIER,
+                with_payload=CATALOG_PAYLOAD_FIELDS,
+            )
+
+        if not results or len(results) == 0:
+            logger.info("No cars found matching preferences")
+            await search_cache.set(preferences, top_k, [], free_text)
+            return []
+
+        cars = _rerank_and_convert(
+            results,
+            preferences,
+            top_k,
+            rank_scores=RETRIEVAL_SETTINGS.CATALOG_MODE != "dense",
+        )
+        await search_cache.set(preferences, top_k, cars, free_text)
+        return cars
+
+    except Exception as exc:
+        logger.error(f"Error in search_catalog_tool: {exc}", exc_info=True)
+        return []
+
+
+async def similar_cars_tool(
+    stock_id: str,
+    vector_repository: QdrantVectorRepository,
+    preferences: Optional[CarPreferences] = None,
+    top_k: int = DEFAULT_SIMILAR_TOP_K,
+) -> List[Car]:
+    """Cars most similar to ``stock_id``, optionally restricted by ``preferences``.
+
+    Uses Qdrant recommend with the car's stored vector as the positive
+    example, so no embedding is computed.
+    """
+    logger.info(f"Finding cars similar to {stock_id} with preferences: {preferences}")
+
+    try:
+        filters = _build_qdrant_filters(preferences) if preferences else {}
+        results = await vector_repository.recommend(
+            positive=[catalog_point_id(stock_id)],
+            top_k=top_k + 1,
             filter_by=filters if filters else None,
             collection=CollectionType.KAVAK_CATALOG,
+            with_payload=CATALOG_PAYLOAD_FIELDS,
         )
 
-        if not results and filters.get("make"):
-            logger.info(
-                f"No results with exact brand filter '{filters.get('make')}', trying fallback strategies..."
-            )
+        cars = []
+        for result in results:
+            car = car_from_payload(result.payload or {})
+            if car is not None and car.id != stock_id:
+                cars.append(car)
+        return cars[:top_k]
 
-            brand_to_match = filters.get("make").lower().strip()
-            results_unfiltered = await vector_repository.search(
-                vector=embedding,
-                top_k=top_k * 4,
-                filter_by=None,
-                collection=CollectionType.KAVAK_CATALOG,
-            )
+    except Exception as exc:
+        logger.error(f"Error in similar_cars_tool: {exc}", exc_info=True)
+        return []
 
-            filtered_results = []
-            for result in results_unfiltered:
-                payload = result.payload if hasattr(result, "payload") else {}
-                make_in_result = str(payload.get("make", "")).lower().strip()
-                if make_in_result == brand_to_match:
-                    filtered_results.append(result)
 
-            if filtered_results:
-                logger.info(
-                    f"Found {len(filtered_results)} results with case-insensitive brand match"
-                )
-                results = filtered_results
-            else:
-                logger.info("Trying semantic search without brand filter...")
-                filters_without_brand = {
-                    k: v for k, v in filters.items() if k != "make"
-                }
-                results = await vector_repository.search(
-                    vector=embedding,
-                    top_k=top_k * 2,
-                    filter_by=filters_without_brand if filters_without_brand else None,
-                    collection=CollectionType.KAVAK_CATALOG,
-                )
+async def catalog_stats_tool(
+    preferences: CarPreferences,
+    vector_repository: QdrantVectorRepository,
+    group_by: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Exact inventory counts and price/year/km ranges for ``preferences``.
 
-                if results:
-                    brand_filtered = [
-                        r
-                        for r in results
-                        if str(
-                            r.payload.get("make", "") if hasattr(r, "payload") else {}
-                        )
-                        .lower()
-                        .strip()
-                        == brand_to_match
-                    ]
-                    if brand_filtered:
-                        logger.info(
-                            f"Found {len(brand_filtered)} results with semantic search + brand filter"
-                        )
-                        results = brand_filtered
+    Answered from the catalog engine's columns. If the engine is unavailable,
+    Qdrant count/facet give the counts and ordered scrolls the overall
+    min/max; averages and per-group ranges are then left out.
+    """
+    logger.info(f"Computing catalog stats for {preferences} (group_by={group_by})")
 
-        if not results or len(results) == 0:
-            logger.info(
-                "No cars found matching preferences after all fallback strategies"
-            )
-            return []
+    try:
+        catalog_engine = get_catalog_engine()
+        if await catalog_engine.ensure_fresh(vector_repository):
+            return catalog_engine.aggregate(preferences, group_by)
 
-        cars = _rerank_and_convert(results, preferences)
-        return cars[:top_k]
+        return await _catalog_stats_from_qdrant(
+            preferences, vector_repository, group_by
+        )
 
     except Exception as exc:
-        logger.error(f"Error in search_catalog_tool: {exc}", exc_info=True)
+        logger.error(f"Error in catalog_stats_tool: {exc}", exc_info=True)
+        return []
+
+
+async def _catalog_stats_from_qdrant(
+    preferences: CarPreferences,
+    vector_repository: QdrantVectorRepository,
+    group_by: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    filters = _build_qdrant_filters(preferences) or None
+
+    if group_by is not None:
+        counts = await vector_repository.facet_counts(
+            key=f"{group_by}_norm",
+            filter_by=filters,
+            collection=CollectionType.KAVAK_CATALOG,
+        )
+        return [
+            {"group": value, "count": count, "price": None, "year": None, "km": None}
+            for value, count in sorted(
+                counts.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+
+    count = await vector_repository.count(
+        filter_by=filters, collection=CollectionType.KAVAK_CATALOG
+    )
+    if not count:
         return []
 
+    summary: Dict[str, Any] = {"group": "total", "count": count}
+    for column in AGGREGATE_COLUMNS:
+        lowest, highest = await asyncio.gather(
+            *(
+                vector_repository.scroll_ordered(
+                    order_by=column,
+                    descending=descending,
+                    limit=1,
+                    filter_by=filters,
+                    collection=CollectionType.KAVAK_CATALOG,
+                    with_payload=[column],
+                )
+                for descending in (False, True)
+            )
+        )
+        summary[column] = (
+            {
+                "min": float(lowest[0].payload[column]),
+                "max": float(highest[0].payload[column]),
+                "avg": None,
+            }
+            if lowest and highest
+            else None
+        )
+    return [summary]
+
+
+async def load_catalog_cars(
+    stock_ids: List[str], vector_repository: QdrantVectorRepository
+) -> List[Car]:
+    """Cars for ``stock_ids`` in order, skipping ids no longer in the catalog.
+
+    Served from the catalog engine's columns when loaded; only ids it does not
+    know are fetched by payload, never by vector search.
+    """
+    catalog_engine = get_catalog_engine()
+    cars = catalog_engine.get_cars(stock_ids) if catalog_engine.loaded else {}
+
+    missing = [stock_id for stock_id in stock_ids if stock_id not in cars]
+    if missing:
+        cars.update(
+            await get_catalog_search_cache().load_cars(missing, vector_repository)
+        )
+
+    return [cars[stock_id] for stock_id in stock_ids if stock_id in cars]
+
 
 async def compute_financing_tool(
     price: float,
@@ -250,6 +484,13 @@ async def compute_financing_tool(
         raise
 
 
+def _sparse_query(text: str, mode: str) -> Optional[SparseVector]:
+    """BM25 query vector for ``hybrid`` and ``sparse`` retrieval modes."""
+    if mode == "dense":
+        return None
+    return get_sparse_encoder().encode_query(text)
+
+
 def _build_catalog_query(preferences: CarPreferences) -> str:
     parts = []
 
@@ -326,116 +567,104 @@ def _build_qdrant_filters(preferences: CarPreferences) -> Dict[str, Any]:
         filters["km"] = {"lte": int(preferences.mileage_max)}
 
     if preferences.brand:
-        filters["make"] = preferences.brand.strip()
+        filters["make_norm"] = normalize_make(preferences.brand)
 
     if preferences.model:
-        filters["model"] = preferences.model.strip()
+        filters["model_norm"] = normalize_model(preferences.model)
+
+    if preferences.transmission:
+        filters["transmission"] = preferences.transmission
+
+    if preferences.fuel:
+        filters["fuel"] = preferences.fuel
+
+    if preferences.city:
+        filters["city_norm"] = normalize_keyword(preferences.city)
+
+    for field, column in DIMENSION_FIELDS.items():
+        dimension_filters = {}
+        if getattr(preferences, f"{field}_min"):
+            dimension_filters["gte"] = float(getattr(preferences, f"{field}_min"))
+        if getattr(preferences, f"{field}_max"):
+            dimension_filters["lte"] = float(getattr(preferences, f"{field}_max"))
+        if dimension_filters:
+            filters[column] = dimension_filters
+
+    if preferences.bluetooth is not None:
+        filters["bluetooth"] = preferences.bluetooth
+
+    if preferences.car_play is not None:
+        filters["car_play"] = preferences.car_play
 
     return filters
 
 
-def _rerank_and_convert(results: List[Any], preferences: CarPreferences) -> List[Car]:
-    cars_with_scores = []
+@dataclass(slots=True)
+class _CatalogHit:
+    """Score and payload of one vector hit; a ``Car`` is only built for the winners."""
 
-    for result in results:
-        payload = result.payload if hasattr(result, "payload") else {}
-        score = result.score if hasattr(result, "score") else 0.0
+    score: float
+    payload: Dict[str, Any]
 
-        try:
-            stock_id = str(payload.get("stock_id", ""))
-            make = payload.get("make", "").strip()
-            model = payload.get("model", "").strip()
-            year = int(payload.get("year", 0)) if payload.get("year") else None
-            price = float(payload.get("price", 0)) if payload.get("price") else None
-            km = int(payload.get("km", 0)) if payload.get("km") else None
-
-            if not stock_id or not make or not model or not year or not price:
-                continue
-
-            if preferences.order_by:
-                if preferences.order_by == "mileage_asc":
-                    sort_key = km if km is not None else float("inf")
-                elif preferences.order_by == "mileage_desc":
-                    sort_key = km if km is not None else float("-inf")
-                elif preferences.order_by == "price_asc":
-                    sort_key = price if price is not None else float("inf")
-                elif preferences.order_by == "price_desc":
-                    sort_key = price if price is not None else float("-inf")
-                elif preferences.order_by == "year_desc":
-                    sort_key = year if year is not None else float("-inf")
-                elif preferences.order_by == "year_asc":
-                    sort_key = year if year is not None else float("inf")
-                else:
-                    sort_key = score
-
-                rerank_score = sort_key
-                logger.debug(
-                    f"Using order_by={preferences.order_by}, sort_key={sort_key} for car {stock_id}"
-                )
-            else:
-                rerank_score = score
-
-                if preferences.brand and make.lower() == preferences.brand.lower():
-                    rerank_score += 0.2
-
-                if preferences.model and model.lower() == preferences.model.lower():
-                    rerank_score += 0.2
-
-                if preferences.budget_max and price:
-                    budget_ratio = price / float(preferences.budget_max)
-                    if budget_ratio <= 1.0:
-                        if 0.7 <= budget_ratio <= 0.95:
-                            rerank_score += 0.15
-                        elif budget_ratio > 0.95:
-                            rerank_score += 0.1
-                        else:
-                            rerank_score += 0.05
-
-                if year:
-                    year_score = (year - 2000) / 24.0
-                    rerank_score += year_score * 0.1
-
-                if km:
-                    mileage_score = 1.0 - min(km / 200000.0, 1.0)
-                    rerank_score += mileage_score * 0.1
-
-            bluetooth = payload.get("bluetooth", False)
-            car_play = payload.get("car_play", False)
-            version = payload.get("version", "")
-            largo = float(payload.get("largo", 0)) if payload.get("largo") else None
-            ancho = float(payload.get("ancho", 0)) if payload.get("ancho") else None
-            altura = float(payload.get("altura", 0)) if payload.get("altura") else None
-
-            car = Car(
-                id=stock_id,
-                brand=make,
-                model=model,
-                year=year,
-                price=price,
-                mileage=km or 0,
-                version=version if version else None,
-                bluetooth=bluetooth if bluetooth else None,
-                car_play=car_play if car_play else None,
-                length=largo if largo else None,
-                width=ancho if ancho else None,
-                height=altura if altura else None,
-                transmission=payload.get("transmission"),
-                fuel=payload.get("fuel"),
-                city=payload.get("city"),
-                url=f"https://kavak.com/mx/auto/{stock_id}" if stock_id else None,
-            )
 
-            cars_with_scores.append((rerank_score, car))
+def _rerank_and_convert(
+    results: List[Any],
+    preferences: CarPreferences,
+    top_k: int,
+    rank_scores: bool = False,
+) -> List[Car]:
+    hits = [
+        _CatalogHit(
+            score=float(getattr(result, "score", 0.0) or 0.0),
+            payload=getattr(result, "payload", None) or {},
+        )
+        for result in results
+    ]
+    if not hits or top_k <= 0:
+        return []
 
-        except (ValueError, TypeError, KeyError) as exc:
-            logger.warning(f"Error processing car result: {exc}, payload: {payload}")
-            continue
+    payloads = [hit.payload for hit in hits]
+    price = float_column(payloads, "price")
+    year = float_column(payloads, "year")
+    km = float_column(payloads, "km")
+    make = keyword_column(payloads, "make", normalize_make)
+    model = keyword_column(payloads, "model", normalize_model)
+
+    # Same required fields as ``car_from_payload``.
+    valid = (
+        ~np.isnan(price)
+        & ~np.isnan(year)
+        & (make != "")
+        & (model != "")
+        & np.array([bool(payload.get("stock_id")) for payload in payloads])
+    )
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        return []
 
-    if preferences.order_by and preferences.order_by.endswith("_asc"):
-        cars_with_scores.sort(key=lambda x: x[0])
-    elif preferences.order_by and preferences.order_by.endswith("_desc"):
-        cars_with_scores.sort(key=lambda x: x[0], reverse=True)
+    if preferences.order_by in ORDER_COLUMNS:
+        column, descending = ORDER_COLUMNS[preferences.order_by]
+        key = {"price": price, "year": year, "km": km}[column][rows]
+        key = -key if descending else key
     else:
-        cars_with_scores.sort(key=lambda x: x[0], reverse=True)
-
-    return [car for _, car in cars_with_scores]
+        score = np.array([hit.score for hit in hits], dtype=np.float64)
+        if rank_scores:
+            # RRF and BM25 scores are not on the cosine scale the bonuses are
+            # sized for, so rank position mapped to (0, 1] stands in for them.
+            ranks = np.empty(len(score), dtype=np.float64)
+            ranks[np.argsort(-score, kind="stable")] = np.arange(len(score))
+            score = 1.0 - ranks / len(score)
+        if preferences.brand:
+            score += np.where(make == normalize_make(preferences.brand), 0.2, 0.0)
+        if preferences.model:
+            score += np.where(model == normalize_model(preferences.model), 0.2, 0.0)
+        score += relevance_bonus(price, year, km, preferences.budget_max)
+        key = -score[rows]
+
+    cars = []
+    for row in rows[top_indices(key, top_k)]:
+        car = car_from_payload(hits[row].payload)
+        if car is not None:
+            cars.append(car)
+
+    return cars
@@ -1,9 +1,10 @@
-from .agent import AGENT_SYSTEM_PROMPT
+from .agent import AGENT_SYSTEM_PROMPT, build_stream_fallback_prompt
 from .extraction import build_car_preferences_extraction_prompt
 from .rag import build_rag_value_prop_prompt
 
 __all__ = [
     "AGENT_SYSTEM_PROMPT",
     "build_car_preferences_extraction_prompt",
+    "build_stream_fallback_prompt",
     "build_rag_value_prop_prompt",
 ]
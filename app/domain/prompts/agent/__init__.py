@@ -1,3 +1,4 @@
+from .stream_fallback_prompt import build_stream_fallback_prompt
 from .system_prompt import AGENT_SYSTEM_PROMPT
 
-__all__ = ["AGENT_SYSTEM_PROMPT"]
+__all__ = ["AGENT_SYSTEM_PROMPT", "build_stream_fallback_prompt"]
@@ -5,7 +5,10 @@ IMPORTANTE:
 - Si menciona una marca Y modelo (ej: "Toyota Corolla", "el Corolla", "toyota corolla", "corolla"), extrae AMBOS: brand y model.
 - Si solo menciona marca (ej: "Toyota"), extrae solo brand.
 - Si menciona año específico, extrae year_min y year_max con ese año.
-- Ignora preguntas sobre características (Bluetooth, CarPlay) - solo extrae marca, modelo, año.
+- Si PREGUNTA si un auto tiene una característica ("¿el corolla tiene bluetooth?"), NO la extraigas: solo marca, modelo, año.
+- Si la PIDE como requisito ("busco un auto con CarPlay"), extrae bluetooth: true o car_play: true.
+- Extrae transmission ("automatic"/"manual"), fuel ("gasoline"/"diesel"/"hybrid"/"electric") y city solo si el usuario los pide.
+- Dimensiones en milímetros: "que mida menos de 4.5 m de largo" → length_max: 4500; igual con width_min/width_max (ancho) y height_min/height_max (altura).
 - DETECTA INTENCIONES COMPARATIVAS: Si pregunta por "menor/más bajo/mínimo kilometraje" → order_by: "mileage_asc"
 - Si pregunta por "mayor/más alto/máximo kilometraje" → order_by: "mileage_desc"
 - Si pregunta por "más barato/menor precio/precio mínimo" → order_by: "price_asc"
@@ -13,7 +16,7 @@ IMPORTANTE:
 - Si pregunta por "más nuevo/año más reciente" → order_by: "year_desc"
 - Si pregunta por "más viejo/año más antiguo" → order_by: "year_asc"
 
-Extrae: marca (brand), modelo (model), año (year_min/year_max si se menciona), order_by (si hay intención comparativa).
+Extrae: marca (brand), modelo (model), año (year_min/year_max si se menciona), order_by (si hay intención comparativa) y los requisitos anteriores cuando se pidan.
 
 Ejemplos:
 - "el toyota corolla tiene bluetooth?" → brand: "Toyota", model: "Corolla"
@@ -22,5 +25,6 @@ Ejemplos:
 - "cuál es el auto con menor kilometraje?" → order_by: "mileage_asc"
 - "auto más barato" → order_by: "price_asc"
 - "toyota con menor kilometraje" → brand: "Toyota", order_by: "mileage_asc"
+- "un auto automático con carplay" → transmission: "automatic", car_play: true
 
 Responde en formato JSON válido."""
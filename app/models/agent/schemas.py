@@ -16,6 +16,14 @@ class CarPreferences(BaseModel):
     )
     city: Optional[str] = Field(None, description="City/location preference")
     mileage_max: Optional[int] = Field(None, ge=0, description="Maximum mileage in km")
+    bluetooth: Optional[bool] = Field(None, description="Require Bluetooth")
+    car_play: Optional[bool] = Field(None, description="Require Apple CarPlay")
+    length_min: Optional[float] = Field(None, ge=0, description="Minimum length in mm")
+    length_max: Optional[float] = Field(None, ge=0, description="Maximum length in mm")
+    width_min: Optional[float] = Field(None, ge=0, description="Minimum width in mm")
+    width_max: Optional[float] = Field(None, ge=0, description="Maximum width in mm")
+    height_min: Optional[float] = Field(None, ge=0, description="Minimum height in mm")
+    height_max: Optional[float] = Field(None, ge=0, description="Maximum height in mm")
     order_by: Optional[
         Literal[
             "mileage_asc",
@@ -65,3 +73,7 @@ class Car(BaseModel):
 class RAGAnswer(BaseModel):
     answer: str = Field(description="Answer text")
     sources: List[str] = Field(default_factory=list, description="Source citations")
+    chunk_ids: List[str] = Field(
+        default_factory=list,
+        description="IDs of the knowledge-base chunks the answer was built from",
+    )
@@ -1,6 +1,7 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
 from app.core.config.logging import logger
 from app.core.config.database.postgres_config import PostgresSettings
 from app.models.agent.chat_interaction import (
@@ -151,6 +152,60 @@ class ChatContextRepository:
                 )
                 return []
 
+    def _value_prop_queries_subquery(self, since: Optional[datetime]):
+        stmt = select(
+            func.jsonb_array_elements_text(
+                ChatContextModel.context_metadata["value_prop_queries"]
+            ).label("query")
+        ).where(ChatContextModel.intent == "valueprop")
+        if since is not None:
+            stmt = stmt.where(ChatContextModel.created_at >= since)
+        return stmt.subquery()
+
+    async def get_top_value_prop_queries(
+        self, limit: int = 100, since: Optional[datetime] = None
+    ) -> List[Tuple[str, int]]:
+        """Most frequent value-prop tool questions as ``(query, count)`` pairs.
+
+        Questions are grouped the same way the CAG normalizes its keys
+        (lower-cased and trimmed).
+        """
+        await self.initialize()
+
+        async with self.session_factory() as session:
+            try:
+                queries = self._value_prop_queries_subquery(since)
+                normalized = func.lower(func.trim(queries.c.query))
+                stmt = (
+                    select(func.min(queries.c.query), func.count().label("hits"))
+                    .group_by(normalized)
+                    .order_by(func.count().desc())
+                    .limit(limit)
+                )
+                result = await session.execute(stmt)
+                return [(query, hits) for query, hits in result.all()]
+            except Exception as exc:
+                logger.error(
+                    f"Failed to get top value-prop queries: {exc}", exc_info=True
+                )
+                return []
+
+    async def count_value_prop_queries(self, since: Optional[datetime] = None) -> int:
+        await self.initialize()
+
+        async with self.session_factory() as session:
+            try:
+                queries = self._value_prop_queries_subquery(since)
+                result = await session.execute(
+                    select(func.count()).select_from(queries)
+                )
+                return result.scalar_one()
+            except Exception as exc:
+                logger.error(
+                    f"Failed to count value-prop queries: {exc}", exc_info=True
+                )
+                return 0
+
     async def get_chat_context(self, user_id: str) -> ChatContext:
         interactions = await self.get_last_interactions(user_id, limit=5)
         return ChatContext(user_id=user_id, interactions=interactions)
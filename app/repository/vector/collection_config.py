@@ -4,12 +4,37 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Literal
 
-from qdrant_client.models import Distance
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+)
+
+from app.core.config.settings.kavak_config import (
+    KavakEmbeddingSettings,
+    KavakQdrantSettings,
+)
+
+_embedding_settings = KavakEmbeddingSettings()
+_qdrant_settings = KavakQdrantSettings()
+
+# Every collection stores vectors from the same embedding call, so they share
+# its (possibly shortened) size.
+EMBEDDING_DIMENSIONS = _embedding_settings.DIMENSIONS or 1536
+QUANTIZATION = (
+    None if _qdrant_settings.QUANTIZATION == "none" else _qdrant_settings.QUANTIZATION
+)
 
 
 class CollectionType(str, Enum):
     KAVAK_CATALOG = "kavak_catalog"
     KAVAK_VALUE_PROP = "kavak_value_prop"
+    KAVAK_CAG_SEMANTIC = "kavak_cag_semantic"
 
 
 @dataclass(frozen=True)
@@ -20,6 +45,36 @@ class CollectionConfig:
     description: str = ""
     embedding_model: str | None = None
     namespace_enabled: bool = True
+    sparse_vector_name: str | None = None
+    quantization: Literal["scalar", "binary"] | None = None
+    quantization_oversampling: float = 2.0
+    quantization_rescore: bool = True
+
+    @property
+    def hybrid_enabled(self) -> bool:
+        return self.sparse_vector_name is not None
+
+    def quantization_config(self) -> ScalarQuantization | BinaryQuantization | None:
+        if self.quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def search_params(self) -> SearchParams | None:
+        """Oversample on the quantized vectors, then rescore with the originals."""
+        if self.quantization is None:
+            return None
+        return SearchParams(
+            quantization=QuantizationSearchParams(
+                rescore=self.quantization_rescore,
+                oversampling=self.quantization_oversampling,
+            )
+        )
 
     @staticmethod
     def get_distance(name: str) -> Distance:
@@ -36,19 +91,38 @@ class CollectionConfig:
 COLLECTION_REGISTRY: dict[CollectionType, CollectionConfig] = {
     CollectionType.KAVAK_CATALOG: CollectionConfig(
         name="kavak_catalog",
-        vector_size=1536,
+        vector_size=EMBEDDING_DIMENSIONS,
         distance=Distance.COSINE,
         description="Catálogo de autos seminuevos de Kavak",
         embedding_model="openai-text-embedding-3-small",
         namespace_enabled=False,
+        quantization=QUANTIZATION,
+        quantization_oversampling=_qdrant_settings.QUANTIZATION_OVERSAMPLING,
+        quantization_rescore=_qdrant_settings.QUANTIZATION_RESCORE,
+        sparse_vector_name="bm25",
     ),
     CollectionType.KAVAK_VALUE_PROP: CollectionConfig(
         name="kavak_value_prop",
-        vector_size=1536,
+        vector_size=EMBEDDING_DIMENSIONS,
         distance=Distance.COSINE,
         description="Propuesta de valor, beneficios y sedes de Kavak",
         embedding_model="openai-text-embedding-3-small",
         namespace_enabled=False,
+        quantization=QUANTIZATION,
+        quantization_oversampling=_qdrant_settings.QUANTIZATION_OVERSAMPLING,
+        quantization_rescore=_qdrant_settings.QUANTIZATION_RESCORE,
+        sparse_vector_name="bm25",
+    ),
+    CollectionType.KAVAK_CAG_SEMANTIC: CollectionConfig(
+        name="kavak_cag_semantic",
+        vector_size=EMBEDDING_DIMENSIONS,
+        distance=Distance.COSINE,
+        description="Caché semántico de respuestas RAG por embedding de la pregunta",
+        embedding_model="openai-text-embedding-3-small",
+        namespace_enabled=False,
+        quantization=QUANTIZATION,
+        quantization_oversampling=_qdrant_settings.QUANTIZATION_OVERSAMPLING,
+        quantization_rescore=_qdrant_settings.QUANTIZATION_RESCORE,
     ),
 }
 
@@ -64,6 +138,10 @@ def create_custom_collection_config(
     description: str = "",
     embedding_model: str | None = None,
     namespace_enabled: bool = True,
+    sparse_vector_name: str | None = None,
+    quantization: Literal["scalar", "binary"] | None = None,
+    quantization_oversampling: float = 2.0,
+    quantization_rescore: bool = True,
 ) -> CollectionConfig:
     return CollectionConfig(
         name=name,
@@ -72,4 +150,8 @@ def create_custom_collection_config(
         description=description,
         embedding_model=embedding_model,
         namespace_enabled=namespace_enabled,
+        sparse_vector_name=sparse_vector_name,
+        quantization=quantization,
+        quantization_oversampling=quantization_oversampling,
+        quantization_rescore=quantization_rescore,
     )
@@ -10,12 +10,28 @@ from tenacity import (
 )
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import (
+    Direction,
+    FilterSelector,
+    Fusion,
+    FusionQuery,
+    Modifier,
+    OrderBy,
+    PayloadSchemaType,
     PointStruct,
+    Prefetch,
+    RecommendInput,
+    RecommendQuery,
+    SearchParams,
+    SparseVector,
+    SparseVectorParams,
+    VectorParams,
     Filter,
     FieldCondition,
     MatchValue,
     MatchAny,
+    Range,
 )
+from app.core.config.logging import logger
 from app.core.manager import settings
 from app.repository.vector.collection_config import (
     CollectionType,
@@ -37,6 +53,7 @@ class QdrantVectorRepository:
             check_compatibility=False,
         )
         self._semaphore = asyncio.Semaphore(settings.QDRANT_POOL_MAX_SIZE)
+        self._sparse_vectors: Dict[str, bool] = {}
 
     @classmethod
     def get_instance(cls) -> "QdrantVectorRepository":
@@ -44,6 +61,36 @@ class QdrantVectorRepository:
             cls._instance = QdrantVectorRepository()
         return cls._instance
 
+    async def ensure_collection(
+        self,
+        collection: CollectionType,
+        payload_indexes: Optional[Dict[str, PayloadSchemaType]] = None,
+    ) -> None:
+        config = get_collection_config(collection)
+        async with self._semaphore:
+            if await self._client.collection_exists(config.name):
+                return
+
+            await self._client.create_collection(
+                collection_name=config.name,
+                vectors_config=VectorParams(
+                    size=config.vector_size,
+                    distance=config.distance,
+                ),
+                sparse_vectors_config={
+                    config.sparse_vector_name: SparseVectorParams(modifier=Modifier.IDF)
+                }
+                if config.hybrid_enabled
+                else None,
+                quantization_config=config.quantization_config(),
+            )
+            for field_name, field_schema in (payload_indexes or {}).items():
+                await self._client.create_payload_index(
+                    collection_name=config.name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+
     @retry(
         reraise=True,
         retry=retry_if_exception_type(Exception),
@@ -67,39 +114,242 @@ class QdrantVectorRepository:
     )
     async def search(
         self,
-        vector: List[float],
+        vector: Optional[List[float]] = None,
+        top_k: int = 5,
+        filter_by: Optional[Dict[str, Any]] = None,
+        collection: Optional[CollectionType | str] = None,
+        score_threshold: Optional[float] = None,
+        sparse_vector: Optional[SparseVector] = None,
+        prefetch_limit: Optional[int] = None,
+        with_payload: bool | List[str] = True,
+    ):
+        """Dense, sparse or hybrid search depending on which vectors are given.
+
+        With both ``vector`` and ``sparse_vector`` the two candidate lists
+        (``prefetch_limit`` each) are fused server-side with Reciprocal Rank
+        Fusion; ``score_threshold`` then only applies to the dense side.
+        ``with_payload`` may list the payload fields to return; vectors are
+        never returned.
+        """
+        if vector is None and sparse_vector is None:
+            raise ValueError("A dense or sparse query vector must be provided")
+
+        collection_name = self._resolve_collection_name(collection)
+        qdrant_filter = self._build_filter(filter_by)
+        search_params = self._resolve_search_params(collection)
+
+        if sparse_vector is not None and not await self._has_sparse_vector(
+            collection_name, collection
+        ):
+            # Collections ingested before sparse vectors existed still answer
+            # dense queries until the loader recreates them.
+            if vector is None:
+                raise ValueError(
+                    f"Collection {collection_name} has no sparse vectors; "
+                    "re-ingest it or use dense retrieval"
+                )
+            sparse_vector = None
+
+        if sparse_vector is None:
+            query_kwargs: Dict[str, Any] = {
+                "query": vector,
+                "query_filter": qdrant_filter,
+                "score_threshold": score_threshold,
+                "search_params": search_params,
+            }
+        elif vector is None:
+            query_kwargs = {
+                "query": sparse_vector,
+                "using": self._resolve_sparse_vector_name(collection),
+                "query_filter": qdrant_filter,
+                "score_threshold": score_threshold,
+            }
+        else:
+            prefetch_limit = prefetch_limit or top_k * 4
+            query_kwargs = {
+                "prefetch": [
+                    Prefetch(
+                        query=vector,
+                        filter=qdrant_filter,
+                        limit=prefetch_limit,
+                        score_threshold=score_threshold,
+                        params=search_params,
+                    ),
+                    Prefetch(
+                        query=sparse_vector,
+                        using=self._resolve_sparse_vector_name(collection),
+                        filter=qdrant_filter,
+                        limit=prefetch_limit,
+                    ),
+                ],
+                "query": FusionQuery(fusion=Fusion.RRF),
+            }
+
+        async with self._semaphore:
+            response = await self._client.query_points(
+                collection_name=collection_name,
+                limit=top_k,
+                with_payload=with_payload,
+                with_vectors=False,
+                **query_kwargs,
+            )
+            return response.points
+
+    @retry(
+        reraise=True,
+        retry=retry_if_exception_type(Exception),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+    )
+    async def recommend(
+        self,
+        positive: Sequence[int | str],
+        negative: Optional[Sequence[int | str]] = None,
         top_k: int = 5,
         filter_by: Optional[Dict[str, Any]] = None,
         collection: Optional[CollectionType | str] = None,
+        with_payload: bool | List[str] = True,
     ):
+        """Points nearest to the stored vectors of the ``positive`` point ids.
+
+        The example vectors are read server-side, so no query embedding is
+        needed; the examples themselves are not returned.
+        """
         collection_name = self._resolve_collection_name(collection)
 
         async with self._semaphore:
-            qdrant_filter = None
-            if filter_by:
-                conditions = []
-                for k, v in filter_by.items():
-                    if isinstance(v, dict) and any(
-                        key in v for key in ["gte", "lte", "gt", "lt"]
-                    ):
-                        from qdrant_client.models import Range
-
-                        conditions.append(FieldCondition(key=k, range=Range(**v)))
-                    elif isinstance(v, list):
-                        conditions.append(FieldCondition(key=k, match=MatchAny(any=v)))
-                    else:
-                        conditions.append(
-                            FieldCondition(key=k, match=MatchValue(value=v))
-                        )
-                qdrant_filter = Filter(must=conditions)
             response = await self._client.query_points(
                 collection_name=collection_name,
-                query=vector,
+                query=RecommendQuery(
+                    recommend=RecommendInput(
+                        positive=list(positive),
+                        negative=list(negative) if negative else None,
+                    )
+                ),
+                query_filter=self._build_filter(filter_by),
                 limit=top_k,
-                query_filter=qdrant_filter,
+                search_params=self._resolve_search_params(collection),
+                with_payload=with_payload,
+                with_vectors=False,
             )
             return response.points
 
+    @retry(
+        reraise=True,
+        retry=retry_if_exception_type(Exception),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+    )
+    async def scroll_ordered(
+        self,
+        order_by: str,
+        descending: bool = False,
+        limit: int = 10,
+        filter_by: Optional[Dict[str, Any]] = None,
+        collection: Optional[CollectionType | str] = None,
+        with_payload: bool | List[str] = True,
+    ):
+        """Return the first ``limit`` filtered points sorted server-side by ``order_by``.
+
+        ``order_by`` must have a range-capable payload index; points without
+        the field are skipped by Qdrant.
+        """
+        collection_name = self._resolve_collection_name(collection)
+
+        async with self._semaphore:
+            points, _ = await self._client.scroll(
+                collection_name=collection_name,
+                scroll_filter=self._build_filter(filter_by),
+                limit=limit,
+                order_by=OrderBy(
+                    key=order_by,
+                    direction=Direction.DESC if descending else Direction.ASC,
+                ),
+                with_payload=with_payload,
+                with_vectors=False,
+            )
+            return points
+
+    @retry(
+        reraise=True,
+        retry=retry_if_exception_type(Exception),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+    )
+    async def scroll_payloads(
+        self,
+        fields: Optional[List[str]] = None,
+        filter_by: Optional[Dict[str, Any]] = None,
+        batch_size: int = 256,
+        collection: Optional[CollectionType | str] = None,
+    ) -> List[Dict[str, Any]]:
+        collection_name = self._resolve_collection_name(collection)
+        qdrant_filter = self._build_filter(filter_by)
+
+        payloads: List[Dict[str, Any]] = []
+        offset = None
+        while True:
+            # One page per permit, so a full catalog scroll does not hold
+            # back concurrent searches until it finishes.
+            async with self._semaphore:
+                points, offset = await self._client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=qdrant_filter,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=fields if fields else True,
+                    with_vectors=False,
+                )
+            payloads.extend(point.payload or {} for point in points)
+            if offset is None:
+                break
+        return payloads
+
+    @retry(
+        reraise=True,
+        retry=retry_if_exception_type(Exception),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+    )
+    async def count(
+        self,
+        filter_by: Optional[Dict[str, Any]] = None,
+        collection: Optional[CollectionType | str] = None,
+    ) -> int:
+        collection_name = self._resolve_collection_name(collection)
+        async with self._semaphore:
+            response = await self._client.count(
+                collection_name=collection_name,
+                count_filter=self._build_filter(filter_by),
+                exact=True,
+            )
+            return response.count
+
+    @retry(
+        reraise=True,
+        retry=retry_if_exception_type(Exception),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+    )
+    async def facet_counts(
+        self,
+        key: str,
+        filter_by: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        collection: Optional[CollectionType | str] = None,
+    ) -> Dict[Any, int]:
+        """Exact number of points per value of the keyword-indexed field ``key``."""
+        collection_name = self._resolve_collection_name(collection)
+        async with self._semaphore:
+            response = await self._client.facet(
+                collection_name=collection_name,
+                key=key,
+                facet_filter=self._build_filter(filter_by),
+                limit=limit,
+                exact=True,
+            )
+            return {hit.value: hit.count for hit in response.hits}
+
     @retry(
         reraise=True,
         retry=retry_if_exception_type(Exception),
@@ -117,6 +367,42 @@ class QdrantVectorRepository:
                 collection_name=collection_name, points_selector=ids
             )
 
+    @retry(
+        reraise=True,
+        retry=retry_if_exception_type(Exception),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+    )
+    async def delete_by_filter(
+        self,
+        filter_by: Optional[Dict[str, Any]] = None,
+        collection: Optional[CollectionType | str] = None,
+    ) -> None:
+        collection_name = self._resolve_collection_name(collection)
+        qdrant_filter = self._build_filter(filter_by) or Filter(must=[])
+        async with self._semaphore:
+            await self._client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(filter=qdrant_filter),
+            )
+
+    @staticmethod
+    def _build_filter(filter_by: Optional[Dict[str, Any]] = None) -> Optional[Filter]:
+        if not filter_by:
+            return None
+
+        conditions = []
+        for k, v in filter_by.items():
+            if isinstance(v, dict) and any(
+                key in v for key in ["gte", "lte", "gt", "lt"]
+            ):
+                conditions.append(FieldCondition(key=k, range=Range(**v)))
+            elif isinstance(v, list):
+                conditions.append(FieldCondition(key=k, match=MatchAny(any=v)))
+            else:
+                conditions.append(FieldCondition(key=k, match=MatchValue(value=v)))
+        return Filter(must=conditions)
+
     def _resolve_collection_name(
         self, collection: Optional[CollectionType | str] = None
     ) -> str:
@@ -129,5 +415,40 @@ class QdrantVectorRepository:
 
         return collection
 
+    @staticmethod
+    def _resolve_search_params(
+        collection: Optional[CollectionType | str] = None,
+    ) -> Optional[SearchParams]:
+        if isinstance(collection, CollectionType):
+            return get_collection_config(collection).search_params()
+        return None
+
+    @staticmethod
+    def _resolve_sparse_vector_name(
+        collection: Optional[CollectionType | str] = None,
+    ) -> str:
+        if isinstance(collection, CollectionType):
+            config = get_collection_config(collection)
+            if config.sparse_vector_name:
+                return config.sparse_vector_name
+
+        raise ValueError(f"Collection {collection} has no sparse vectors configured")
+
+    async def _has_sparse_vector(
+        self, collection_name: str, collection: Optional[CollectionType | str]
+    ) -> bool:
+        if collection_name not in self._sparse_vectors:
+            async with self._semaphore:
+                info = await self._client.get_collection(collection_name)
+            sparse_vectors = info.config.params.sparse_vectors or {}
+            present = self._resolve_sparse_vector_name(collection) in sparse_vectors
+            if not present:
+                logger.warning(
+                    f"Collection {collection_name} has no sparse vectors; "
+                    "falling back to dense search"
+                )
+            self._sparse_vectors[collection_name] = present
+        return self._sparse_vectors[collection_name]
+
     async def aclose(self) -> None:
         await self._client.close()
@@ -2,7 +2,7 @@ import asyncio
 import csv
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -10,11 +10,26 @@ from qdrant_client import QdrantClient
 from qdrant_client.models import (
     VectorParams,
     PointStruct,
+    Modifier,
     PayloadSchemaType,
+    PointIdsList,
+    SparseVectorParams,
 )
 from llama_index.embeddings.openai import OpenAIEmbedding
 
 from app.core.config.settings.kavak_config import KavakSettings
+from app.core.services.sparse_encoder import (
+    BM25SparseEncoder,
+    build_sparse_encoder,
+)
+from app.domain.agent_kavak.workflows.catalog_cache import catalog_point_id
+from app.domain.agent_kavak.workflows.catalog_keywords import (
+    infer_fuel,
+    infer_transmission,
+    normalize_keyword,
+    normalize_make,
+    normalize_model,
+)
 from app.repository.vector import (
     CollectionType,
     get_collection_config,
@@ -360,6 +375,72 @@ def create_car_text_representation(car: Dict[str, Any]) -> str:
     return ". ".join(parts)
 
 
+def ensure_collection(qdrant_client: QdrantClient, collection_config) -> None:
+    """Create the collection if missing, or bring an existing one in line with its config.
+
+    A different vector size or a missing sparse vector needs a recreate;
+    quantization can be switched on in place.
+    """
+    if qdrant_client.collection_exists(collection_config.name):
+        info = qdrant_client.get_collection(collection_config.name)
+        sparse_vectors = info.config.params.sparse_vectors or {}
+        size_changed = info.config.params.vectors.size != collection_config.vector_size
+        sparse_missing = (
+            collection_config.hybrid_enabled
+            and collection_config.sparse_vector_name not in sparse_vectors
+        )
+        if not size_changed and not sparse_missing:
+            print(
+                f"   Collection already exists, will update: {collection_config.name}"
+            )
+            quantization_config = collection_config.quantization_config()
+            if quantization_config and info.config.quantization_config is None:
+                print(f"   Enabling {collection_config.quantization} quantization")
+                qdrant_client.update_collection(
+                    collection_name=collection_config.name,
+                    quantization_config=quantization_config,
+                )
+            return
+
+        print(
+            f"   Recreating {collection_config.name} "
+            f"(vector size changed: {size_changed}, sparse vector missing: {sparse_missing})"
+        )
+        qdrant_client.delete_collection(collection_config.name)
+    else:
+        print(f"   Creating collection: {collection_config.name}")
+
+    qdrant_client.create_collection(
+        collection_name=collection_config.name,
+        vectors_config=VectorParams(
+            size=collection_config.vector_size,
+            distance=collection_config.distance,
+        ),
+        sparse_vectors_config={
+            collection_config.sparse_vector_name: SparseVectorParams(
+                modifier=Modifier.IDF
+            )
+        }
+        if collection_config.hybrid_enabled
+        else None,
+        quantization_config=collection_config.quantization_config(),
+    )
+
+
+def build_point_vector(
+    collection_config,
+    embedding: List[float],
+    sparse_encoder: BM25SparseEncoder,
+    text: str,
+):
+    if not collection_config.hybrid_enabled:
+        return embedding
+    return {
+        "": embedding,
+        collection_config.sparse_vector_name: sparse_encoder.encode_document(text),
+    }
+
+
 async def load_catalog_collection(
     csv_path: Path,
     qdrant_client: QdrantClient,
@@ -368,20 +449,7 @@ async def load_catalog_collection(
 ) -> None:
     print(f"\nLoading catalog collection: {collection_config.name}")
 
-    collections = qdrant_client.get_collections()
-    collection_names = [c.name for c in collections.collections]
-
-    if collection_config.name not in collection_names:
-        print(f"   Creating collection: {collection_config.name}")
-        qdrant_client.create_collection(
-            collection_name=collection_config.name,
-            vectors_config=VectorParams(
-                size=collection_config.vector_size,
-                distance=collection_config.distance,
-            ),
-        )
-    else:
-        print(f"   Collection already exists, will update: {collection_config.name}")
+    ensure_collection(qdrant_client, collection_config)
 
     print("   Creating payload indexes for filtering...")
     try:
@@ -434,6 +502,29 @@ async def load_catalog_collection(
     except Exception as e:
         print(f"   Index for 'model' may already exist: {e}")
 
+    filter_indexes = {
+        "make_norm": PayloadSchemaType.KEYWORD,
+        "model_norm": PayloadSchemaType.KEYWORD,
+        "transmission": PayloadSchemaType.KEYWORD,
+        "fuel": PayloadSchemaType.KEYWORD,
+        "city_norm": PayloadSchemaType.KEYWORD,
+        "largo": PayloadSchemaType.FLOAT,
+        "ancho": PayloadSchemaType.FLOAT,
+        "altura": PayloadSchemaType.FLOAT,
+        "bluetooth": PayloadSchemaType.BOOL,
+        "car_play": PayloadSchemaType.BOOL,
+    }
+    for field_name, field_schema in filter_indexes.items():
+        try:
+            qdrant_client.create_payload_index(
+                collection_name=collection_config.name,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+            print(f"   Created index for '{field_name}'")
+        except Exception as e:
+            print(f"   Index for '{field_name}' may already exist: {e}")
+
     cars = []
     with open(csv_path, "r", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -442,23 +533,28 @@ async def load_catalog_collection(
 
     print(f"   Found {len(cars)} cars in CSV")
 
+    texts = [create_car_text_representation(car) for car in cars]
+    sparse_encoder = build_sparse_encoder().fit(texts)
+
     batch_size = 50
     points = []
 
-    for i, car in enumerate(cars):
-        text = create_car_text_representation(car)
-
+    for i, (car, text) in enumerate(zip(cars, texts)):
         embedding = await embedding_model.aget_text_embedding(text)
 
         stock_id = car.get("stock_id")
-        point_id = int(stock_id) if stock_id and stock_id.isdigit() else i
+        point_id = catalog_point_id(stock_id) if stock_id else i
         point = PointStruct(
             id=point_id,
-            vector=embedding,
+            vector=build_point_vector(
+                collection_config, embedding, sparse_encoder, text
+            ),
             payload={
                 "stock_id": stock_id,
                 "make": car.get("make", ""),
                 "model": car.get("model", ""),
+                "make_norm": normalize_make(car.get("make")),
+                "model_norm": normalize_model(car.get("model")),
                 "year": int(car["year"]) if car.get("year") else None,
                 "version": car.get("version", ""),
                 "price": float(car["price"]) if car.get("price") else None,
@@ -470,6 +566,11 @@ async def load_catalog_collection(
                 "largo": float(car["largo"]) if car.get("largo") else None,
                 "ancho": float(car["ancho"]) if car.get("ancho") else None,
                 "altura": float(car["altura"]) if car.get("altura") else None,
+                "transmission": car.get("transmission")
+                or infer_transmission(car.get("version")),
+                "fuel": car.get("fuel") or infer_fuel(car.get("version")),
+                "city": car.get("city") or None,
+                "city_norm": normalize_keyword(car.get("city")) or None,
                 "text": text,
             },
         )
@@ -489,22 +590,41 @@ async def load_catalog_collection(
         )
 
 
+def get_existing_chunk_texts(
+    qdrant_client: QdrantClient, collection_name: str
+) -> Dict[Any, str]:
+    existing = {}
+    offset = None
+    while True:
+        points, offset = qdrant_client.scroll(
+            collection_name=collection_name,
+            limit=256,
+            offset=offset,
+            with_payload=["text"],
+            with_vectors=False,
+        )
+        for point in points:
+            existing[point.id] = (point.payload or {}).get("text")
+        if offset is None:
+            return existing
+
+
 async def load_value_prop_collection(
     qdrant_client: QdrantClient,
     embedding_model: OpenAIEmbedding,
     collection_config,
-) -> None:
+) -> List[Any]:
+    """Load the value-prop chunks and return the IDs of chunks that changed or were removed."""
     collections = qdrant_client.get_collections()
     collection_names = [c.name for c in collections.collections]
 
-    if collection_config.name not in collection_names:
-        qdrant_client.create_collection(
-            collection_name=collection_config.name,
-            vectors_config=VectorParams(
-                size=collection_config.vector_size,
-                distance=collection_config.distance,
-            ),
-        )
+    existing_texts = (
+        get_existing_chunk_texts(qdrant_client, collection_config.name)
+        if collection_config.name in collection_names
+        else {}
+    )
+
+    ensure_collection(qdrant_client, collection_config)
 
     try:
         qdrant_client.create_payload_index(
@@ -550,6 +670,10 @@ async def load_value_prop_collection(
     except Exception as e:
         print(f"error {e}")
 
+    sparse_encoder = build_sparse_encoder().fit(
+        item["text"] for item in VALUE_PROPOSITION_STRUCTURED
+    )
+
     batch_size = 50
     points = []
 
@@ -560,7 +684,9 @@ async def load_value_prop_collection(
 
         point = PointStruct(
             id=i,
-            vector=embedding,
+            vector=build_point_vector(
+                collection_config, embedding, sparse_encoder, text
+            ),
             payload={
                 "text": text,
                 "category": content_item["category"],
@@ -596,6 +722,65 @@ async def load_value_prop_collection(
         categories[cat] = categories.get(cat, 0) + 1
         states[state] = states.get(state, 0) + 1
 
+    changed_ids = [
+        i
+        for i, item in enumerate(VALUE_PROPOSITION_STRUCTURED)
+        if i in existing_texts and existing_texts[i] != item["text"]
+    ]
+    removed_ids = [
+        point_id
+        for point_id in existing_texts
+        if not (
+            isinstance(point_id, int)
+            and 0 <= point_id < len(VALUE_PROPOSITION_STRUCTURED)
+        )
+    ]
+    if removed_ids:
+        print(f"   Deleting {len(removed_ids)} chunks no longer in the source...")
+        qdrant_client.delete(
+            collection_name=collection_config.name,
+            points_selector=PointIdsList(points=removed_ids),
+        )
+
+    return changed_ids + removed_ids
+
+
+async def bump_catalog_version() -> None:
+    """Make every cached catalog search (keyed by catalog version) unreachable."""
+    from app.core.services.catalog_version import get_catalog_version
+
+    try:
+        version = await get_catalog_version().bump()
+        print(f"   Catalog version is now {version}")
+    except Exception as e:
+        print(f"   Catalog version bump skipped: {e}")
+
+
+async def refresh_value_prop_cache(changed_chunk_ids: List[Any]) -> None:
+    """Drop CAG answers built from edited chunks and re-warm the top questions."""
+    from app.core.services.cag_manager import get_cag_manager
+    from app.core.services.kavak_llm_manager import KavakLLMManager
+    from app.domain.agent_kavak.workflows.cag_warmup import warm_value_prop_cache
+    from app.repository.vector import QdrantVectorRepository
+
+    try:
+        deleted = await get_cag_manager().invalidate_chunks(changed_chunk_ids)
+        print(
+            f"   Invalidated {deleted} cached value-prop answers "
+            f"({len(changed_chunk_ids)} chunks changed)"
+        )
+
+        report = await warm_value_prop_cache(
+            vector_repository=QdrantVectorRepository.get_instance(),
+            llm_manager=KavakLLMManager.get_instance(),
+        )
+        print(
+            f"   Warmed {report.warmed}/{report.candidates} questions, "
+            f"projected CAG hit rate {report.projected_hit_rate:.1%}"
+        )
+    except Exception as e:
+        print(f"   CAG refresh skipped: {e}")
+
 
 async def main():
     settings = KavakSettings()
@@ -615,8 +800,9 @@ async def main():
     )
 
     embedding_model = OpenAIEmbedding(
-        model="text-embedding-3-small",
+        model=settings.embedding.MODEL,
         api_key=settings.llm.OPENAI_API_KEY,
+        dimensions=settings.embedding.DIMENSIONS,
     )
 
     catalog_config = get_collection_config(CollectionType.KAVAK_CATALOG)
@@ -631,12 +817,16 @@ async def main():
         collection_config=catalog_config,
     )
 
-    await load_value_prop_collection(
+    await bump_catalog_version()
+
+    changed_chunk_ids = await load_value_prop_collection(
         qdrant_client=qdrant_client,
         embedding_model=embedding_model,
         collection_config=value_prop_config,
     )
 
+    await refresh_value_prop_cache(changed_chunk_ids)
+
     print("success")
 
 
@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.services.cag_manager import get_cag_manager
+from app.core.services.kavak_llm_manager import KavakLLMManager
+from app.domain.agent_kavak.workflows.cag_warmup import warm_value_prop_cache
+from app.repository.postgres.chat_context_repository import ChatContextRepository
+from app.repository.vector import QdrantVectorRepository
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Pre-populate the CAG with the most frequent value-prop questions."
+    )
+    parser.add_argument("--top-n", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--days", type=int, default=None, help="History lookback")
+    parser.add_argument(
+        "--invalidate",
+        action="store_true",
+        help="Drop cached value-prop answers first (e.g. after a knowledge-base reload)",
+    )
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    vector_repository = QdrantVectorRepository.get_instance()
+    llm_manager = KavakLLMManager.get_instance()
+    chat_context_repository = ChatContextRepository()
+
+    try:
+        if args.invalidate:
+            await get_cag_manager().invalidate_cache(cache_type="value_prop")
+            print("Flushed cached value-prop answers")
+
+        report = await warm_value_prop_cache(
+            vector_repository=vector_repository,
+            llm_manager=llm_manager,
+            chat_context_repository=chat_context_repository,
+            top_n=args.top_n,
+            concurrency=args.concurrency,
+            lookback_days=args.days,
+        )
+    finally:
+        await chat_context_repository.close()
+        await vector_repository.aclose()
+        await llm_manager.aclose()
+
+    print(
+        f"Warmed {report.warmed}/{report.candidates} questions ({report.failed} failed) in {report.elapsed_s:.1f}s"
+    )
+    print(
+        f"Projected CAG hit rate: {report.projected_hit_rate:.1%} "
+        f"({report.covered_queries} of {report.history_queries} historical value-prop lookups)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
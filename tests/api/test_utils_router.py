@@ -26,3 +26,13 @@ def test_health_check_method_not_allowed(client: TestClient) -> None:
     response = client.post("/api/v1/health")
     
     assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+def test_stats_reports_embedding_batcher(client: TestClient) -> None:
+    """Test the stats endpoint exposes the embedding batching section."""
+    response = client.get("/api/v1/stats")
+
+    assert response.status_code == status.HTTP_200_OK
+    embeddings = response.json()["embeddings"]
+    assert "batching_enabled" in embeddings
+    assert "model" in embeddings
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.core.services.embedding_batcher import EmbeddingBatcher
+
+
+class CountingEmbedder:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: List[List[str]] = []
+        self.fail = fail
+
+    async def __call__(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [[float(len(text)), float(ord(text[0]))] for text in texts]
+
+
+async def test_concurrent_calls_share_one_request() -> None:
+    """Test concurrent callers are coalesced and get their own vectors back."""
+    embedder = CountingEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_batch_size=64, max_wait_ms=20)
+
+    texts = ["a", "bb", "ccc", "bb"]
+    vectors = await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    assert len(embedder.calls) == 1
+    assert embedder.calls[0] == ["a", "bb", "ccc"]
+    assert vectors == [[float(len(t)), float(ord(t[0]))] for t in texts]
+    assert batcher.stats.requests == 4
+
+
+async def test_flushes_at_max_batch_size() -> None:
+    """Test a full batch is sent without waiting for the timer."""
+    embedder = CountingEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_batch_size=2, max_wait_ms=10_000)
+
+    vectors = await asyncio.wait_for(
+        asyncio.gather(*(batcher.embed(text) for text in ["a", "b", "c", "d"])),
+        timeout=1,
+    )
+
+    assert embedder.calls == [["a", "b"], ["c", "d"]]
+    assert len(vectors) == 4
+
+
+async def test_flushes_partial_batch_on_timer() -> None:
+    """Test a batch below the size limit is sent once max_wait_ms elapses."""
+    embedder = CountingEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_batch_size=64, max_wait_ms=10)
+
+    pending = asyncio.ensure_future(batcher.embed("a"))
+    await asyncio.sleep(0)
+    assert embedder.calls == []
+
+    assert await asyncio.wait_for(pending, timeout=1) == [1.0, float(ord("a"))]
+    assert embedder.calls == [["a"]]
+
+
+async def test_upstream_error_reaches_every_caller() -> None:
+    """Test a failed batch raises in all waiting callers."""
+    embedder = CountingEmbedder(fail=True)
+    batcher = EmbeddingBatcher(embedder, max_batch_size=64, max_wait_ms=5)
+
+    results = await asyncio.gather(
+        *(batcher.embed(text) for text in ["a", "b", "c"]), return_exceptions=True
+    )
+
+    assert len(embedder.calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.stats.errors == 1
+
+
+def test_rejects_empty_batch_size() -> None:
+    """Test max_batch_size below one is refused."""
+    with pytest.raises(ValueError):
+        EmbeddingBatcher(CountingEmbedder(), max_batch_size=0)
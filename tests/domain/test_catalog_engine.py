@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+
+from app.domain.agent_kavak.workflows.catalog_engine import CatalogEngine
+from app.models.agent.schemas import CarPreferences
+
+
+@pytest.fixture(scope="module")
+def engine() -> CatalogEngine:
+    engine = CatalogEngine(catalog_version=object())
+    engine.load(
+        [
+            {
+                "stock_id": "1",
+                "make": "Toyota",
+                "model": "Corolla",
+                "year": 2020,
+                "price": 310000.0,
+                "km": 30000,
+            },
+            {
+                "stock_id": "2",
+                "make": "Toyota",
+                "model": "Yaris",
+                "year": 2018,
+                "price": 210000.0,
+                "km": 90000,
+            },
+            {
+                "stock_id": "3",
+                "make": "Mazda",
+                "model": "Mazda 3",
+                "year": 2019,
+                "price": 180000.0,
+                "km": 60000,
+            },
+            {
+                "stock_id": "4",
+                "make": "Toyota",
+                "model": "Avanza",
+                "year": 2021,
+                "price": 260000.0,
+            },
+            {
+                "stock_id": "5",
+                "make": "Nissan",
+                "model": "",
+                "year": 2022,
+                "price": 150000.0,
+                "km": 1000,
+            },
+        ],
+        version=1,
+    )
+    return engine
+
+
+def test_skips_rows_that_cannot_become_cars(engine: CatalogEngine) -> None:
+    """Test payloads missing required fields are not loaded."""
+    assert len(engine) == 4
+
+
+def test_orders_over_whole_filtered_catalog(engine: CatalogEngine) -> None:
+    """Test filter + order_by returns the exact top rows."""
+    cars = engine.search(CarPreferences(brand="toyota", order_by="price_asc"), top_k=2)
+
+    assert [car.id for car in cars] == ["2", "4"]
+
+
+def test_missing_sort_values_go_last(engine: CatalogEngine) -> None:
+    """Test rows without mileage sort after those with it in either direction."""
+    asc = engine.search(CarPreferences(order_by="mileage_asc"), top_k=4)
+    desc = engine.search(CarPreferences(order_by="mileage_desc"), top_k=4)
+
+    assert asc[-1].id == "4"
+    assert desc[-1].id == "4"
+
+
+def test_matches_normalized_make_and_model(engine: CatalogEngine) -> None:
+    """Test brand/model spelling variants hit the same rows."""
+    cars = engine.search(CarPreferences(brand="MAZDA", model="mazda3"), top_k=5)
+
+    assert [car.id for car in cars] == ["3"]
+
+
+def test_aggregates_per_make(engine: CatalogEngine) -> None:
+    """Test grouped stats are exact over the filtered catalog, largest group first."""
+    stats = engine.aggregate(CarPreferences(budget_max=300000), group_by="make")
+
+    assert [(s["group"], s["count"]) for s in stats] == [("Toyota", 2), ("Mazda", 1)]
+    assert stats[0]["price"] == {"min": 210000.0, "max": 260000.0, "avg": 235000.0}
+    assert stats[0]["km"] == {"min": 90000.0, "max": 90000.0, "avg": 90000.0}
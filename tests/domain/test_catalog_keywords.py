@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from app.domain.agent_kavak.workflows.catalog_keywords import infer_transmission
+
+
+def test_infers_transmission_from_explicit_tokens() -> None:
+    """Test trim markers map to a transmission and prepositions do not."""
+    assert infer_transmission("1.6 Advance Aut") == "automatic"
+    assert infer_transmission("2.0 Sport CVT") == "automatic"
+    assert infer_transmission("1.4 Trendline MT") == "manual"
+    assert infer_transmission("Sense a gasolina") is None
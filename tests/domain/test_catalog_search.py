@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from app.domain.agent_kavak.workflows import tools
+from app.models.agent.schemas import CarPreferences
+
+
+def _payload(stock_id: str, price: float) -> Dict[str, Any]:
+    return {
+        "stock_id": stock_id,
+        "make": "Honda",
+        "model": "Odyssey",
+        "year": 2020,
+        "price": price,
+        "km": 40000,
+    }
+
+
+class FakeCatalogRepository:
+    def __init__(self) -> None:
+        self.searches = 0
+        self.ordered_scrolls = 0
+
+    async def scroll_ordered(self, **kwargs: Any) -> List[Any]:
+        self.ordered_scrolls += 1
+        return [SimpleNamespace(score=0.0, payload=_payload("99", 90000.0))]
+
+    async def search(self, **kwargs: Any) -> List[Any]:
+        self.searches += 1
+        return [
+            SimpleNamespace(score=0.9, payload=_payload("1", 420000.0)),
+            SimpleNamespace(score=0.8, payload=_payload("2", 380000.0)),
+            SimpleNamespace(score=0.7, payload=_payload("3", 450000.0)),
+        ]
+
+
+class FakeLLMManager:
+    async def embed_text(self, text: str) -> List[float]:
+        return [0.0, 1.0]
+
+
+class NoSearchCache:
+    async def get(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def set(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+@pytest.fixture(autouse=True)
+def no_search_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tools, "get_catalog_search_cache", NoSearchCache)
+    monkeypatch.setattr(tools.RETRIEVAL_SETTINGS, "CATALOG_MODE", "dense")
+
+
+async def test_free_text_with_order_by_ranks_similar_candidates() -> None:
+    """Test free-text intent is searched first and then sorted by order_by."""
+    repository = FakeCatalogRepository()
+
+    cars = await tools.search_catalog_tool(
+        CarPreferences(order_by="price_asc"),
+        vector_repository=repository,
+        llm_manager=FakeLLMManager(),
+        top_k=2,
+        free_text="el más barato que sea bueno para familia",
+    )
+
+    assert repository.ordered_scrolls == 0
+    assert repository.searches == 1
+    assert [car.id for car in cars] == ["2", "1"]
+
+
+def test_fused_scores_are_ranked_by_position() -> None:
+    """Test RRF-scale scores are not swamped by the fixed reranking bonuses."""
+    older = {**_payload("1", 300000.0), "year": 2015, "km": 150000}
+    newer = {**_payload("2", 300000.0), "year": 2023, "km": 5000}
+    results = [
+        SimpleNamespace(score=0.5, payload=older),
+        SimpleNamespace(score=0.33, payload=newer),
+    ]
+    preferences = CarPreferences()
+
+    fused = tools._rerank_and_convert(results, preferences, 2, rank_scores=True)
+    raw = tools._rerank_and_convert(
+        [
+            SimpleNamespace(score=result.score / 30, payload=result.payload)
+            for result in results
+        ],
+        preferences,
+        2,
+    )
+
+    assert [car.id for car in fused] == ["1", "2"]
+    assert [car.id for car in raw] == ["2", "1"]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+from app.domain.agent_kavak.workflows.preferences_extractor import (
+    CatalogVocabulary,
+    RuleBasedPreferencesExtractor,
+)
+
+
+@pytest.fixture(scope="module")
+def vocabulary() -> CatalogVocabulary:
+    return CatalogVocabulary.from_payloads(
+        [
+            {"make": "Toyota", "model": "Corolla"},
+            {"make": "Volkswagen", "model": "Touareg"},
+            {"make": "Mazda", "model": "Mazda 3"},
+            {"make": "Nissan", "model": "Versa"},
+        ]
+    )
+
+
+@pytest.fixture
+def extractor() -> RuleBasedPreferencesExtractor:
+    return RuleBasedPreferencesExtractor()
+
+
+def test_extracts_make_model_and_year(
+    extractor: RuleBasedPreferencesExtractor, vocabulary: CatalogVocabulary
+) -> None:
+    """Test a plain 'make model year' query is fully explained."""
+    result = extractor.extract("toyota corolla 2020", vocabulary)
+
+    assert result.confidence == 1.0
+    assert result.preferences.brand == "Toyota"
+    assert result.preferences.model == "Corolla"
+    assert result.preferences.year_min == 2020
+    assert result.preferences.year_max == 2020
+
+
+def test_model_implies_make(
+    extractor: RuleBasedPreferencesExtractor, vocabulary: CatalogVocabulary
+) -> None:
+    """Test a model unique to one make fills in the brand."""
+    result = extractor.extract("algo como el Touareg", vocabulary)
+
+    assert result.preferences.brand == "Volkswagen"
+    assert result.preferences.model == "Touareg"
+
+
+def test_comparative_budget_and_mileage(
+    extractor: RuleBasedPreferencesExtractor, vocabulary: CatalogVocabulary
+) -> None:
+    """Test Spanish keyword maps for order_by, budget and mileage."""
+    result = extractor.extract(
+        "el más barato, menos de 300 mil pesos y hasta 60,000 km", vocabulary
+    )
+
+    assert result.confidence == 1.0
+    assert result.preferences.order_by == "price_asc"
+    assert result.preferences.budget_max == 300000
+    assert result.preferences.mileage_max == 60000
+
+
+def test_unknown_words_lower_confidence(
+    extractor: RuleBasedPreferencesExtractor, vocabulary: CatalogVocabulary
+) -> None:
+    """Test free-form requests fall below the LLM fallback threshold."""
+    result = extractor.extract("un auto familiar para mi esposa", vocabulary)
+
+    assert result.confidence < extractor.settings.MIN_CONFIDENCE
+
+
+def test_feature_keywords_become_filters(
+    extractor: RuleBasedPreferencesExtractor, vocabulary: CatalogVocabulary
+) -> None:
+    """Test Bluetooth and CarPlay requests are kept as preferences."""
+    carplay = extractor.extract("busco un auto con carplay", vocabulary)
+    bluetooth = extractor.extract("toyota con bluetooth", vocabulary)
+
+    assert carplay.confidence == 1.0
+    assert carplay.preferences.car_play is True
+    assert bluetooth.confidence == 1.0
+    assert bluetooth.preferences.brand == "Toyota"
+    assert bluetooth.preferences.bluetooth is True
+
+
+def test_dimension_limits(
+    extractor: RuleBasedPreferencesExtractor, vocabulary: CatalogVocabulary
+) -> None:
+    """Test dimension phrases are converted to millimetre limits."""
+    result = extractor.extract(
+        "menos de 4.5 metros de largo y altura de mas de 150 cm", vocabulary
+    )
+
+    assert result.confidence == 1.0
+    assert result.preferences.length_max == 4500
+    assert result.preferences.height_min == 1500
+
+
+def test_unparsed_dimension_words_lower_confidence(
+    extractor: RuleBasedPreferencesExtractor, vocabulary: CatalogVocabulary
+) -> None:
+    """Test dimension words without a limit are left to the LLM."""
+    result = extractor.extract("cuanto mide de largo el corolla", vocabulary)
+
+    assert result.confidence < extractor.settings.MIN_CONFIDENCE